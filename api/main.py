@@ -2,20 +2,33 @@
 FastAPI Backend - REST API for candidate analysis
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, Query, UploadFile, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import sys
 from pathlib import Path
-import tempfile
-import os
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.pipeline import CandidateIntelligencePipeline
+from src.batch import iter_archive
+from src.models.report import to_json
+from src.storage.job_queue import JobQueue
+from src.storage.score_store import open_score_store
+from src.worker import start_workers, stop_workers, supervise_in_background
+from src.config import (
+    API_MAX_WORKERS,
+    API_MAX_QUEUE,
+    API_REQUEST_TIMEOUT,
+    API_ARCHIVE_MAX_ENTRIES,
+    PDF_MAX_BYTES,
+    JOB_WORKERS
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -33,8 +46,137 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize pipeline
-pipeline = CandidateIntelligencePipeline()
+# Initialize pipeline (component scores are kept for re-ranking)
+pipeline = CandidateIntelligencePipeline(score_store=open_score_store())
+
+
+class PipelineExecutor:
+    """
+    Runs blocking pipeline work off the event loop
+    
+    - At most max_workers runs execute at once, max_queue more may wait
+    - Requests beyond that are rejected with 503 (backpressure)
+    - Each run has a timeout, counted from when it starts executing (time
+      spent queued is not charged). A run that times out answers 504 but
+      cannot be interrupted: it finishes in the background and holds its
+      slot until then
+    - Queued runs are cancelled when the awaiting request is cancelled
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pipeline"
+        )
+        self._slots = asyncio.Semaphore(self.capacity)
+        self._in_flight = 0
+    
+    @property
+    def in_flight(self) -> int:
+        """Runs currently executing or queued"""
+        return self._in_flight
+    
+    def is_full(self) -> bool:
+        return self._slots.locked()
+    
+    async def run(self, fn, *args, wait: bool = False, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the worker pool
+        
+        Args:
+            wait: Wait for a free slot instead of failing with 503
+        """
+        if not wait and self.is_full():
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+        
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        
+        def mark_started():
+            if not started.done():
+                started.set_result(None)
+        
+        def call():
+            # Runs in a pool thread: the timeout starts now
+            loop.call_soon_threadsafe(mark_started)
+            return fn(*args, **kwargs)
+        
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        # The slot is freed when the work actually stops, not when we stop waiting
+        self._in_flight += 1
+        
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                # Event loop already closed (shutdown), nobody is waiting
+                self._release()
+        
+        future.add_done_callback(on_done)
+        
+        result = asyncio.wrap_future(future)
+        try:
+            # Wait (untimed) for a pool thread to pick the run up
+            await asyncio.wait([started, result], return_when=asyncio.FIRST_COMPLETED)
+            return await asyncio.wait_for(result, self.timeout)
+        except asyncio.CancelledError:
+            # Request gone: drop the run if it has not started yet
+            result.cancel()
+            raise
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Analysis timed out after {self.timeout} seconds"
+            )
+    
+    def _release(self):
+        self._in_flight -= 1
+        self._slots.release()
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+executor = PipelineExecutor(
+    max_workers=API_MAX_WORKERS,
+    max_queue=API_MAX_QUEUE,
+    timeout=API_REQUEST_TIMEOUT
+)
+
+
+# Durable queue for large batches (submit, then poll); see src/worker.py
+job_queue = JobQueue()
+queue_workers = None
+
+
+@app.on_event("startup")
+async def start_queue_workers():
+    global queue_workers
+    if JOB_WORKERS > 0:
+        queue_workers = start_workers(JOB_WORKERS, str(job_queue.db_path), allow_fork=False)
+        # Replaces workers that die, so the pool never shrinks
+        supervise_in_background(*queue_workers, str(job_queue.db_path), allow_fork=False)
+
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    executor.shutdown()
+    if queue_workers is not None:
+        # Interrupted tasks are re-claimed once their lease expires
+        await asyncio.to_thread(stop_workers, *queue_workers, timeout=5)
 
 
 # Response models
@@ -44,6 +186,24 @@ class AnalysisResponse(BaseModel):
     data: Optional[dict] = None
 
 
+# 'full' report, or 'slim': scores and skill / label IDs only (see /schema/slim)
+ReportView = Literal["full", "slim"]
+# Semantic matcher per request (None: the pipeline default, SEMANTIC_BACKEND)
+SemanticBackend = Optional[Literal["tfidf", "embedding"]]
+
+
+def render_report(report: dict, view: ReportView):
+    """Report in the requested view"""
+    if view == "slim":
+        return pipeline.report_encoder.encode(report)
+    return report
+
+
+def json_response(payload) -> Response:
+    """Serialize directly (orjson when installed), skipping jsonable_encoder"""
+    return Response(content=to_json(payload), media_type="application/json")
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -57,13 +217,25 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "in_flight": executor.in_flight,
+        "capacity": executor.capacity
+    }
+
+
+@app.get("/schema/slim")
+async def slim_schema():
+    """Lookup tables (skill names, labels) for decoding slim reports"""
+    return json_response(pipeline.report_encoder.schema())
 
 
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_candidate(
     resume: UploadFile = File(...),
-    job_description: UploadFile = File(...)
+    job_description: UploadFile = File(...),
+    view: ReportView = Query("full"),
+    semantic_backend: SemanticBackend = Query(None)
 ):
     """
     Analyze candidate resume against job description
@@ -71,6 +243,8 @@ async def analyze_candidate(
     Args:
         resume: Resume file (PDF or TXT)
         job_description: Job description file (PDF or TXT)
+        view: 'full' report or 'slim' (IDs and numbers only)
+        semantic_backend: 'tfidf' or 'embedding' (default: server setting)
         
     Returns:
         Complete analysis report
@@ -87,42 +261,42 @@ async def analyze_candidate(
             detail=f"Only PDF and TXT files are supported. Got: {resume_ext}, {jd_ext}"
         )
     
-    # Create temporary files
-    temp_dir = tempfile.gettempdir()
+    if executor.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    resume_bytes = await resume.read()
+    jd_bytes = await job_description.read()
     
     try:
-        # Save uploaded files temporarily
-        resume_path = Path(temp_dir) / f"resume_{os.getpid()}{resume_ext}"
-        jd_path = Path(temp_dir) / f"jd_{os.getpid()}{jd_ext}"
-        
-        # Write files
-        with open(resume_path, 'wb') as f:
-            f.write(await resume.read())
-        
-        with open(jd_path, 'wb') as f:
-            f.write(await job_description.read())
-        
-        # Run analysis
+        # Run analysis on the uploaded bytes (no temp files)
         print(f"📄 Analyzing: {resume.filename} vs {job_description.filename}")
-        report = pipeline.analyze(resume_path, jd_path)
-        
-        # Clean up temp files
-        resume_path.unlink()
-        jd_path.unlink()
-        
-        return AnalysisResponse(
-            success=True,
-            message="Analysis completed successfully",
-            data=report
+        report = await executor.run(
+            pipeline.analyze,
+            resume_bytes,
+            jd_bytes,
+            resume_name=resume.filename,
+            jd_name=job_description.filename,
+            semantic_backend=semantic_backend
         )
+        
+        return json_response({
+            "success": True,
+            "message": "Analysis completed successfully",
+            "data": render_report(report, view)
+        })
+    
+    except HTTPException:
+        raise
+    
+    except ValueError as e:
+        # Oversized or unreadable input (size limits, unsupported format)
+        raise HTTPException(status_code=400, detail=str(e))
     
     except Exception as e:
-        # Clean up on error
-        if resume_path.exists():
-            resume_path.unlink()
-        if jd_path.exists():
-            jd_path.unlink()
-        
         raise HTTPException(
             status_code=500,
             detail=f"Analysis failed: {str(e)}"
@@ -132,7 +306,9 @@ async def analyze_candidate(
 @app.post("/analyze/batch")
 async def analyze_batch(
     resumes: list[UploadFile] = File(...),
-    job_description: UploadFile = File(...)
+    job_description: UploadFile = File(...),
+    view: ReportView = Query("full"),
+    semantic_backend: SemanticBackend = Query(None)
 ):
     """
     Batch analyze multiple resumes against one job description
@@ -140,51 +316,311 @@ async def analyze_batch(
     Args:
         resumes: List of resume files
         job_description: Job description file
+        view: 'full' reports or 'slim' (IDs and numbers only)
+        semantic_backend: 'tfidf' or 'embedding' (default: server setting)
         
     Returns:
         List of analysis reports
     """
-    results = []
+    if executor.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
     
-    # Save JD temporarily
-    temp_dir = tempfile.gettempdir()
-    jd_path = Path(temp_dir) / f"jd_batch_{os.getpid()}.txt"
+    jd_bytes = await job_description.read()
     
-    with open(jd_path, 'wb') as f:
-        f.write(await job_description.read())
+    # A batch uses at most max_workers slots so single requests can still queue
+    batch_slots = asyncio.Semaphore(executor.max_workers)
     
-    # Process each resume
-    for resume in resumes:
+    async def analyze_one(resume: UploadFile) -> dict:
         try:
-            resume_path = Path(temp_dir) / f"resume_{os.getpid()}_{resume.filename}"
-            
-            with open(resume_path, 'wb') as f:
-                f.write(await resume.read())
+            resume_bytes = await resume.read()
             
-            report = pipeline.analyze(resume_path, jd_path)
+            async with batch_slots:
+                report = await executor.run(
+                    pipeline.analyze,
+                    resume_bytes,
+                    jd_bytes,
+                    resume_name=resume.filename,
+                    jd_name=job_description.filename,
+                    semantic_backend=semantic_backend,
+                    wait=True
+                )
             
-            results.append({
+            return {
                 "filename": resume.filename,
                 "success": True,
-                "report": report
-            })
-            
-            resume_path.unlink()
+                "report": render_report(report, view)
+            }
         
         except Exception as e:
-            results.append({
+            return {
                 "filename": resume.filename,
                 "success": False,
-                "error": str(e)
-            })
+                "error": e.detail if isinstance(e, HTTPException) else str(e)
+            }
     
-    # Clean up JD
-    jd_path.unlink()
+    # Process resumes concurrently in the worker pool
+    results = await asyncio.gather(*(analyze_one(resume) for resume in resumes))
     
-    return {
+    return json_response({
         "success": True,
         "message": f"Processed {len(resumes)} resumes",
         "results": results
+    })
+
+
+@app.post("/analyze/archive")
+async def analyze_archive(
+    archive: UploadFile = File(...),
+    job_description: UploadFile = File(...),
+    view: ReportView = Query("full"),
+    semantic_backend: SemanticBackend = Query(None)
+):
+    """
+    Analyze every resume in a zip or tar archive against one job description
+    
+    Entries are streamed out of the archive one at a time (nothing is
+    extracted to disk) and at most max_workers of them are held in memory.
+    
+    Args:
+        archive: Zip or tar (optionally compressed) of PDF / TXT resumes
+        job_description: Job description file
+        view: 'full' reports or 'slim' (IDs and numbers only)
+        semantic_backend: 'tfidf' or 'embedding' (default: server setting)
+        
+    Returns:
+        NDJSON stream - one result line per resume as it finishes,
+        then a summary line
+    """
+    if executor.is_full():
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    jd_bytes = await job_description.read()
+    entries = iter_archive(archive.file)
+    
+    # Reading the first entry validates the archive before the stream starts
+    try:
+        first_entry = await asyncio.to_thread(next, entries, None)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {str(e)}")
+    
+    async def analyze_one(filename: str, resume_bytes: bytes) -> dict:
+        try:
+            report = await executor.run(
+                pipeline.analyze,
+                resume_bytes,
+                jd_bytes,
+                resume_name=Path(filename).name,
+                jd_name=job_description.filename,
+                semantic_backend=semantic_backend,
+                wait=True
+            )
+            return {"filename": filename, "success": True, "report": render_report(report, view)}
+        
+        except Exception as e:
+            return {
+                "filename": filename,
+                "success": False,
+                "error": e.detail if isinstance(e, HTTPException) else str(e)
+            }
+    
+    def result_line(task: asyncio.Task) -> str:
+        return to_json(task.result()) + b"\n"
+    
+    async def stream_results():
+        # Bounds both pool usage and the number of entries held in memory
+        batch_slots = asyncio.Semaphore(executor.max_workers)
+        pending = set()
+        entry = first_entry
+        submitted = 0
+        succeeded = 0
+        
+        try:
+            while entry is not None and submitted < API_ARCHIVE_MAX_ENTRIES:
+                task = asyncio.create_task(analyze_one(*entry))
+                task.add_done_callback(lambda _: batch_slots.release())
+                pending.add(task)
+                submitted += 1
+                
+                await batch_slots.acquire()
+                for finished in [task for task in pending if task.done()]:
+                    pending.remove(finished)
+                    succeeded += finished.result()["success"]
+                    yield result_line(finished)
+                
+                entry = await asyncio.to_thread(next, entries, None)
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    succeeded += task.result()["success"]
+                    yield result_line(task)
+            
+            yield to_json({
+                "done": True,
+                "processed": submitted,
+                "succeeded": succeeded,
+                "failed": submitted - succeeded,
+                "truncated": entry is not None
+            }) + b"\n"
+        
+        finally:
+            # Client went away: drop queued analyses
+            for task in pending:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    job_description: UploadFile = File(...),
+    resumes: list[UploadFile] = File(None),
+    archive: UploadFile = File(None)
+):
+    """
+    Queue a batch job and return immediately
+    
+    Args:
+        job_description: Job description file
+        resumes: Resume files, or
+        archive: Zip / tar of resumes
+        
+    Returns:
+        job_id to poll with GET /jobs/{job_id} and /jobs/{job_id}/results
+    """
+    if bool(resumes) == bool(archive):
+        raise HTTPException(
+            status_code=400,
+            detail="Send either resumes or an archive"
+        )
+    
+    jd_bytes = await job_description.read()
+    
+    if archive:
+        documents = iter_archive(archive.file)
+    else:
+        documents = (
+            (resume.filename, resume.file.read(PDF_MAX_BYTES + 1))
+            for resume in resumes
+        )
+    
+    try:
+        # Documents are read first, then inserted in one short transaction
+        job_id = await asyncio.to_thread(
+            job_queue.submit, jd_bytes, documents, jd_name=job_description.filename
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {str(e)}")
+    
+    progress = job_queue.progress(job_id)
+    return {
+        "success": True,
+        "message": f"Queued {progress['total']} resumes",
+        "job_id": job_id,
+        "status_url": f"/jobs/{job_id}",
+        "results_url": f"/jobs/{job_id}/results"
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Progress of a queued job: task counts by state"""
+    progress = job_queue.progress(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return progress
+
+
+@app.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, offset: int = 0, limit: int = 100,
+                      view: ReportView = Query("full")):
+    """
+    Finished results of a job so far (partial while it is running)
+    
+    Dead-lettered resumes are included with success=False and their
+    last error. Page with offset / limit; view='slim' for IDs and numbers only.
+    """
+    progress = job_queue.progress(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    
+    results = job_queue.results(job_id, offset=offset, limit=min(limit, 1000))
+    for result in results:
+        if result["report"] is not None:
+            result["report"] = render_report(result["report"], view)
+    
+    return json_response({
+        "job": progress,
+        "results": results,
+        "next_offset": offset + len(results)
+    })
+
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_dead_letters(job_id: str):
+    """Requeue a job's dead-lettered resumes with fresh attempts"""
+    if job_queue.progress(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    
+    requeued = job_queue.requeue_dead(job_id)
+    return {"success": True, "requeued": requeued}
+
+
+@app.post("/match/matrix")
+async def match_matrix(
+    resumes: list[UploadFile] = File(...),
+    job_descriptions: list[UploadFile] = File(...),
+    top_k: int = Form(5),
+    semantic_backend: SemanticBackend = Form(None)
+):
+    """
+    Match many resumes against many job descriptions
+    
+    Args:
+        resumes: List of resume files
+        job_descriptions: List of job description files
+        top_k: Number of best matches to return per resume and per JD
+        semantic_backend: 'tfidf' or 'embedding' (default: server setting)
+        
+    Returns:
+        Score matrices with top-k JDs per resume and top-k resumes per JD
+    """
+    resume_documents = [await resume.read() for resume in resumes]
+    jd_documents = [await job_description.read() for job_description in job_descriptions]
+    
+    try:
+        result = await executor.run(
+            pipeline.match_matrix,
+            resume_documents,
+            jd_documents,
+            top_k=top_k,
+            resume_names=[resume.filename for resume in resumes],
+            jd_names=[job_description.filename for job_description in job_descriptions],
+            semantic_backend=semantic_backend
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Oversized or unreadable input (size limits, unsupported format)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Matching failed: {str(e)}"
+        )
+    
+    return {
+        "success": True,
+        "message": f"Matched {len(resumes)} resumes against {len(job_descriptions)} job descriptions",
+        "data": result
     }
 
 
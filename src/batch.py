@@ -0,0 +1,543 @@
+"""
+Bulk Ingestion - Screens a directory or archive of resumes against one or
+more job descriptions in a process pool and writes JSONL or Parquet results
+
+Progress is checkpointed, so an interrupted run picks up where it stopped:
+    python -m src.batch resumes/ --jd backend.pdf --jd data.txt --output results.jsonl
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import importlib.util
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import (
+    SCORING_WEIGHTS,
+    PDF_MAX_BYTES,
+    BATCH_WORKERS,
+    BATCH_CHECKPOINT_EVERY,
+    BATCH_PROGRESS_INTERVAL
+)
+from src.preprocessing.pdf_parser import PDFParser
+from src.shared_state import get_pipeline, preload_pipeline, worker_context
+from src.storage.score_store import ComponentScoreStore
+
+RESUME_SUFFIXES = ('.pdf', '.txt')
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def _is_resume_name(name: str) -> bool:
+    base = name.rsplit('/', 1)[-1]
+    return not base.startswith('.') and base.lower().endswith(RESUME_SUFFIXES)
+
+
+def _is_tar(path: Path) -> bool:
+    return path.name.lower().endswith(TAR_SUFFIXES)
+
+
+def list_resumes(input_path: Union[str, Path]) -> List[str]:
+    """
+    List resume ids in a directory (relative paths) or a zip / tar
+    archive (member names), in a stable order
+    """
+    input_path = Path(input_path)
+    
+    if input_path.is_dir():
+        return sorted(
+            path.relative_to(input_path).as_posix()
+            for path in input_path.rglob('*')
+            if path.is_file() and _is_resume_name(path.name)
+        )
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            return [info.filename for info in archive.infolist()
+                    if not info.is_dir() and _is_resume_name(info.filename)]
+    if _is_tar(input_path):
+        with tarfile.open(input_path) as archive:
+            return [member.name for member in archive
+                    if member.isfile() and _is_resume_name(member.name)]
+    
+    raise ValueError(f"Expected a directory, .zip or .tar archive: {input_path}")
+
+
+def read_resumes(input_path: Union[str, Path],
+                 resume_ids: Iterable[str]) -> Iterator[Tuple[str, Union[Path, bytes]]]:
+    """
+    Yield (resume_id, source) pairs - a file path for directories, the
+    member's bytes for archives (read one at a time, in archive order)
+    """
+    input_path = Path(input_path)
+    
+    if input_path.is_dir():
+        for resume_id in resume_ids:
+            yield resume_id, input_path / resume_id
+        return
+    
+    wanted = set(resume_ids)
+    with open(input_path, 'rb') as f:
+        for name, data in iter_archive(f):
+            if name in wanted:
+                yield name, data
+
+
+def iter_archive(fileobj: BinaryIO,
+                 max_bytes: int = PDF_MAX_BYTES) -> Iterator[Tuple[str, bytes]]:
+    """
+    Stream (name, bytes) resume entries out of a zip or tar archive
+    without extracting it to disk
+    
+    At most max_bytes + 1 bytes are read per entry, so oversize entries
+    stay bounded in memory and are rejected later by PDFParser's size check.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_resume_name(info.filename):
+                    continue
+                with archive.open(info) as entry:
+                    yield info.filename, entry.read(max_bytes + 1)
+        return
+    
+    fileobj.seek(0)
+    try:
+        # Stream mode reads (compressed) tars front to back exactly once
+        archive = tarfile.open(fileobj=fileobj, mode='r|*')
+    except tarfile.TarError:
+        raise ValueError("Unsupported archive: expected a zip or tar file")
+    
+    with archive:
+        for member in archive:
+            if not member.isfile() or not _is_resume_name(member.name):
+                continue
+            yield member.name, archive.extractfile(member).read(max_bytes + 1)
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+_worker_pipeline = None
+_worker_jds = None
+
+
+def _init_worker(jds: List[Dict], use_layout: bool):
+    """Adopt the parent's preloaded pipeline (built here if not forked)"""
+    global _worker_pipeline, _worker_jds
+    
+    # The pipeline prints every stage; keep worker output off the progress lines
+    sys.stdout = open(os.devnull, 'w')
+    
+    _worker_pipeline = get_pipeline(use_layout=use_layout)
+    _worker_jds = jds
+
+
+def _analyze_resume(resume_id: str, source: Union[Path, bytes],
+                    include_report: bool) -> List[Dict]:
+    """Analyze one resume against every JD - one record per JD"""
+    try:
+        resume_text, section_spans = _worker_pipeline._load_resume(source)
+    except Exception as e:
+        return [_error_record(resume_id, None, jd, e) for jd in _worker_jds]
+    
+    resume_hash = ComponentScoreStore.content_hash(resume_text)
+    resume_name = resume_id.rsplit('/', 1)[-1]
+    
+    records = []
+    for jd in _worker_jds:
+        try:
+            report = _worker_pipeline.analyze_text(
+                resume_text,
+                jd['text'],
+                resume_name=resume_name,
+                jd_name=jd['name'],
+                resume_section_spans=section_spans
+            )
+        except Exception as e:
+            records.append(_error_record(resume_id, resume_hash, jd, e))
+            continue
+        
+        records.append(_report_record(resume_id, resume_hash, jd, report, include_report))
+    
+    return records
+
+
+def _base_record(resume_id: str, resume_hash: Optional[str], jd: Dict) -> Dict:
+    return {
+        'resume_id': resume_id,
+        'resume_hash': resume_hash,
+        'jd_name': jd['name'],
+        'jd_hash': jd['hash']
+    }
+
+
+def _report_record(resume_id: str, resume_hash: str, jd: Dict,
+                   report: Dict, include_report: bool) -> Dict:
+    record = _base_record(resume_id, resume_hash, jd)
+    record.update({
+        'final_score': report['overall_score'],
+        'recommendation': report['recommendation'],
+        'confidence': report['confidence'],
+        **{name: report['component_scores'][name] for name in SCORING_WEIGHTS},
+        'match_percentage': report['skill_analysis']['match_percentage'],
+        'email': report['candidate_info'].get('email'),
+        'error': None
+    })
+    if include_report:
+        record['report'] = report
+    return record
+
+
+def _error_record(resume_id: str, resume_hash: Optional[str],
+                  jd: Dict, error: Exception) -> Dict:
+    record = _base_record(resume_id, resume_hash, jd)
+    record.update({
+        'final_score': None,
+        'recommendation': None,
+        'confidence': None,
+        **{name: None for name in SCORING_WEIGHTS},
+        'match_percentage': None,
+        'email': None,
+        'error': f"{type(error).__name__}: {error}"
+    })
+    return record
+
+
+# ---------------------------------------------------------------------------
+# Outputs and checkpoints
+# ---------------------------------------------------------------------------
+
+class JsonlWriter:
+    """Appends records to one JSONL file; commit() returns the durable offset"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+    
+    def open(self, state: Optional[Dict]):
+        """Start fresh, or truncate back to a checkpointed state"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if state is None:
+            self._file = open(self.path, 'w', encoding='utf-8')
+        else:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            # Drop records written after the last checkpoint
+            self._file.truncate(state['offset'])
+            self._file.seek(state['offset'])
+    
+    def write(self, records: List[Dict]):
+        self._file.writelines(json.dumps(record, default=str) + "\n" for record in records)
+    
+    def commit(self) -> Dict:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return {'offset': self._file.tell()}
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetWriter:
+    """Writes each committed batch as a numbered part file in a directory"""
+    
+    def __init__(self, path: Path):
+        if not any(importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self._parts = 0
+        self._buffer = []
+    
+    def open(self, state: Optional[Dict]):
+        """Start fresh, or drop parts written after a checkpointed state"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._parts = state['parts'] if state else 0
+        for part in self.path.glob('part-*.parquet'):
+            if int(part.stem.split('-')[1]) >= self._parts:
+                part.unlink()
+    
+    def write(self, records: List[Dict]):
+        for record in records:
+            if 'report' in record:
+                # Nested reports do not map onto a flat schema
+                record = {**record, 'report': json.dumps(record['report'], default=str)}
+            self._buffer.append(record)
+    
+    def commit(self) -> Dict:
+        if self._buffer:
+            import pandas as pd
+            
+            part = self.path / f"part-{self._parts:05d}.parquet"
+            temp = part.with_suffix('.tmp')
+            pd.DataFrame(self._buffer).to_parquet(temp, index=False)
+            os.replace(temp, part)
+            self._parts += 1
+            self._buffer = []
+        return {'parts': self._parts}
+    
+    def close(self):
+        pass
+
+
+class Checkpoint:
+    """
+    Append-only log of finished resume ids plus the output state they
+    were committed with
+    
+    The first line records the JD hashes and format so a checkpoint is
+    never resumed against a different run. A torn last line (crash while
+    writing) is ignored.
+    """
+    
+    def __init__(self, path: Path, run_key: Dict):
+        self.path = path
+        self.run_key = run_key
+        self.done = set()
+        self.state = None
+    
+    def load(self) -> bool:
+        """Read an existing checkpoint; returns False if there is none"""
+        if not self.path.exists():
+            return False
+        
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+        
+        if not entries:
+            return False
+        if entries[0] != self.run_key:
+            raise ValueError(
+                f"Checkpoint {self.path} belongs to a different run "
+                "(other job descriptions or format); use --restart"
+            )
+        
+        for entry in entries[1:]:
+            self.done.update(entry['ids'])
+            self.state = entry['state']
+        return True
+    
+    def start(self):
+        """Begin a new checkpoint log"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.run_key) + "\n")
+    
+    def record(self, resume_ids: List[str], state: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'ids': resume_ids, 'state': state}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(resume_ids)
+        self.state = state
+
+
+class Progress:
+    """Prints throughput and ETA at most every interval seconds"""
+    
+    def __init__(self, total: int, interval: float = BATCH_PROGRESS_INTERVAL):
+        self.total = total
+        self.interval = interval
+        self.processed = 0
+        self.errors = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+    
+    def update(self, errors: int = 0, force: bool = False):
+        self.processed += 1
+        self.errors += errors
+        now = time.monotonic()
+        if force or now - self._last_report >= self.interval:
+            self._last_report = now
+            print(self.summary())
+    
+    def summary(self) -> str:
+        rate = self.processed / self.elapsed if self.elapsed > 0 else 0.0
+        remaining = self.total - self.processed
+        eta = timedelta(seconds=int(remaining / rate)) if rate > 0 else "?"
+        percent = 100 * self.processed / self.total if self.total else 100.0
+        return (f"  {self.processed:,}/{self.total:,} resumes ({percent:.1f}%) | "
+                f"{rate:.2f} resumes/s | ETA {eta} | {self.errors} errors")
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def run_batch(input_path: Union[str, Path],
+              jd_paths: List[Union[str, Path]],
+              output: Union[str, Path],
+              output_format: Optional[str] = None,
+              workers: int = BATCH_WORKERS,
+              checkpoint_every: int = BATCH_CHECKPOINT_EVERY,
+              checkpoint_path: Optional[Union[str, Path]] = None,
+              restart: bool = False,
+              include_report: bool = False,
+              use_layout: bool = True) -> Dict:
+    """
+    Screen every resume under input_path against every job description
+    
+    Args:
+        input_path: Directory of .pdf/.txt resumes, or a zip/tar archive
+        jd_paths: Job description files
+        output: JSONL file, or Parquet directory (one part per checkpoint)
+        output_format: 'jsonl' or 'parquet' (default: from output suffix)
+        workers: Analysis processes
+        checkpoint_every: Resumes per output flush and checkpoint entry
+        checkpoint_path: Default: <output>.checkpoint
+        restart: Ignore an existing checkpoint and start over
+        include_report: Also store the full analysis report per pair
+        use_layout: Detect PDF resume sections from layout
+        
+    Returns:
+        {'total', 'skipped', 'processed', 'errors', 'elapsed_seconds'}
+    """
+    output = Path(output)
+    output_format = output_format or ('parquet' if output.suffix == '.parquet' else 'jsonl')
+    writer = ParquetWriter(output) if output_format == 'parquet' else JsonlWriter(output)
+    
+    parser = PDFParser()
+    jds = []
+    for jd_path in jd_paths:
+        text = parser.parse(jd_path)
+        jds.append({
+            'name': Path(jd_path).name,
+            'text': text,
+            'hash': ComponentScoreStore.content_hash(text)
+        })
+    
+    checkpoint = Checkpoint(
+        Path(checkpoint_path) if checkpoint_path else output.with_name(output.name + '.checkpoint'),
+        run_key={'jd_hashes': [jd['hash'] for jd in jds], 'format': output_format}
+    )
+    resuming = not restart and checkpoint.load()
+    if not resuming:
+        checkpoint.start()
+    writer.open(checkpoint.state if resuming else None)
+    
+    resume_ids = list_resumes(input_path)
+    pending_ids = [resume_id for resume_id in resume_ids if resume_id not in checkpoint.done]
+    skipped = len(resume_ids) - len(pending_ids)
+    
+    print(f"📂 {len(resume_ids):,} resumes x {len(jds)} job descriptions")
+    if skipped:
+        print(f"↪️ Resuming: {skipped:,} already done, {len(pending_ids):,} to go")
+    
+    progress = Progress(len(pending_ids))
+    finished = []
+    
+    def commit():
+        state = writer.commit()
+        if finished:
+            checkpoint.record(finished.copy(), state)
+            finished.clear()
+    
+    # Forked workers share the parent's warmed pipeline copy-on-write
+    preload_pipeline(use_layout=use_layout)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=worker_context(),
+        initializer=_init_worker,
+        initargs=(jds, use_layout)
+    )
+    try:
+        sources = read_resumes(input_path, pending_ids)
+        in_flight = {}
+        max_in_flight = workers * 4
+        
+        while True:
+            # Keep a bounded number of resumes in flight (archives are read lazily)
+            for resume_id, source in sources:
+                future = pool.submit(_analyze_resume, resume_id, source, include_report)
+                in_flight[future] = resume_id
+                if len(in_flight) >= max_in_flight:
+                    break
+            
+            if not in_flight:
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                resume_id = in_flight.pop(future)
+                records = future.result()
+                writer.write(records)
+                finished.append(resume_id)
+                progress.update(errors=int(any(record['error'] for record in records)))
+            
+            if len(finished) >= checkpoint_every:
+                commit()
+    finally:
+        # Records already received are complete; keep them even on Ctrl-C or a crash
+        commit()
+        writer.close()
+        pool.shutdown(cancel_futures=True)
+    
+    print(progress.summary())
+    print(f"✅ Results written to {output}")
+    
+    return {
+        'total': len(resume_ids),
+        'skipped': skipped,
+        'processed': progress.processed,
+        'errors': progress.errors,
+        'elapsed_seconds': round(progress.elapsed, 1)
+    }
+
+
+# Bulk command: python -m src.batch INPUT --jd FILE [--jd FILE ...] --output FILE
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Screen a directory or archive of resumes against job descriptions")
+    parser.add_argument('input', help="Directory of .pdf/.txt resumes, or a .zip/.tar archive")
+    parser.add_argument('--jd', action='append', required=True, help="Job description file (repeatable)")
+    parser.add_argument('--output', required=True, help="Results .jsonl file or .parquet directory")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default=None,
+                        help="Output format (default: from --output suffix)")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help="Analysis processes")
+    parser.add_argument('--checkpoint-every', type=int, default=BATCH_CHECKPOINT_EVERY,
+                        help="Resumes per checkpoint")
+    parser.add_argument('--checkpoint', default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    parser.add_argument('--full-report', action='store_true', help="Include the full report per pair")
+    parser.add_argument('--no-layout', action='store_true', help="Detect PDF sections from text only")
+    args = parser.parse_args()
+    
+    summary = run_batch(
+        args.input,
+        args.jd,
+        args.output,
+        output_format=args.format,
+        workers=args.workers,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        include_report=args.full_report,
+        use_layout=not args.no_layout
+    )
+    print(f"✓ {summary['processed']:,} processed, {summary['skipped']:,} skipped, "
+          f"{summary['errors']:,} with errors in {summary['elapsed_seconds']}s")
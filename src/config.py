@@ -27,6 +27,83 @@ MODEL_REGISTRY_PATH = MODELS_DIR / "model_registry.json"
 for directory in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Persisted component scores (for re-ranking without re-analysis). When
+# enabled, every analysis by the API, UI, batch command and queue workers
+# is saved
+SCORE_STORE_ENABLED = False
+SCORE_STORE_PATH = PROCESSED_DATA_DIR / "component_scores.sqlite"
+
+# API concurrency: pipeline runs happen in a bounded worker pool so the
+# event loop stays responsive; requests beyond workers + queue get a 503
+API_MAX_WORKERS = 4
+API_MAX_QUEUE = 16
+API_REQUEST_TIMEOUT = 120  # seconds per pipeline run
+API_ARCHIVE_MAX_ENTRIES = 1000  # resumes analysed per uploaded archive
+
+# PDF extraction limits
+PDF_MAX_PAGES = 50                    # pages beyond this are ignored
+PDF_MAX_BYTES = 10 * 1024 * 1024      # larger files are rejected
+
+# Input guardrails: extracted text beyond these limits is truncated
+# ('truncate') or the analysis is refused with a ValueError ('reject')
+MAX_RESUME_CHARS = 50_000
+MAX_JD_CHARS = 20_000
+INPUT_LIMIT_POLICY = 'truncate'
+# Seconds per analysis; past it the remaining feature stages (questions,
+# graph, depth, retention) are skipped and the report is flagged partial
+ANALYSIS_TIME_BUDGET = 20.0
+# Analysis stage graph (src/stage_graph.py): threads running independent
+# stages at once (0 runs them inline), and optional stages to leave out,
+# e.g. ('knowledge_graph', 'retention_predictions')
+PIPELINE_STAGE_WORKERS = 0
+PIPELINE_DISABLED_STAGES = ()
+
+# Semantic matching backend, selectable per request: 'tfidf' (two-document
+# TF-IDF) or 'embedding' (section-level dense embeddings, below)
+SEMANTIC_BACKEND = 'tfidf'
+# Embedding model: 'onnx' (int8-quantized sentence encoder, needs
+# onnxruntime + tokenizers), 'spacy' (word vectors of a spaCy model that
+# ships them) or 'auto' (ONNX when its model file exists, else spaCy).
+# Without either, embedding requests fall back to TF-IDF.
+EMBEDDING_MODEL_TYPE = 'auto'
+EMBEDDING_ONNX_MODEL_PATH = MODELS_DIR / "embeddings" / "model_quint8.onnx"
+EMBEDDING_ONNX_TOKENIZER_PATH = MODELS_DIR / "embeddings" / "tokenizer.json"
+EMBEDDING_SPACY_MODEL = 'en_core_web_md'
+EMBEDDING_MAX_TOKENS = 256            # encoder input length (ONNX)
+EMBEDDING_CHUNK_WORDS = 150           # words per encoded chunk
+EMBEDDING_BATCH_SIZE = 32             # chunks encoded per model call
+EMBEDDING_THREADS = 2                 # ONNX intra-op threads per analysis
+EMBEDDING_CACHE_SIZE = 4096           # in-memory embeddings when there is no store
+# Persistent embedding store (float16, memory-mapped; one per model),
+# shared lock-free by every process on the host. None keeps vectors in
+# memory only.
+EMBEDDING_STORE_DIR = PROCESSED_DATA_DIR / "embeddings"
+EMBEDDING_STORE_MAX_ENTRIES = 200_000   # vectors kept on compaction
+
+# Stage results kept for incremental re-analysis of revised resumes
+STAGE_CACHE_SIZE = 512
+
+# Streamlit UI: analysis results shared across sessions, keyed by content
+UI_RESULT_CACHE_TTL = 3600            # seconds a cached report stays valid
+UI_RESULT_CACHE_SIZE = 200            # cached reports per server process
+UI_COMPARE_MAX_RESUMES = 100          # resumes per comparison leaderboard
+
+# Batch job queue (submit / poll API, python -m src.worker)
+JOB_QUEUE_PATH = PROCESSED_DATA_DIR / "job_queue.sqlite"
+JOB_WORKERS = 2                       # started by the API; 0 = run src.worker separately
+JOB_MAX_ATTEMPTS = 3                  # failing documents are dead-lettered after this
+JOB_RETRY_BACKOFF = 5                 # seconds x attempt before a retry
+JOB_LEASE_SECONDS = 300               # claimed tasks of a crashed worker rerun after this
+JOB_POLL_INTERVAL = 1.0               # idle worker poll interval (seconds)
+JOB_DB_RETRIES = 5                    # attempts per queue call while the database is locked
+JOB_DB_RETRY_BACKOFF = 0.5            # seconds, doubled per retry
+JOB_SUPERVISE_INTERVAL = 5.0          # seconds between checks for dead workers
+
+# Bulk ingestion CLI (python -m src.batch)
+BATCH_WORKERS = 4                     # analysis processes
+BATCH_CHECKPOINT_EVERY = 100          # resumes per output flush + checkpoint
+BATCH_PROGRESS_INTERVAL = 10          # seconds between progress lines
+
 # Model hyperparameters
 SKILL_GAP_CLASSIFIER_PARAMS = {
     "n_estimators": 100,
@@ -72,6 +149,38 @@ SECTION_PATTERNS = {
 MIN_SKILL_CONFIDENCE = 0.6
 SKILL_CONTEXT_WINDOW = 20
 
+# Per-skill matching rules. Every skill is matched as a whole token,
+# case-insensitively, unless its rule says otherwise:
+#   case_sensitive: only the taxonomy's exact casing counts (names that
+#                   are also ordinary words)
+#   context: only count a mention with one of these terms within
+#            SKILL_CONTEXT_WINDOW characters (ambiguous names)
+#   aliases: other unambiguous spellings counted as the skill
+_LANGUAGE_CONTEXT = [
+    'programming', 'language', 'languages', 'python', 'java', 'c++', 'sql',
+    'scala', 'julia', 'matlab', 'sas', 'rust', 'kotlin', 'typescript'
+]
+SKILL_MATCH_RULES = {
+    'R': {
+        'case_sensitive': True,
+        'context': _LANGUAGE_CONTEXT + ['rstudio', 'tidyverse', 'ggplot2', 'shiny', 'cran', 'statistics']
+    },
+    'Go': {
+        'case_sensitive': True,
+        'aliases': ['Golang'],
+        'context': _LANGUAGE_CONTEXT + ['goroutines', 'microservices', 'backend']
+    },
+    'Swift': {
+        'case_sensitive': True,
+        'context': _LANGUAGE_CONTEXT + ['ios', 'xcode', 'swiftui', 'objective-c', 'apple', 'mobile']
+    },
+    'GAN': {'case_sensitive': True},
+    'Storm': {
+        'case_sensitive': True,
+        'context': ['apache', 'kafka', 'spark', 'hadoop', 'flink', 'streaming', 'topology']
+    }
+}
+
 # Experience levels (in years)
 EXPERIENCE_LEVELS = {
     "entry": (0, 1),
@@ -0,0 +1,364 @@
+"""
+Embedding Matcher - Section-level dense embeddings on CPU
+
+Resume sections and the job description are split into chunks and
+encoded by a small local model: an int8-quantized sentence encoder run
+with onnxruntime, or the static word vectors of a spaCy model. Vectors
+are kept by content hash in a persistent memory-mapped store (shared by
+every process on the host), so a document is encoded once, and
+similarities are dot products of unit vectors in numpy. Without either
+model the matcher falls back to TF-IDF.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import threading
+import sys
+
+import numpy as np
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+except ImportError:  # optional: quantized ONNX sentence encoder
+    onnxruntime = None
+
+try:
+    import spacy
+except ImportError:  # optional: spaCy word vectors
+    spacy = None
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import (
+    EMBEDDING_MODEL_TYPE,
+    EMBEDDING_ONNX_MODEL_PATH,
+    EMBEDDING_ONNX_TOKENIZER_PATH,
+    EMBEDDING_SPACY_MODEL,
+    EMBEDDING_MAX_TOKENS,
+    EMBEDDING_CHUNK_WORDS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_THREADS,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_STORE_DIR
+)
+from src.feature_extraction.semantic_matcher import SemanticMatcher
+from src.preprocessing.section_detector import SectionDetector
+from src.storage.embedding_store import EmbeddingStore
+
+
+class OnnxEncoder:
+    """Mean-pooled sentence embeddings from an ONNX transformer encoder"""
+    
+    def __init__(self, model_path: Path = EMBEDDING_ONNX_MODEL_PATH,
+                 tokenizer_path: Path = EMBEDDING_ONNX_TOKENIZER_PATH,
+                 max_tokens: int = EMBEDDING_MAX_TOKENS,
+                 batch_size: int = EMBEDDING_BATCH_SIZE,
+                 threads: int = EMBEDDING_THREADS):
+        if onnxruntime is None:
+            raise ImportError("onnxruntime and tokenizers are not installed")
+        
+        options = onnxruntime.SessionOptions()
+        # A few threads per analysis: the API and batch workers already
+        # run analyses side by side
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=max_tokens)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+        self.name = f"onnx:{Path(model_path).stem}"
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) embeddings"""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + self.batch_size])
+            input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+            attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+            
+            feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            if 'token_type_ids' in self.input_names:
+                feeds['token_type_ids'] = np.zeros_like(input_ids)
+            token_vectors = self.session.run(None, feeds)[0]
+            
+            # Mean over real (unpadded) tokens
+            weights = attention_mask[..., None].astype(np.float32)
+            vectors.append((token_vectors * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1))
+        return np.vstack(vectors)
+
+
+class SpacyEncoder:
+    """Averaged static word vectors of a spaCy model (tokenizer only)"""
+    
+    def __init__(self, model_name: str = EMBEDDING_SPACY_MODEL):
+        if spacy is None:
+            raise ImportError("spaCy is not installed")
+        
+        # Only the tokenizer and the vector table are used
+        self.nlp = spacy.load(model_name, exclude=[
+            'tok2vec', 'tagger', 'morphologizer', 'parser', 'senter',
+            'attribute_ruler', 'lemmatizer', 'ner'
+        ])
+        if not self.nlp.vocab.vectors.shape[0]:
+            raise ValueError(f"spaCy model {model_name} has no word vectors")
+        self.dim = self.nlp.vocab.vectors.shape[1]
+        self.name = f"spacy:{model_name}"
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) embeddings"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, doc in enumerate(self.nlp.tokenizer.pipe(texts, batch_size=EMBEDDING_BATCH_SIZE)):
+            # Stop words pull every document towards the same average
+            token_vectors = [token.vector for token in doc if token.has_vector and not token.is_stop]
+            if token_vectors:
+                vectors[i] = np.mean(token_vectors, axis=0)
+        return vectors
+
+
+class EmbeddingMatcher(SemanticMatcher):
+    """Matches resume to job description by cosine similarity of embeddings"""
+    
+    ENCODERS = {'onnx': OnnxEncoder, 'spacy': SpacyEncoder}
+    
+    def __init__(self, model_type: str = EMBEDDING_MODEL_TYPE,
+                 chunk_words: int = EMBEDDING_CHUNK_WORDS,
+                 cache_size: int = EMBEDDING_CACHE_SIZE,
+                 store_dir: Optional[Path] = EMBEDDING_STORE_DIR):
+        super().__init__()
+        self.model_type = model_type
+        self.chunk_words = chunk_words
+        self.cache_size = cache_size
+        self.store_dir = store_dir
+        
+        # The model (and its vector store) load on first use; None after
+        # a failed load
+        self._encoder = None
+        self._store = None
+        self._encoder_loaded = False
+        self._load_lock = threading.Lock()
+        
+        # Content hash -> unit vector, when there is no store
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @property
+    def encoder(self):
+        """The loaded encoder, or None when no model is available"""
+        if not self._encoder_loaded:
+            with self._load_lock:
+                if not self._encoder_loaded:
+                    self._encoder = self._load_encoder()
+                    if self._encoder is not None:
+                        self._store = self._open_store(self._encoder.name)
+                    self._encoder_loaded = True
+        return self._encoder
+    
+    def _load_encoder(self):
+        if self.model_type == 'auto':
+            # The ONNX model is only used when it has been exported
+            candidates = ['onnx', 'spacy'] if EMBEDDING_ONNX_MODEL_PATH.exists() else ['spacy']
+        else:
+            candidates = [self.model_type]
+        
+        for model_type in candidates:
+            try:
+                encoder = self.ENCODERS[model_type]()
+                print(f"✓ Embedding model loaded: {encoder.name}")
+                return encoder
+            except Exception as e:
+                print(f"⚠️ Embedding model '{model_type}' not available: {e}")
+        print("⚠️ Embedding matching falls back to TF-IDF")
+        return None
+    
+    def _open_store(self, model_name: str) -> Optional[EmbeddingStore]:
+        """Persistent vectors of this model, or None (in-memory cache only)"""
+        if self.store_dir is None:
+            return None
+        try:
+            return EmbeddingStore(Path(self.store_dir) / model_name.replace(':', '-'))
+        except OSError as e:
+            print(f"⚠️ Embedding store not available, caching in memory: {e}")
+            return None
+    
+    def calculate_similarity(self, resume_text: str, jd_text: str,
+                             section_spans: Dict[str, tuple] = None) -> Dict[str, float]:
+        """
+        Calculate semantic similarity from section embeddings
+        
+        Each resume section is embedded on its own; the resume vector is
+        their length-weighted mean. Note that cosine similarities of dense
+        embeddings run higher than TF-IDF ones for the same pair.
+        
+        Args:
+            resume_text: Resume text
+            jd_text: Job description text
+            section_spans: Resume section offsets (whole resume when omitted)
+            
+        Returns:
+            Dictionary with similarity scores, incl. per-section scores
+        """
+        encoder = self.encoder
+        if encoder is None:
+            return super().calculate_similarity(resume_text, jd_text, section_spans)
+        
+        print(f"  🔍 Semantic Matching (embeddings, {encoder.name}):")
+        
+        resume_clean = self._basic_clean(resume_text)
+        jd_clean = self._basic_clean(jd_text)
+        
+        # Same minimum-content rule as TF-IDF matching
+        if len(resume_clean.split()) < 10 or len(jd_clean.split()) < 10:
+            print("     ❌ ERROR: Resume or JD too short after cleaning!")
+            return {
+                'overall_similarity': 0.0,
+                'top_matching_terms': [],
+                'error': 'Text too short'
+            }
+        
+        sections = {}
+        for name in section_spans or {}:
+            text = SectionDetector.section_text(resume_text, section_spans, (name,))
+            if text and text.strip():
+                sections[name] = text
+        if not sections:
+            sections = {'resume': resume_text}
+        
+        vectors = self.embed_many([jd_text] + list(sections.values()))
+        jd_vector, section_vectors = vectors[0], vectors[1:]
+        
+        weights = np.array([len(text.split()) for text in sections.values()], dtype=np.float32)
+        resume_vector = self._normalise(weights @ section_vectors)
+        similarity_score = max(float(resume_vector @ jd_vector), 0.0) * 100
+        section_scores = np.clip(section_vectors @ jd_vector, 0, 1) * 100
+        
+        print(f"     ✓ Similarity calculated: {similarity_score:.2f}%")
+        
+        overlap = self._calculate_word_overlap(resume_clean, jd_clean)
+        return {
+            'overall_similarity': round(similarity_score, 2),
+            'section_similarity': {
+                name: round(float(score), 2) for name, score in zip(sections, section_scores)
+            },
+            'top_matching_terms': overlap['common_keywords'][:10],
+            'method': 'embedding',
+            'model': encoder.name
+        }
+    
+    def calculate_similarity_matrix(self, resume_texts: List[str],
+                                    jd_texts: List[str]) -> np.ndarray:
+        """
+        Calculate similarity for every resume against every job description
+        
+        Each document is embedded once (or read from the cache); the
+        N x M scores are one matrix product.
+        
+        Args:
+            resume_texts: N resume texts
+            jd_texts: M job description texts
+            
+        Returns:
+            N x M array of similarity scores (0-100)
+        """
+        if self.encoder is None:
+            return super().calculate_similarity_matrix(resume_texts, jd_texts)
+        
+        scores = np.zeros((len(resume_texts), len(jd_texts)))
+        if not resume_texts or not jd_texts:
+            return scores
+        
+        vectors = self.embed_many(list(resume_texts) + list(jd_texts))
+        n = len(resume_texts)
+        scores = np.clip(vectors[:n] @ vectors[n:].T, 0, 1) * 100
+        
+        # Same minimum-content rule as calculate_similarity
+        resume_ok = np.array([len(self._basic_clean(text).split()) >= 10 for text in resume_texts])
+        jd_ok = np.array([len(self._basic_clean(text).split()) >= 10 for text in jd_texts])
+        scores[~resume_ok, :] = 0.0
+        scores[:, ~jd_ok] = 0.0
+        
+        return np.round(scores, 2)
+    
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """
+        Unit-length embeddings of texts, one row each
+        
+        A text's embedding is the mean of its chunk embeddings. Stored
+        vectors are read from the store's mapped file; the other texts
+        are chunked, encoded together in one batch and stored.
+        """
+        encoder = self.encoder
+        keys = [self._content_hash(encoder.name, text) for text in texts]
+        found = self._lookup(keys)
+        
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            chunks, rows = [], {}
+            for key, text in missing.items():
+                for chunk in self._chunks(text):
+                    rows.setdefault(key, []).append(len(chunks))
+                    chunks.append(chunk)
+            encoded = encoder.encode(chunks) if chunks else None
+            
+            new = {
+                key: self._normalise(encoded[chunk_rows].mean(axis=0))
+                for key, chunk_rows in rows.items()
+            }
+            self._remember(new)
+            found.update(new)
+        
+        if not found:
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        # Texts without words get a zero vector (similarity 0)
+        empty = np.zeros(next(iter(found.values())).shape[0], dtype=np.float32)
+        return np.vstack([found.get(key, empty) for key in keys])
+    
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Known vectors among keys"""
+        if self._store is not None:
+            vectors, present = self._store.get_many(keys)
+            return {key: vector for key, vector, hit in zip(keys, vectors, present) if hit}
+        
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    found[key] = self._cache[key]
+        return found
+    
+    def _remember(self, vectors: Dict[str, np.ndarray]):
+        if not vectors:
+            return
+        if self._store is not None:
+            self._store.put_many(list(vectors), np.stack(list(vectors.values())))
+            return
+        
+        with self._cache_lock:
+            self._cache.update(vectors)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _chunks(self, text: str) -> List[str]:
+        """Text split into pieces of at most chunk_words words"""
+        words = text.split()
+        return [
+            ' '.join(words[start:start + self.chunk_words])
+            for start in range(0, len(words), self.chunk_words)
+        ]
+    
+    @staticmethod
+    def _content_hash(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{text}".encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _normalise(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return (vector / norm).astype(np.float32) if norm > 0 else vector.astype(np.float32)
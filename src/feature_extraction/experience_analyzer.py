@@ -12,6 +12,28 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.preprocessing.text_cleaner import TextCleaner
 
+_MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+_MONTH_NAME = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|'
+               r'aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+
+
+def _date_pattern(name: str) -> str:
+    """'Jun 2019', 'June, 2019', '06/2019' or '2019'"""
+    return (
+        rf'(?:(?P<{name}_month>{_MONTH_NAME})\.?,?\s*|(?P<{name}_num>0?[1-9]|1[0-2])\s*[/.]\s*)?'
+        rf'(?P<{name}_year>(?:19|20)\d{{2}})'
+    )
+
+
+# One pass finds every date range: "June 2023 - August 2023", "2019 – Present",
+# "03/2020 to 11/2021", "Jan 2022 till date"
+DATE_RANGE_PATTERN = re.compile(
+    r'\b' + _date_pattern('start')
+    + r'\s*(?:-|–|—|to|until|till)\s*'
+    + r'(?:(?P<current>present|current|now|ongoing|today|date)|' + _date_pattern('end') + r')\b',
+    re.IGNORECASE
+)
+
 
 class ExperienceAnalyzer:
     """Analyzes work experience and calculates years"""
@@ -19,16 +41,23 @@ class ExperienceAnalyzer:
     def __init__(self):
         self.text_cleaner = TextCleaner()
     
-    def analyze_experience(self, experience_text: str) -> Dict:
+    def analyze_experience(self, experience_text: str, section_spans: Dict = None) -> Dict:
         """
         Analyze experience section
         
         Args:
-            experience_text: Experience section from resume
-            
+            experience_text: Experience section from resume, or the full
+                resume text when section_spans is given
+            section_spans: {section: (start, end)} offsets into
+                experience_text; only the experience span is analyzed
+                
         Returns:
             Dictionary with experience analysis
         """
+        if section_spans and 'experience' in section_spans:
+            start, end = section_spans['experience']
+            experience_text = experience_text[start:end]
+        
         print(f"  🔍 DEBUG Experience Analysis:")
         print(f"     - Input length: {len(experience_text)} chars")
         
@@ -36,26 +65,161 @@ class ExperienceAnalyzer:
         years = self._extract_years_improved(experience_text)
         print(f"     - Years found: {years}")
         
+        # Date ranges per role; overlapping roles are counted once
+        timeline = self.extract_timeline(experience_text)
+        
         # Calculate total experience
-        total_years = self._calculate_total_years(years, experience_text)
+        if timeline:
+            total_months = self.merged_months([(role['start_index'], role['end_index']) for role in timeline])
+            total_years = round(total_months / 12, 1)
+            print(f"     - Timeline: {len(timeline)} roles, {total_months} months after merging overlaps")
+        else:
+            total_years = self._calculate_total_years(years, experience_text)
         print(f"     - Total years calculated: {total_years}")
         
         # Detect seniority level
         seniority = self._detect_seniority(experience_text, total_years)
         
         # Count roles
-        roles = self._count_roles(experience_text)
+        roles = self._count_roles(experience_text, timeline)
         
         result = {
             'total_years': total_years,
             'seniority_level': seniority,
             'number_of_roles': roles,
-            'years_mentioned': years
+            'years_mentioned': years,
+            'timeline': timeline
         }
         
         print(f"     ✓ Experience analysis complete: {total_years} years, {seniority} level")
         return result
     
+    def extract_timeline(self, text: str) -> List[Dict]:
+        """
+        Parse every date range in text into a role interval
+        
+        Months are indexed as year * 12 + month - 1; end_index is
+        exclusive. Ranges without months run from January of the start
+        year to January of the end year (a full year when both are the
+        same); "Present" and future dates end at the current month.
+        
+        Returns:
+            [{'start': 'YYYY-MM', 'end': 'YYYY-MM', 'months', 'is_current',
+              'start_index', 'end_index', 'line', 'span', 'block'}, ...]
+            in document order; span is the range's (start, end) in text,
+            block the role's text: from its header (the date line, or
+            the title line just above it) to the next role's header
+        """
+        now = datetime.now()
+        now_index = now.year * 12 + now.month
+        timeline = []
+        
+        for match in DATE_RANGE_PATTERN.finditer(text):
+            start_month = self._month_number(match, 'start')
+            start_index = int(match.group('start_year')) * 12 + (start_month or 1) - 1
+            
+            if match.group('current'):
+                end_index = now_index
+            else:
+                end_month = self._month_number(match, 'end')
+                end_year = int(match.group('end_year'))
+                if end_month:
+                    end_index = end_year * 12 + end_month
+                else:
+                    end_index = end_year * 12
+                    if end_index <= start_index:
+                        end_index = end_year * 12 + 12
+                end_index = min(end_index, now_index)
+            
+            if end_index <= start_index:
+                continue
+            
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            line_end = text.find('\n', match.end())
+            
+            # A title on the line above belongs to this role, unless it is
+            # the previous role's date line
+            header_start = line_start
+            previous_line = text.rfind('\n', 0, max(line_start - 1, 0)) + 1
+            if line_start > 0 and (not timeline or previous_line > timeline[-1]['span'][1]):
+                header_start = previous_line
+            
+            timeline.append({
+                'start': f"{start_index // 12}-{start_index % 12 + 1:02d}",
+                'end': f"{(end_index - 1) // 12}-{(end_index - 1) % 12 + 1:02d}",
+                'months': end_index - start_index,
+                'is_current': bool(match.group('current')),
+                'start_index': start_index,
+                'end_index': end_index,
+                'line': text[line_start:line_end if line_end != -1 else len(text)].strip(),
+                'span': match.span(),
+                'block': (header_start, len(text))
+            })
+            if len(timeline) > 1:
+                timeline[-2]['block'] = (timeline[-2]['block'][0], header_start)
+        
+        return timeline
+    
+    @staticmethod
+    def _month_number(match: re.Match, name: str) -> int:
+        """1-12 from a month name or number group, 0 when absent"""
+        if match.group(f'{name}_month'):
+            return _MONTHS.index(match.group(f'{name}_month')[:3].lower()) + 1
+        if match.group(f'{name}_num'):
+            return int(match.group(f'{name}_num'))
+        return 0
+    
+    def skill_tenure(self, timeline: List[Dict], mentions: Dict[str, List[Tuple[int, int]]]) -> Dict[str, float]:
+        """
+        Years per skill, from the dated roles whose text mentions it
+        
+        Args:
+            timeline: extract_timeline() result for a text
+            mentions: {skill: [(start, end), ...]} offsets into the same
+                text (SkillMatcher.find_all)
+                
+        Returns:
+            {skill: years}, overlapping roles counted once; skills only
+            mentioned outside dated roles are left out
+        """
+        blocks = sorted((role['block'], role['start_index'], role['end_index']) for role in timeline)
+        occurrences = sorted((start, skill) for skill, spans in mentions.items() for start, _ in spans)
+        
+        # One sweep over mentions and role blocks, both in text order
+        intervals = {}
+        i = 0
+        for position, skill in occurrences:
+            while i < len(blocks) and blocks[i][0][1] <= position:
+                i += 1
+            if i == len(blocks):
+                break
+            if blocks[i][0][0] <= position:
+                intervals.setdefault(skill, set()).add(blocks[i][1:])
+        
+        return {
+            skill: round(self.merged_months(list(roles)) / 12, 1)
+            for skill, roles in intervals.items()
+        }
+    
+    @staticmethod
+    def merged_months(intervals: List[Tuple[int, int]]) -> int:
+        """Months covered by [start, end) month intervals, overlaps counted once"""
+        total = 0
+        current_start = current_end = None
+        
+        # Sort and sweep: extend the running interval while the next one overlaps
+        for start, end in sorted(intervals):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+    
     def _extract_years_improved(self, text: str) -> List[int]:
         """Enhanced year extraction with multiple patterns"""
         years = []
@@ -66,7 +230,9 @@ class ExperienceAnalyzer:
         years.extend([int(y) for y in year_matches])
         
         # Pattern 2: Explicit year mentions like "5 years", "3+ years"
-        exp_years_pattern = r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)'
+        # Numbers only start where a digit run starts: long digit runs
+        # would otherwise be rescanned from every position
+        exp_years_pattern = r'(?<!\d)(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)'
         exp_matches = re.findall(exp_years_pattern, text, re.IGNORECASE)
         if exp_matches:
             # These are direct year counts, not calendar years
@@ -85,7 +251,7 @@ class ExperienceAnalyzer:
         print(f"       > Calculating from years: {years}")
         
         # Method 1: Look for explicit year mentions first
-        exp_pattern = r'(\d+\.?\d*)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)'
+        exp_pattern = r'(?<![\d.])(\d+(?:\.\d+)?)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)'
         exp_matches = re.findall(exp_pattern, text, re.IGNORECASE)
         
         if exp_matches:
@@ -161,13 +327,14 @@ class ExperienceAnalyzer:
         else:
             return 'entry'
     
-    def _count_roles(self, text: str) -> int:
+    def _count_roles(self, text: str, timeline: List[Dict] = None) -> int:
         """Count number of roles/positions"""
-        # Look for common job title indicators
+        # Look for common job title indicators. Indentation excludes
+        # newlines, so blank-line runs are not rescanned from every line
         role_indicators = [
-            r'\n\s*[A-Z][a-z]+\s+(Engineer|Developer|Analyst|Scientist|Manager|Intern|Consultant)',
-            r'\n\s*[A-Z][a-z]+\s+[A-Z][a-z]+\s+(Engineer|Developer|Analyst)',
-            r'\n\s*•\s*[A-Z][a-z]+\s+(Engineer|Developer|Analyst|Scientist|Manager)',
+            r'\n[^\S\n]*[A-Z][a-z]+\s+(Engineer|Developer|Analyst|Scientist|Manager|Intern|Consultant)',
+            r'\n[^\S\n]*[A-Z][a-z]+\s+[A-Z][a-z]+\s+(Engineer|Developer|Analyst)',
+            r'\n[^\S\n]*•\s*[A-Z][a-z]+\s+(Engineer|Developer|Analyst|Scientist|Manager)',
         ]
         
         count = 0
@@ -176,9 +343,9 @@ class ExperienceAnalyzer:
             count += len(matches)
         
         # Also count date ranges as indicators of separate roles
-        date_pattern = r'\b(19\d{2}|20[0-2]\d)\s*[-–—]\s*(19\d{2}|20[0-2]\d|present|current)\b'
-        date_ranges = re.findall(date_pattern, text, re.IGNORECASE)
-        count = max(count, len(date_ranges))
+        if timeline is None:
+            timeline = self.extract_timeline(text)
+        count = max(count, len(timeline))
         
         # Minimum 1 role if experience section exists
         return max(count, 1)
@@ -4,30 +4,45 @@ All bugs fixed, generates unique questions
 """
 
 import re
+from pathlib import Path
 from typing import List, Dict
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.preprocessing.section_detector import EMAIL_PATTERN
 
 
 class InterviewQuestionGenerator:
-    
+
     def generate_questions(
         self, 
         resume_skills: Dict[str, List[Dict]], 
         experience_data: Dict,
         jd_text: str,
         resume_text: str = "",
-        top_n: int = 10
+        top_n: int = 10,
+        section_spans: Dict = None
     ) -> Dict[str, List[Dict]]:
-        """Generate unique questions per resume"""
+        """
+        Generate unique questions per resume
+        
+        section_spans ({section: (start, end)} offsets into resume_text)
+        lets projects be read straight from the projects section instead
+        of searching the whole resume for it.
+        """
         
         print("\n[QUESTION GEN] === STARTING ===")
         print(f"[QUESTION GEN] Resume text: {len(resume_text)} chars")
         print(f"[QUESTION GEN] Skills categories: {list(resume_skills.keys())}")
         
-        # Clean text
-        cleaned_text = self._clean_resume_text(resume_text)
-        
         # Extract content
-        projects = self._extract_projects(cleaned_text)
+        if section_spans and 'projects' in section_spans:
+            start, end = section_spans['projects']
+            projects = self._parse_projects(resume_text[start:end])
+        else:
+            cleaned_text = self._clean_resume_text(resume_text)
+            projects = self._extract_projects(cleaned_text)
         
         years = experience_data.get('total_years', 0)
         seniority = experience_data.get('seniority_level', 'entry')
@@ -68,7 +83,7 @@ class InterviewQuestionGenerator:
         """Clean junk"""
         if not text:
             return ""
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', text)
+        text = EMAIL_PATTERN.sub('', text)
         text = re.sub(r'\b\d{10}\b', '', text)
         for char in ['§', 'ï', '¨', '©', '®', '™', '\x00']:
             text = text.replace(char, '')
@@ -95,7 +110,10 @@ class InterviewQuestionGenerator:
             if idx != -1 and idx < project_end:
                 project_end = idx
         
-        project_section = text[project_start:project_end]
+        return self._parse_projects(text[project_start:project_end])
+    
+    def _parse_projects(self, project_section: str) -> List[str]:
+        """Split a projects section into individual project descriptions"""
         projects = []
         lines = project_section.split('\n')
         
@@ -2,10 +2,11 @@
 Semantic Matcher - GUARANTEED WORKING VERSION
 """
 
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from typing import Dict
+from typing import Dict, List
 from pathlib import Path
 import sys
 import re
@@ -26,13 +27,16 @@ class SemanticMatcher:
         )
         self.is_fitted = False
     
-    def calculate_similarity(self, resume_text: str, jd_text: str) -> Dict[str, float]:
+    def calculate_similarity(self, resume_text: str, jd_text: str,
+                             section_spans: Dict[str, tuple] = None) -> Dict[str, float]:
         """
         Calculate semantic similarity - GUARANTEED TO WORK
         
         Args:
             resume_text: Resume text
             jd_text: Job description text
+            section_spans: Resume section offsets (unused: TF-IDF compares
+                whole documents)
             
         Returns:
             Dictionary with similarity scores
@@ -68,7 +72,9 @@ class SemanticMatcher:
         # Method 1: TF-IDF with error handling
         try:
             print("     - Attempting TF-IDF vectorization...")
-            tfidf_matrix = self.vectorizer.fit_transform([resume_clean, jd_clean])
+            # Fit a fresh copy so concurrent calls never share fitted state
+            vectorizer = clone(self.vectorizer)
+            tfidf_matrix = vectorizer.fit_transform([resume_clean, jd_clean])
             self.is_fitted = True
             
             print(f"     ✓ TF-IDF successful: {tfidf_matrix.shape}")
@@ -78,7 +84,7 @@ class SemanticMatcher:
             similarity_score = float(similarity_matrix[0][0]) * 100
             
             # Get top terms
-            top_terms = self._get_top_matching_terms(tfidf_matrix, n=10)
+            top_terms = self._get_top_matching_terms(vectorizer, tfidf_matrix, n=10)
             
             print(f"     ✓ Similarity calculated: {similarity_score:.2f}%")
             
@@ -117,6 +123,46 @@ class SemanticMatcher:
                 'method': 'character_based'
             }
     
+    def calculate_similarity_matrix(self, resume_texts: List[str], 
+                                    jd_texts: List[str]) -> np.ndarray:
+        """
+        Calculate similarity for every resume against every job description
+        
+        The vectorizer is fitted once on the whole corpus, so each document
+        is cleaned and vectorised a single time instead of once per pair.
+        
+        Args:
+            resume_texts: N resume texts
+            jd_texts: M job description texts
+            
+        Returns:
+            N x M array of similarity scores (0-100)
+        """
+        scores = np.zeros((len(resume_texts), len(jd_texts)))
+        if not resume_texts or not jd_texts:
+            return scores
+        
+        resume_clean = [self._basic_clean(text) for text in resume_texts]
+        jd_clean = [self._basic_clean(text) for text in jd_texts]
+        
+        try:
+            vectorizer = clone(self.vectorizer)
+            tfidf_matrix = vectorizer.fit_transform(resume_clean + jd_clean)
+        except Exception as e:
+            print(f"     ⚠️ TF-IDF matrix failed: {e}")
+            return scores
+        
+        n = len(resume_clean)
+        scores = cosine_similarity(tfidf_matrix[:n], tfidf_matrix[n:]) * 100
+        
+        # Same minimum-content rule as calculate_similarity
+        resume_ok = np.array([len(text.split()) >= 10 for text in resume_clean])
+        jd_ok = np.array([len(text.split()) >= 10 for text in jd_clean])
+        scores[~resume_ok, :] = 0.0
+        scores[:, ~jd_ok] = 0.0
+        
+        return np.round(scores, 2)
+    
     def _basic_clean(self, text: str) -> str:
         """Basic text cleaning that preserves content"""
         # Convert to lowercase
@@ -177,10 +223,10 @@ class SemanticMatcher:
         
         return round(similarity, 2)
     
-    def _get_top_matching_terms(self, tfidf_matrix, n: int = 10) -> list:
+    def _get_top_matching_terms(self, vectorizer, tfidf_matrix, n: int = 10) -> list:
         """Extract top matching terms"""
         try:
-            feature_names = self.vectorizer.get_feature_names_out()
+            feature_names = vectorizer.get_feature_names_out()
             resume_scores = tfidf_matrix[0].toarray()[0]
             jd_scores = tfidf_matrix[1].toarray()[0]
             
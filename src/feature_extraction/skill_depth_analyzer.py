@@ -7,6 +7,13 @@ This goes beyond keyword matching to understand DEPTH
 import re
 from typing import Dict, List, Tuple
 from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.preprocessing.section_detector import SectionDetector
+from src.feature_extraction.skill_matcher import SkillMatcher
 
 
 class SkillDepthAnalyzer:
@@ -20,7 +27,14 @@ class SkillDepthAnalyzer:
     This is what separates "mentioned Python" from "3 years production Python"
     """
     
-    def __init__(self):
+    # Sections that carry usage evidence (a skills list proves nothing about depth)
+    EVIDENCE_SECTIONS = ('experience', 'projects')
+    
+    def __init__(self, skill_matcher: SkillMatcher = None):
+        # Counts mentions as whole tokens ("Java" not in "JavaScript");
+        # without one, mentions are counted as substrings
+        self.skill_matcher = skill_matcher
+        
         # Context quality indicators
         self.context_indicators = {
             'theory': [
@@ -58,7 +72,10 @@ class SkillDepthAnalyzer:
         self, 
         skill: str, 
         full_text: str,
-        context_window: str = None
+        context_window: str = None,
+        full_text_lower: str = None,
+        mentions: int = None,
+        tenure_years: float = None
     ) -> Dict:
         """
         Comprehensive depth analysis for a single skill
@@ -80,13 +97,15 @@ class SkillDepthAnalyzer:
             context_window = self._extract_skill_context(skill, full_text, window=200)
         
         # 1. Analyze evidence strength
-        evidence_strength = self._calculate_evidence_strength(skill, full_text, context_window)
+        evidence_strength = self._calculate_evidence_strength(
+            skill, full_text, context_window, full_text_lower, mentions
+        )
         
         # 2. Determine context quality
         context_quality = self._determine_context_quality(context_window)
         
         # 3. Determine experience level
-        experience_level = self._determine_experience_level(context_window)
+        experience_level = self._determine_experience_level(context_window, tenure_years)
         
         # 4. Extract proof points
         proof_points = self._extract_proof_points(context_window)
@@ -115,6 +134,7 @@ class SkillDepthAnalyzer:
             'experience_level': experience_level,
             'proof_points': proof_points,
             'depth_score': depth_score,
+            'tenure_years': tenure_years,
             'explanation': explanation,
             'context_snippet': context_window[:150]
         }
@@ -145,7 +165,9 @@ class SkillDepthAnalyzer:
         self, 
         skill: str, 
         full_text: str, 
-        context: str
+        context: str,
+        full_text_lower: str = None,
+        mentions: int = None
     ) -> int:
         """
         Calculate evidence strength (0-5 stars)
@@ -153,7 +175,10 @@ class SkillDepthAnalyzer:
         """
         
         # Count mentions
-        mentions = full_text.lower().count(skill.lower())
+        if mentions is None:
+            if full_text_lower is None:
+                full_text_lower = full_text.lower()
+            mentions = full_text_lower.count(skill.lower())
         
         # Base score from mentions
         if mentions >= 5:
@@ -197,9 +222,12 @@ class SkillDepthAnalyzer:
         else:
             return 'hands_on'  # Default assumption
     
-    def _determine_experience_level(self, context: str) -> str:
+    def _determine_experience_level(self, context: str, tenure_years: float = None) -> str:
         """
         Determine experience level: beginner < intermediate < advanced < expert
+        
+        tenure_years: the skill's tenure from the experience timeline;
+        without it, years stated in the context are used
         """
         context_lower = context.lower()
         
@@ -209,9 +237,11 @@ class SkillDepthAnalyzer:
                 return level
         
         # Check for years of experience
-        years_match = re.search(r'(\d+)\s*(?:years?|yrs?)', context_lower)
-        if years_match:
-            years = int(years_match.group(1))
+        years = tenure_years
+        if years is None:
+            years_match = re.search(r'(\d+)\s*(?:years?|yrs?)', context_lower)
+            years = int(years_match.group(1)) if years_match else None
+        if years is not None:
             if years >= 5:
                 return 'expert'
             elif years >= 3:
@@ -338,7 +368,9 @@ class SkillDepthAnalyzer:
     def analyze_all_skills(
         self, 
         skills_dict: Dict[str, List[Dict]], 
-        full_text: str
+        full_text: str,
+        section_spans: Dict[str, Tuple[int, int]] = None,
+        skill_tenure: Dict[str, float] = None
     ) -> Dict[str, Dict]:
         """
         Analyze depth for all extracted skills
@@ -346,19 +378,39 @@ class SkillDepthAnalyzer:
         Args:
             skills_dict: {category: [{'skill': name, 'count': n, ...}, ...]}
             full_text: Full resume text
-        
+            section_spans: {section: (start, end)} offsets into full_text;
+                when given, evidence is counted in EVIDENCE_SECTIONS only
+            skill_tenure: {skill: years} from the experience timeline
+                (ExperienceAnalyzer.skill_tenure)
+                
         Returns:
             {skill_name: depth_analysis, ...}
         """
         
         depth_analyses = {}
         
+        if section_spans:
+            evidence_text = SectionDetector.section_text(
+                full_text, section_spans, self.EVIDENCE_SECTIONS
+            )
+            # No experience/projects sections: fall back to the whole resume
+            full_text = evidence_text or full_text
+        
+        # Lowercase once instead of once per skill
+        full_text_lower = full_text.lower()
+        # One matcher pass counts every skill's mentions
+        mention_counts = self.skill_matcher.count(full_text) if self.skill_matcher else None
+        
         for category, skill_list in skills_dict.items():
             for skill_data in skill_list:
                 skill = skill_data['skill']
                 context = skill_data.get('context', '')
+                mentions = mention_counts.get(skill, 0) if mention_counts is not None else None
+                tenure_years = skill_tenure.get(skill) if skill_tenure else None
                 
-                analysis = self.analyze_skill_depth(skill, full_text, context)
+                analysis = self.analyze_skill_depth(
+                    skill, full_text, context, full_text_lower, mentions, tenure_years
+                )
                 depth_analyses[skill] = analysis
         
         return depth_analyses
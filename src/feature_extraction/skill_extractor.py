@@ -3,7 +3,6 @@ Skill Extraction Engine
 """
 
 import json
-import re
 from pathlib import Path
 from typing import List, Dict, Set
 import sys
@@ -11,6 +10,8 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.config import SKILL_TAXONOMY_PATH, MIN_SKILL_CONFIDENCE
+from src.feature_extraction.skill_matcher import SkillMatcher
+from src.feature_extraction.experience_analyzer import ExperienceAnalyzer
 
 
 class SkillExtractor:
@@ -19,6 +20,9 @@ class SkillExtractor:
     def __init__(self):
         self.skill_taxonomy = self._load_skill_taxonomy()
         self.all_skills = self._flatten_skills()
+        # Whole-token matching with per-skill rules, one regex pass per text
+        self.matcher = SkillMatcher(self.skill_taxonomy)
+        self.experience_analyzer = ExperienceAnalyzer()
     
     def _load_skill_taxonomy(self) -> Dict:
         """Load skill taxonomy from JSON file"""
@@ -46,7 +50,7 @@ class SkillExtractor:
         Returns:
             Dictionary with skill categories and extracted skills
         """
-        text_lower = text.lower()
+        mentions = self.matcher.find_all(text)
         extracted_skills = {}
         
         # Extract by category
@@ -54,15 +58,13 @@ class SkillExtractor:
             category_skills = []
             
             for skill in skill_list:
-                skill_lower = skill.lower()
-                
                 # Check if skill is mentioned
-                if skill_lower in text_lower:
+                if skill in mentions:
                     # Count occurrences
-                    count = text_lower.count(skill_lower)
+                    count = len(mentions[skill])
                     
-                    # Extract context
-                    context = self._extract_context(text, skill)
+                    # Extract context around the first mention
+                    context = self._extract_context(text, mentions[skill][0])
                     
                     # Calculate confidence
                     confidence = min(0.5 + (count * 0.1), 1.0)
@@ -80,17 +82,10 @@ class SkillExtractor:
         
         return extracted_skills
     
-    def _extract_context(self, text: str, skill: str, window: int = 50) -> str:
-        """Extract context around skill mention"""
-        text_lower = text.lower()
-        skill_lower = skill.lower()
-        
-        pos = text_lower.find(skill_lower)
-        if pos == -1:
-            return ""
-        
-        start = max(0, pos - window)
-        end = min(len(text), pos + len(skill) + window)
+    def _extract_context(self, text: str, span: tuple, window: int = 50) -> str:
+        """Extract context around a skill mention at span (start, end)"""
+        start = max(0, span[0] - window)
+        end = min(len(text), span[1] + window)
         
         return text[start:end]
     
@@ -113,22 +108,12 @@ class SkillExtractor:
         return summary
     
     def extract_skill_years(self, text: str, skill: str) -> float:
-        """Attempt to extract years of experience for a skill"""
-        patterns = [
-            rf'(\d+)\s*(?:years?|yrs?)\s+(?:of\s+)?{skill}',
-            rf'{skill}\s*\((\d+)\s*(?:years?|yrs?)\)',
-            rf'{skill}.*?(\d+)\s*(?:years?|yrs?)'
-        ]
-        
-        text_lower = text.lower()
-        skill_lower = skill.lower()
-        
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                return float(match.group(1))
-        
-        return 0.0
+        """
+        Years of experience with a skill: the combined tenure of the dated
+        roles in text that mention it (0.0 if none do)
+        """
+        timeline = self.experience_analyzer.extract_timeline(text)
+        return self.experience_analyzer.skill_tenure(timeline, self.matcher.find_all(text)).get(skill, 0.0)
 
 
 # Test
@@ -0,0 +1,170 @@
+"""
+Skill Matcher - Token-aware taxonomy matching with one compiled pattern
+
+Substring checks find "R" and "Go" inside most words, "Java" inside
+"JavaScript" and "SQL" inside "MySQL". Here every skill name (and alias)
+is one alternative of a single regex that only matches whole tokens;
+per-skill rules (SKILL_MATCH_RULES) add case sensitivity and required
+context for ambiguous names; their aliases are unambiguous and match
+without it.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import SKILL_MATCH_RULES, SKILL_CONTEXT_WINDOW
+
+# A match must not run into a neighbouring word. '+' and '#' continue a
+# token (C / C++ / C#), and so does '.' when a word follows (Node.js),
+# but a full stop ends it.
+_TOKEN_START = r'(?<!\w)'
+_TOKEN_END = r'(?![\w+#]|\.\w)'
+# Framework names are often written with a '.js' suffix ("React.js",
+# "Vue.js"); a mention matches the form with the suffix, else without
+_JS_SUFFIX = r'(?:\.js\b)?'
+
+
+class SkillMatcher:
+    """Finds taxonomy skills in text in a single regex pass"""
+    
+    def __init__(self, skill_taxonomy: Dict[str, List[str]],
+                 rules: Optional[Dict[str, Dict]] = None,
+                 context_window: int = SKILL_CONTEXT_WINDOW):
+        rules = SKILL_MATCH_RULES if rules is None else rules
+        rules = {skill.lower(): rule for skill, rule in rules.items()}
+        self.context_window = context_window
+        
+        # Normalised surface form -> skills it names
+        self._skills_by_form: Dict[str, List[str]] = {}
+        # Normalised surface form -> skills it is an alias of ("golang"
+        # names Go unambiguously, so Go's context rule does not apply)
+        self._alias_of: Dict[str, set] = {}
+        # Skill -> compiled context requirement
+        self._context: Dict[str, re.Pattern] = {}
+        # Surface forms as written, by case sensitivity
+        case_sensitive_forms, forms_any_case = set(), set()
+        alternatives = {}
+        
+        for skills in skill_taxonomy.values():
+            for skill in skills:
+                rule = rules.get(skill.lower(), {})
+                forms = [(skill, rule.get('case_sensitive', False))]
+                forms += [(alias, False) for alias in rule.get('aliases', [])]
+                
+                for form, case_sensitive in forms:
+                    key = self._normalise(form)
+                    if skill not in self._skills_by_form.setdefault(key, []):
+                        self._skills_by_form[key].append(skill)
+                    if form != skill:
+                        self._alias_of.setdefault(key, set()).add(skill)
+                    pattern = r'\s+'.join(re.escape(word) for word in form.split())
+                    alternatives[key] = f'(?-i:{pattern})' if case_sensitive else pattern
+                    if case_sensitive:
+                        case_sensitive_forms.add(' '.join(form.split()))
+                    else:
+                        forms_any_case.add(key)
+                
+                if rule.get('context'):
+                    terms = '|'.join(re.escape(term) for term in rule['context'])
+                    self._context[skill] = re.compile(
+                        _TOKEN_START + f'(?:{terms})' + _TOKEN_END, re.IGNORECASE
+                    )
+        
+        # Forms are merged into prefix tries: the engine tests one branch
+        # per character instead of every skill name at every position
+        branches = [self._trie_pattern(forms_any_case)]
+        if case_sensitive_forms:
+            branches.append('(?-i:' + self._trie_pattern(case_sensitive_forms) + ')')
+        self._pattern = re.compile(
+            _TOKEN_START + '(?:' + '|'.join(branches) + ')' + _JS_SUFFIX + _TOKEN_END,
+            re.IGNORECASE
+        )
+        
+        # Skills named inside a longer form ("SQL" in "SQL Server") are
+        # counted along with it, since the longer match consumes them
+        self._implied: Dict[str, List[Tuple[str, str]]] = {}
+        for key in alternatives:
+            single = {
+                other: re.compile(_TOKEN_START + alternatives[other] + _TOKEN_END, re.IGNORECASE)
+                for other in alternatives if other != key and len(other) < len(key)
+            }
+            # (form found inside key, skill it names)
+            self._implied[key] = [
+                (other, skill)
+                for other, pattern in single.items() if pattern.search(key)
+                for skill in self._skills_by_form[other]
+                if skill not in self._skills_by_form[key]
+            ]
+    
+    @staticmethod
+    def _normalise(form: str) -> str:
+        return ' '.join(form.split()).lower()
+    
+    @classmethod
+    def _trie_pattern(cls, forms) -> str:
+        """Regex matching any of the literal forms, factored by common prefix"""
+        trie = {}
+        for form in forms:
+            node = trie
+            for char in form:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return cls._trie_node(trie)
+    
+    @classmethod
+    def _trie_node(cls, node: Dict) -> str:
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + cls._trie_node(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        group = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A shorter form ends here; the greedy optional tries the
+            # longer one first ("AWS SageMaker" before "AWS")
+            return f'(?:{group})?'
+        return group
+    
+    def find_all(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Locate every skill mention
+        
+        Returns:
+            {skill: [(start, end), ...]} in text order, for skills found
+        """
+        mentions = {}
+        
+        for match in self._pattern.finditer(text):
+            key = self._normalise(match.group())
+            if key not in self._skills_by_form:
+                # "React.js" for a skill listed as "React"
+                key = key[:-len('.js')]
+            span = match.span()
+            
+            # Implied skills need their own context too ("Go" in a longer form)
+            named = [(key, skill) for skill in self._skills_by_form[key]] + self._implied[key]
+            for form, skill in named:
+                if self._in_context(skill, form, text, span):
+                    mentions.setdefault(skill, []).append(span)
+        
+        return mentions
+    
+    def _in_context(self, skill: str, form: str, text: str, span: Tuple[int, int]) -> bool:
+        """
+        True if the skill was named by one of its aliases, has no context
+        rule, or a context term is near the span
+        """
+        context = self._context.get(skill)
+        if context is None or skill in self._alias_of.get(form, ()):
+            return True
+        window = self.context_window
+        return context.search(text, max(0, span[0] - window), span[1] + window) is not None
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """{skill: number of mentions} for skills found in text"""
+        return {skill: len(spans) for skill, spans in self.find_all(text).items()}
@@ -0,0 +1,151 @@
+"""
+Compact Report Model - Slim, numbers-and-IDs view of an analysis report
+
+A full report is ~25 KB of JSON, most of it explanation text and context
+snippets. The slim view keeps scores and references only: skills are
+indices into the skill taxonomy, labels are indices into the label lists
+returned by SlimReportEncoder.schema().
+"""
+
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard json module
+    orjson = None
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import SCORING_WEIGHTS
+from src.models.scoring_engine import ScoringEngine
+
+DIFFICULTY_LABELS = ['easy', 'medium', 'hard']
+
+
+@dataclass(slots=True)
+class SkillGap:
+    skill_id: int
+    difficulty: int
+    learning_days: int
+
+
+@dataclass(slots=True)
+class SkillDepth:
+    skill_id: int
+    depth_score: int
+    evidence_strength: int
+
+
+@dataclass(slots=True)
+class SkillRetention:
+    skill_id: int
+    retention_probability: float
+
+
+@dataclass(slots=True)
+class SlimReport:
+    overall_score: float
+    recommendation: int
+    confidence: int
+    component_scores: Tuple[float, ...]   # in SCORING_WEIGHTS order
+    match_percentage: float
+    semantic_similarity: float
+    total_years: float
+    required_years: float
+    matched_skills: List[int]
+    missing_skills: List[SkillGap]
+    top_depth: List[SkillDepth]
+    retention: List[SkillRetention]
+    partial: bool = False                  # feature stages skipped (time budget)
+
+
+class SlimReportEncoder:
+    """Converts full pipeline reports into SlimReport objects"""
+    
+    def __init__(self, skill_taxonomy: Dict[str, List[str]]):
+        self.skills = []
+        self.skill_ids = {}
+        for skills in skill_taxonomy.values():
+            for skill in skills:
+                if skill.lower() not in self.skill_ids:
+                    self.skill_ids[skill.lower()] = len(self.skills)
+                    self.skills.append(skill)
+    
+    def schema(self) -> Dict:
+        """Lookup tables needed to decode slim reports"""
+        return {
+            'skills': self.skills,
+            'recommendations': ScoringEngine.RECOMMENDATION_LABELS,
+            'confidence': ScoringEngine.CONFIDENCE_LABELS,
+            'difficulty': DIFFICULTY_LABELS,
+            'component_scores': list(SCORING_WEIGHTS)
+        }
+    
+    def encode(self, report: Dict) -> SlimReport:
+        skill_analysis = report['skill_analysis']
+        # Partial reports (time budget) may lack the feature sections
+        depth_skills = report.get('depth_analysis', {}).get('all_skills', {})
+        top_depth = sorted(depth_skills.values(), key=lambda d: d['depth_score'], reverse=True)[:5]
+        
+        return SlimReport(
+            overall_score=report['overall_score'],
+            recommendation=ScoringEngine.RECOMMENDATION_LABELS.index(report['recommendation']),
+            confidence=ScoringEngine.CONFIDENCE_LABELS.index(report['confidence']),
+            component_scores=tuple(report['component_scores'][name] for name in SCORING_WEIGHTS),
+            match_percentage=skill_analysis['match_percentage'],
+            semantic_similarity=report['semantic_similarity'].get('overall_similarity', 0),
+            total_years=report['experience_analysis'].get('total_years', 0),
+            required_years=report['required_experience'].get('required_years', 0),
+            matched_skills=self._ids(skill_analysis['matched_skills']),
+            missing_skills=[
+                SkillGap(
+                    skill_id=self.skill_ids[gap['skill'].lower()],
+                    difficulty=DIFFICULTY_LABELS.index(gap.get('difficulty', 'medium')),
+                    learning_days=gap.get('learning_days', 60)
+                )
+                for gap in skill_analysis['missing_skills']
+                if gap['skill'].lower() in self.skill_ids
+            ],
+            top_depth=[
+                SkillDepth(
+                    skill_id=self.skill_ids[depth['skill'].lower()],
+                    depth_score=depth['depth_score'],
+                    evidence_strength=depth['evidence_strength']
+                )
+                for depth in top_depth
+                if depth['skill'].lower() in self.skill_ids
+            ],
+            retention=[
+                SkillRetention(
+                    skill_id=self.skill_ids[prediction['skill'].lower()],
+                    retention_probability=prediction['retention_probability']
+                )
+                for prediction in report.get('retention_predictions', [])
+                if prediction['skill'].lower() in self.skill_ids
+            ],
+            partial=report.get('partial', False)
+        )
+    
+    def _ids(self, skill_names: List[str]) -> List[int]:
+        return [self.skill_ids[name.lower()] for name in skill_names
+                if name.lower() in self.skill_ids]
+
+
+def _json_default(obj: Any):
+    if is_dataclass(obj):
+        return asdict(obj)
+    if hasattr(obj, 'item'):
+        # numpy scalars
+        return obj.item()
+    return str(obj)
+
+
+def to_json(obj: Any) -> bytes:
+    """Serialize reports (dicts or slim dataclasses) - orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default, separators=(',', ':')).encode('utf-8')
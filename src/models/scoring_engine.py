@@ -2,10 +2,13 @@
 Scoring Engine - Aggregates all scores into final recommendation
 """
 
-from typing import Dict, List
+from typing import Dict, List, Union
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.config import SCORING_WEIGHTS, MATCH_THRESHOLDS
@@ -14,6 +17,18 @@ from src.config import SCORING_WEIGHTS, MATCH_THRESHOLDS
 class ScoringEngine:
     """Aggregates all analysis into final candidate score"""
     
+    # Recommendation labels from lowest to highest band
+    RECOMMENDATION_LABELS = [
+        "Not Recommended - Significant Skill Gaps",
+        "Weak Match - Requires Significant Training",
+        "Potential Match - Consider for Interview",
+        "Strong Match - Highly Recommended"
+    ]
+    
+    # Variance cut-offs (on 0-1 scores) for High / Medium / Low confidence
+    CONFIDENCE_VARIANCE_BINS = [0.05, 0.15]
+    CONFIDENCE_LABELS = ["High", "Medium", "Low"]
+    
     def __init__(self):
         self.weights = SCORING_WEIGHTS
         self.thresholds = MATCH_THRESHOLDS
@@ -37,31 +52,19 @@ class ScoringEngine:
         Returns:
             Dictionary with final score and recommendation
         """
-        # Normalize all scores to 0-1 range
-        normalized_scores = {
-            'skill_match': skill_match_score / 100,
-            'experience': experience_score / 100,
-            'semantic_similarity': semantic_similarity / 100,
-            'education': education_score / 100,
-            'learning_potential': learning_potential / 100
-        }
-        
-        # Calculate weighted score
-        final_score = sum(
-            normalized_scores[key] * self.weights[key]
-            for key in self.weights.keys()
-        ) * 100
-        
-        # Generate recommendation
-        recommendation = self._get_recommendation(final_score)
-        
-        # Calculate confidence
-        confidence = self._calculate_confidence(normalized_scores)
+        # One-row batch, so single and batch scoring always agree
+        scored = self.score_batch({
+            'skill_match': [skill_match_score],
+            'experience': [experience_score],
+            'semantic_similarity': [semantic_similarity],
+            'education': [education_score],
+            'learning_potential': [learning_potential]
+        }).iloc[0]
         
         return {
-            'final_score': round(final_score, 2),
-            'recommendation': recommendation,
-            'confidence': confidence,
+            'final_score': float(scored['final_score']),
+            'recommendation': str(scored['recommendation']),
+            'confidence': str(scored['confidence']),
             'component_scores': {
                 'skill_match': round(skill_match_score, 2),
                 'experience': round(experience_score, 2),
@@ -71,31 +74,64 @@ class ScoringEngine:
             }
         }
     
+    def score_batch(self, component_scores: Union[pd.DataFrame, np.ndarray, Dict]) -> pd.DataFrame:
+        """
+        Score N candidates at once from their component scores
+        
+        Args:
+            component_scores: DataFrame, structured array or dict of arrays
+                with one column per key of SCORING_WEIGHTS (0-100 scale)
+            
+        Returns:
+            DataFrame with final_score, recommendation and confidence per row
+        """
+        keys = list(self.weights.keys())
+        
+        if isinstance(component_scores, pd.DataFrame):
+            index = component_scores.index
+            scores = component_scores[keys].to_numpy(dtype=float)
+        else:
+            index = None
+            scores = np.column_stack([
+                np.asarray(component_scores[key], dtype=float) for key in keys
+            ])
+        
+        normalized = scores / 100
+        weights = np.array([self.weights[key] for key in keys])
+        # Band on the reported (rounded) score: a sum that is exactly a
+        # threshold may come out a hair below it in floating point
+        final_scores = np.round(normalized @ weights * 100, 2)
+        
+        variance = normalized.var(axis=1)
+        
+        return pd.DataFrame({
+            'final_score': final_scores,
+            'recommendation': self._get_recommendations(final_scores),
+            'confidence': np.array(self.CONFIDENCE_LABELS)[
+                np.digitize(variance, self.CONFIDENCE_VARIANCE_BINS)
+            ]
+        }, index=index)
+    
     def _get_recommendation(self, score: float) -> str:
         """Get hiring recommendation based on score"""
-        if score >= self.thresholds['strong_match']:
-            return "Strong Match - Highly Recommended"
-        elif score >= self.thresholds['potential_match']:
-            return "Potential Match - Consider for Interview"
-        elif score >= self.thresholds['weak_match']:
-            return "Weak Match - Requires Significant Training"
-        else:
-            return "Not Recommended - Significant Skill Gaps"
+        return str(self._get_recommendations(np.array([score]))[0])
+    
+    def _get_recommendations(self, scores: np.ndarray) -> np.ndarray:
+        """Get hiring recommendations for an array of scores"""
+        bins = [
+            self.thresholds['weak_match'],
+            self.thresholds['potential_match'],
+            self.thresholds['strong_match']
+        ]
+        return np.array(self.RECOMMENDATION_LABELS)[np.digitize(scores, bins)]
     
     def _calculate_confidence(self, scores: Dict[str, float]) -> str:
         """Calculate confidence level in the recommendation"""
-        # Calculate variance in scores
-        score_values = list(scores.values())
-        mean_score = sum(score_values) / len(score_values)
-        variance = sum((x - mean_score) ** 2 for x in score_values) / len(score_values)
-        
         # Low variance = high confidence
-        if variance < 0.05:
-            return "High"
-        elif variance < 0.15:
-            return "Medium"
-        else:
-            return "Low"
+        variance = np.var(list(scores.values()))
+        return self.CONFIDENCE_LABELS[
+            int(np.digitize(variance, self.CONFIDENCE_VARIANCE_BINS))
+        ]
     
     def generate_strengths(self, component_scores: Dict[str, float], top_n: int = 5) -> List[str]:
         """Generate list of candidate strengths"""
@@ -165,4 +201,12 @@ if __name__ == "__main__":
     strengths = engine.generate_strengths(result['component_scores'])
     print(f"\n  Strengths:")
     for strength in strengths:
-        print(f"    - {strength}")
\ No newline at end of file
+        print(f"    - {strength}")
+    
+    # Test batch scoring
+    batch = engine.score_batch(pd.DataFrame([
+        result['component_scores'],
+        {'skill_match': 40, 'experience': 30, 'semantic_similarity': 50,
+         'education': 50, 'learning_potential': 60}
+    ]))
+    print(f"\n  Batch:\n{batch}")
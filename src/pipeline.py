@@ -2,33 +2,76 @@
 Main Pipeline - WITH 4 KILLER FEATURES PROPERLY INTEGRATED
 """
 
-from typing import Dict, Union
+from typing import BinaryIO, Callable, Dict, List, Union
 from pathlib import Path
 import sys
+import time
+
+import numpy as np
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.config import (
+    ANALYSIS_TIME_BUDGET,
+    MAX_RESUME_CHARS,
+    MAX_JD_CHARS,
+    INPUT_LIMIT_POLICY,
+    SEMANTIC_BACKEND,
+    PIPELINE_STAGE_WORKERS,
+    PIPELINE_DISABLED_STAGES
+)
 from src.preprocessing.pdf_parser import PDFParser
 from src.preprocessing.section_detector import SectionDetector
 from src.preprocessing.text_cleaner import TextCleaner
 from src.feature_extraction.skill_extractor import SkillExtractor
 from src.feature_extraction.experience_analyzer import ExperienceAnalyzer
 from src.feature_extraction.semantic_matcher import SemanticMatcher
+from src.feature_extraction.embedding_matcher import EmbeddingMatcher
 from src.models.skill_gap_classifier import SkillGapClassifier
 from src.models.scoring_engine import ScoringEngine
 from src.models.recommendation_engine import RecommendationEngine
+from src.models.report import SlimReportEncoder
 
 # NEW: 4 KILLER FEATURES
 from src.feature_extraction.interview_question_generator import InterviewQuestionGenerator
 from src.feature_extraction.knowledge_graph import SkillKnowledgeGraph
 from src.feature_extraction.skill_depth_analyzer import SkillDepthAnalyzer
 from src.models.retention_predictor import SkillRetentionPredictor
+from src.storage.score_store import ComponentScoreStore
+from src.storage.stage_cache import StageCache
+from src.stage_graph import Stage, StageGraph
 
 
 class CandidateIntelligencePipeline:
     """Main pipeline with 4 KILLER FEATURES"""
     
-    def __init__(self):
+    # Inputs every analysis provides to the stage graph
+    STAGE_SEEDS = (
+        'resume_text', 'jd_text', 'resume_section_spans', 'resume_name', 'jd_name',
+        'semantic_backend', 'stage_log'
+    )
+    
+    def __init__(self, score_store: ComponentScoreStore = None, use_layout: bool = True,
+                 stage_cache: StageCache = None, time_budget: float = ANALYSIS_TIME_BUDGET,
+                 stages: List[Stage] = None, disabled_stages=PIPELINE_DISABLED_STAGES,
+                 stage_workers: int = PIPELINE_STAGE_WORKERS,
+                 semantic_backend: str = SEMANTIC_BACKEND):
+        # Optional store that persists component scores for re-ranking
+        self.score_store = score_store
+        # Detect resume sections from PDF layout (fonts) instead of regex scans
+        self.use_layout = use_layout
+        # Optional cache of stage results: re-analysing an edited resume
+        # only reruns the stages whose input sections changed
+        self.stage_cache = stage_cache
+        # Seconds an analysis may take before optional feature stages are skipped
+        self.time_budget = time_budget
+        # Threads running independent stages concurrently (0: inline)
+        self.stage_workers = stage_workers
+        # Default semantic matcher ('tfidf' / 'embedding'); requests may pick another
+        self.semantic_backend = semantic_backend
+        # Gap difficulty prediction (same features for every gap)
+        self._gap_difficulty = None
+        
         # Initialize all components
         self.pdf_parser = PDFParser()
         self.section_detector = SectionDetector()
@@ -36,61 +79,305 @@ class CandidateIntelligencePipeline:
         self.skill_extractor = SkillExtractor()
         self.experience_analyzer = ExperienceAnalyzer()
         self.semantic_matcher = SemanticMatcher()
+        # Embedding model loads on first use
+        self.semantic_matchers = {
+            'tfidf': self.semantic_matcher,
+            'embedding': EmbeddingMatcher()
+        }
         self.skill_gap_classifier = SkillGapClassifier()
         self.scoring_engine = ScoringEngine()
         self.recommendation_engine = RecommendationEngine()
+        # Slim (IDs and numbers only) view of reports
+        self.report_encoder = SlimReportEncoder(self.skill_extractor.skill_taxonomy)
         
         # NEW: 4 KILLER FEATURES
         self.question_generator = InterviewQuestionGenerator()
         self.knowledge_graph = SkillKnowledgeGraph()
-        self.depth_analyzer = SkillDepthAnalyzer()
+        self.depth_analyzer = SkillDepthAnalyzer(skill_matcher=self.skill_extractor.matcher)
         self.retention_predictor = SkillRetentionPredictor()
         
+        # The analysis graph: default stages, replaced or extended by
+        # stages (matched by name), minus disabled_stages
+        self.stage_graph = self._build_stage_graph(stages, disabled_stages)
+        
         # Load or train skill gap model
         try:
             self.skill_gap_classifier.load_model()
         except:
             print("⚠️ Skill gap model not loaded")
     
-    def analyze(self, resume_path: Union[str, Path], 
-                jd_path: Union[str, Path]) -> Dict:
+    def analyze(self, resume: Union[str, Path, bytes, BinaryIO], 
+                jd: Union[str, Path, bytes, BinaryIO],
+                resume_name: str = None,
+                jd_name: str = None,
+                on_stage: Callable[[str, Dict], None] = None,
+                semantic_backend: str = None) -> Dict:
         """
         Run complete analysis pipeline WITH 4 KILLER FEATURES
+        
+        Args:
+            resume: Resume file path, or its raw bytes / binary buffer
+            jd: Job description file path, or its raw bytes / binary buffer
+            resume_name: Display name (default: file name when given a path)
+            jd_name: Display name (default: file name when given a path)
+            on_stage: Progress callback, see analyze_text
+            semantic_backend: Semantic matcher for this request, see analyze_text
         """
         print("🔄 Starting ADVANCED analysis pipeline...")
         
         # Step 1: Parse documents
         print("  1/11 Parsing documents...")
-        resume_text = self.pdf_parser.parse(resume_path)
-        jd_text = self.pdf_parser.parse(jd_path)
+        resume_text, resume_section_spans = self._load_resume(resume)
+        jd_text = self.pdf_parser.parse(jd)
         
+        return self.analyze_text(
+            resume_text,
+            jd_text,
+            resume_name=resume_name or self._document_name(resume),
+            jd_name=jd_name or self._document_name(jd),
+            resume_section_spans=resume_section_spans,
+            on_stage=on_stage,
+            semantic_backend=semantic_backend
+        )
+    
+    def analyze_text(self, resume_text: str, jd_text: str,
+                     resume_name: str = None, jd_name: str = None,
+                     resume_section_spans: Dict[str, tuple] = None,
+                     on_stage: Callable[[str, Dict], None] = None,
+                     semantic_backend: str = None) -> Dict:
+        """
+        Run the analysis pipeline on already-extracted resume and JD text
+        
+        Args:
+            resume_section_spans: {section: (start, end)} offsets into
+                resume_text already detected (e.g. from PDF layout);
+                detected from resume_text when omitted
+            on_stage: Called as on_stage(stage, report) for each of
+                report_stages with the report built so far - the scored
+                core report ('report') first, then one feature section per
+                stage as it completes - so callers can render partial
+                results. The report is still being filled in: read it,
+                don't modify it. Stages skipped for the time budget are
+                not reported.
+            semantic_backend: 'tfidf' or 'embedding' (section-level
+                embeddings); default: the pipeline's semantic_backend
+                
+        Returns:
+            The report; 'partial' is True when feature stages were skipped
+            for the time budget (listed in 'skipped_stages'), and
+            'truncated_inputs' names inputs cut to MAX_RESUME_CHARS /
+            MAX_JD_CHARS
+        """
+        started = time.monotonic()
+        semantic_backend = self._check_semantic_backend(semantic_backend)
         print(f"     - Resume: {len(resume_text)} chars")
         print(f"     - JD: {len(jd_text)} chars")
         
-        # Step 2: Detect sections
-        print("  2/11 Detecting sections...")
-        resume_sections = self.section_detector.detect_sections(resume_text)
-        contact_info = self.section_detector.extract_contact_info(resume_text)
+        # Oversized inputs are truncated (or rejected, per INPUT_LIMIT_POLICY)
+        # so no stage ever sees unbounded text
+        truncated_inputs = []
+        resume_text, resume_section_spans = self._limit_input(
+            resume_text, MAX_RESUME_CHARS, 'resume', truncated_inputs, resume_section_spans
+        )
+        jd_text, _ = self._limit_input(jd_text, MAX_JD_CHARS, 'job_description', truncated_inputs)
         
-        # Step 3: Extract skills
-        print("  3/11 Extracting skills...")
-        resume_skills = self.skill_extractor.extract_skills(resume_text)
-        jd_skills = self.skill_extractor.extract_skills(jd_text)
+        # (stage, reused) for every cacheable stage, when a stage cache is set
+        stage_log = []
         
-        # Step 4: Analyze experience
-        print("  4/11 Analyzing experience...")
-        resume_experience = self._analyze_experience(resume_sections, resume_text)
-        jd_experience = self._detect_required_experience(jd_text)
+        # Report for on_stage; sections finished before the core report
+        # exists wait for it
+        live_report = {}
+        waiting_sections = []
+        
+        def add_section(name: str, output):
+            live_report[self.stage_graph.stages[name].report_key] = output
+            on_stage(name, live_report)
+        
+        def on_complete(name: str, output):
+            if on_stage is None:
+                return
+            if name == 'report':
+                live_report.update(output)
+                on_stage('report', live_report)
+                for section, section_output in waiting_sections:
+                    add_section(section, section_output)
+            elif self.stage_graph.stages[name].report_key:
+                if live_report:
+                    add_section(name, output)
+                else:
+                    waiting_sections.append((name, output))
         
+        values, skipped_stages = self.stage_graph.run(
+            {
+                'resume_text': resume_text,
+                'jd_text': jd_text,
+                'resume_section_spans': resume_section_spans,
+                'resume_name': resume_name,
+                'jd_name': jd_name,
+                'semantic_backend': semantic_backend,
+                'stage_log': stage_log
+            },
+            max_workers=self.stage_workers,
+            # Optional stages only start while the analysis is within its
+            # time budget; past it they are skipped and the report is partial
+            should_run=lambda stage: time.monotonic() - started <= self.time_budget,
+            on_complete=on_complete
+        )
+        
+        # Sections in graph order, whatever order they completed in
+        report = values['report']
+        for name in self.stage_graph.order:
+            report_key = self.stage_graph.stages[name].report_key
+            if report_key and name in values:
+                report[report_key] = values[name]
+        
+        report['partial'] = bool(skipped_stages)
+        if skipped_stages:
+            report['skipped_stages'] = skipped_stages
+            print(f"     ⚠️ Time budget of {self.time_budget}s exceeded, skipped: {', '.join(skipped_stages)}")
+        if truncated_inputs:
+            report['truncated_inputs'] = truncated_inputs
+        
+        if self.stage_cache is not None:
+            report['incremental'] = {
+                'reused': [name for name, reused in stage_log if reused],
+                'recomputed': [name for name, reused in stage_log if not reused]
+            }
+            print(f"     ↺ Reused {len(report['incremental']['reused'])}/{len(stage_log)} cached stages")
+        
+        print("✅ Advanced analysis complete!\n")
+        return report
+    
+    @property
+    def report_stages(self) -> tuple:
+        """Stages reported to an on_stage callback: the core report, then feature sections"""
+        return ('report',) + tuple(
+            name for name in self.stage_graph.order
+            if self.stage_graph.stages[name].report_key
+        )
+    
+    def default_stages(self) -> List[Stage]:
+        """
+        The analysis as a graph of stages
+        
+        Seeds: resume_text, jd_text, resume_section_spans, resume_name,
+        jd_name, semantic_backend, stage_log. Each stage receives its
+        inputs positionally; 'report' is the scored core report and every
+        stage with a report_key adds one section to it.
+        """
+        return [
+            Stage('section_spans', self._stage_section_spans, ('resume_text', 'resume_section_spans')),
+            Stage('contact_info', self.section_detector.extract_contact_info, ('resume_text',)),
+            Stage('resume_skills', self._stage_resume_skills, ('resume_text', 'stage_log')),
+            Stage('jd_skills', self._stage_jd_skills, ('jd_text', 'stage_log')),
+            Stage('resume_experience', self._stage_resume_experience,
+                  ('resume_text', 'section_spans', 'stage_log')),
+            Stage('skill_tenure', self._stage_skill_tenure,
+                  ('resume_text', 'section_spans', 'resume_experience')),
+            Stage('jd_experience', self._stage_jd_experience, ('jd_text', 'stage_log')),
+            Stage('similarity', self._stage_similarity,
+                  ('resume_text', 'jd_text', 'section_spans', 'semantic_backend', 'stage_log')),
+            Stage('education_score', self._stage_education,
+                  ('resume_text', 'section_spans', 'stage_log')),
+            Stage('scores', self._stage_scores,
+                  ('resume_text', 'jd_text', 'resume_name', 'jd_name', 'resume_skills', 'jd_skills',
+                   'resume_experience', 'jd_experience', 'similarity', 'education_score')),
+            Stage('report', self._stage_report,
+                  ('contact_info', 'scores', 'resume_experience', 'jd_experience', 'similarity')),
+            Stage('skill_names', self._stage_skill_names, ('resume_skills', 'jd_skills')),
+            Stage('recommendations', self._stage_recommendations,
+                  ('resume_text', 'jd_text', 'scores', 'resume_experience', 'jd_experience'),
+                  optional=True, report_key='advanced_recommendations'),
+            Stage('interview_questions', self._stage_interview_questions,
+                  ('resume_text', 'jd_text', 'section_spans', 'resume_skills', 'resume_experience'),
+                  optional=True, report_key='interview_questions'),
+            Stage('knowledge_graph', self._stage_knowledge_graph, ('skill_names',),
+                  optional=True, report_key='knowledge_graph'),
+            Stage('depth_analysis', self._stage_depth_analysis,
+                  ('resume_text', 'section_spans', 'resume_skills', 'skill_tenure', 'stage_log'),
+                  optional=True, report_key='depth_analysis'),
+            Stage('retention_predictions', self._stage_retention_predictions,
+                  ('scores', 'resume_experience', 'skill_names'),
+                  optional=True, report_key='retention_predictions')
+        ]
+    
+    def _build_stage_graph(self, stages: List[Stage], disabled_stages) -> StageGraph:
+        """default_stages() with stages replaced or added by name, minus disabled ones"""
+        declared = {stage.name: stage for stage in self.default_stages()}
+        for stage in stages or []:
+            declared[stage.name] = stage
+        for name in disabled_stages:
+            declared.pop(name, None)
+        return StageGraph(declared.values(), seeds=self.STAGE_SEEDS)
+    
+    # ── Stages ───────────────────────────────────────────────────────
+    
+    def _stage_section_spans(self, resume_text: str, resume_section_spans: Dict) -> Dict:
+        print("  2/11 Detecting sections...")
+        if resume_section_spans is None:
+            return self.section_detector.detect_section_spans(resume_text)
+        return resume_section_spans
+    
+    def _stage_resume_skills(self, resume_text: str, stage_log: list) -> Dict:
+        print("  3/11 Extracting skills...")
+        return self._run_stage(
+            'resume_skills', (resume_text,),
+            lambda: self.skill_extractor.extract_skills(resume_text), stage_log
+        )
+    
+    def _stage_jd_skills(self, jd_text: str, stage_log: list) -> Dict:
+        return self._run_stage(
+            'jd_skills', (jd_text,),
+            lambda: self.skill_extractor.extract_skills(jd_text), stage_log
+        )
+    
+    def _stage_resume_experience(self, resume_text: str, section_spans: Dict, stage_log: list) -> Dict:
+        print("  4/11 Analyzing experience...")
+        experience_text = self._section_input(resume_text, section_spans, ('experience',))
+        resume_experience = self._run_stage(
+            'resume_experience', (experience_text,),
+            lambda: self._analyze_experience(resume_text, section_spans), stage_log
+        )
         print(f"     - Candidate: {resume_experience['total_years']} years, {resume_experience['seniority_level']}")
+        return resume_experience
+    
+    def _stage_skill_tenure(self, resume_text: str, section_spans: Dict, resume_experience: Dict) -> Dict:
+        # Years per skill: tenure of the dated roles that mention it
+        experience_text = self._section_input(resume_text, section_spans, ('experience',))
+        return self.experience_analyzer.skill_tenure(
+            resume_experience.get('timeline', []),
+            self.skill_extractor.matcher.find_all(experience_text)
+        )
+    
+    def _stage_jd_experience(self, jd_text: str, stage_log: list) -> Dict:
+        jd_experience = self._run_stage(
+            'jd_experience', (jd_text,),
+            lambda: self._detect_required_experience(jd_text), stage_log
+        )
         print(f"     - Required: {jd_experience['required_years']} years, {jd_experience['required_level']}")
-        
-        # Step 5: Calculate semantic similarity
+        return jd_experience
+    
+    def _stage_similarity(self, resume_text: str, jd_text: str, section_spans: Dict,
+                          semantic_backend: str, stage_log: list) -> Dict:
         print("  5/11 Calculating similarity...")
-        similarity = self.semantic_matcher.calculate_similarity(resume_text, jd_text)
+        matcher = self.semantic_matchers[semantic_backend]
+        similarity = self._run_stage(
+            'similarity', (semantic_backend, resume_text, jd_text, section_spans),
+            lambda: matcher.calculate_similarity(resume_text, jd_text, section_spans), stage_log
+        )
         print(f"     - Similarity: {similarity.get('overall_similarity', 0)}%")
-        
-        # Step 6: Generate scores
+        return similarity
+    
+    def _stage_education(self, resume_text: str, section_spans: Dict, stage_log: list) -> float:
+        return self._run_stage(
+            'education',
+            (SectionDetector.section_text(resume_text, section_spans, ('education',)),),
+            lambda: self._score_education(resume_text, section_spans), stage_log
+        )
+    
+    def _stage_scores(self, resume_text: str, jd_text: str, resume_name: str, jd_name: str,
+                      resume_skills: Dict, jd_skills: Dict, resume_experience: Dict,
+                      jd_experience: Dict, similarity: Dict, education_score: float) -> Dict:
         print("  6/11 Generating scores...")
         skill_match = self._calculate_skill_match(resume_skills, jd_skills)
         skill_gaps = self._identify_skill_gaps(resume_skills, jd_skills)
@@ -99,8 +386,6 @@ class CandidateIntelligencePipeline:
             resume_experience, 
             jd_experience
         )
-        
-        education_score = self._score_education(resume_sections)
         learning_potential = self._calculate_learning_potential(skill_gaps)
         
         # Generate final score
@@ -112,47 +397,99 @@ class CandidateIntelligencePipeline:
             learning_potential=learning_potential
         )
         
-        # Step 7: Generate ADVANCED RECOMMENDATIONS
-        print("  7/11 Generating advanced recommendations...")
-        advanced_recommendations = self.recommendation_engine.generate_comprehensive_recommendations(
-            overall_score=final_result['final_score'],
-            component_scores=final_result['component_scores'],
-            skill_analysis={
+        if self.score_store is not None:
+            self.score_store.save(
+                resume_hash=self.score_store.content_hash(resume_text),
+                jd_hash=self.score_store.content_hash(jd_text),
+                component_scores=final_result['component_scores'],
+                features={
+                    'matched_skills': skill_match['matched_skills'],
+                    'missing_skills': [gap['skill'] for gap in skill_gaps],
+                    'total_years': resume_experience['total_years'],
+                    'required_years': jd_experience['required_years']
+                },
+                resume_name=resume_name,
+                jd_name=jd_name
+            )
+        
+        return {
+            'final_result': final_result,
+            'skill_gaps': skill_gaps,
+            # Built once: shared by the recommendation engine and the report
+            'skill_analysis': {
                 'total_skills_found': sum(len(skills) for skills in resume_skills.values()),
                 'match_percentage': skill_match['match_percentage'],
                 'matched_skills': skill_match['matched_skills'],
                 'missing_skills': skill_gaps,
                 'by_category': self.skill_extractor.get_skill_summary(resume_skills)
-            },
+            }
+        }
+    
+    def _stage_report(self, contact_info: Dict, scores: Dict, resume_experience: Dict,
+                      jd_experience: Dict, similarity: Dict) -> Dict:
+        final_result = scores['final_result']
+        return {
+            'candidate_info': contact_info,
+            'overall_score': final_result['final_score'],
+            'recommendation': final_result['recommendation'],
+            'confidence': final_result['confidence'],
+            'skill_analysis': scores['skill_analysis'],
+            'experience_analysis': resume_experience,
+            'required_experience': jd_experience,
+            'semantic_similarity': similarity,
+            'component_scores': final_result['component_scores'],
+            'strengths': self.scoring_engine.generate_strengths(final_result['component_scores']),
+            'top_gaps': self.scoring_engine.generate_gaps(scores['skill_gaps'], top_n=5)
+        }
+    
+    def _stage_skill_names(self, resume_skills: Dict, jd_skills: Dict) -> Dict:
+        resume_skill_names = self._flatten_skill_names(resume_skills)
+        jd_skill_names = self._flatten_skill_names(jd_skills)
+        return {
+            'resume': resume_skill_names,
+            'missing': [s for s in jd_skill_names if s not in resume_skill_names]
+        }
+    
+    # Step 7: Generate ADVANCED RECOMMENDATIONS
+    def _stage_recommendations(self, resume_text: str, jd_text: str, scores: Dict,
+                               resume_experience: Dict, jd_experience: Dict) -> Dict:
+        print("  7/11 Generating advanced recommendations...")
+        final_result = scores['final_result']
+        return self.recommendation_engine.generate_comprehensive_recommendations(
+            overall_score=final_result['final_score'],
+            component_scores=final_result['component_scores'],
+            skill_analysis=scores['skill_analysis'],
             experience_analysis=resume_experience,
             jd_text=jd_text,
             resume_text=resume_text,
             required_experience=jd_experience
         )
-        
-        # ═══════════════════════════════════════════════════════════
-        # KILLER FEATURE #1: INTERVIEW QUESTIONS (TRULY DYNAMIC)
-        # ═══════════════════════════════════════════════════════════
+    
+    # ═══════════════════════════════════════════════════════════
+    # KILLER FEATURE #1: INTERVIEW QUESTIONS (TRULY DYNAMIC)
+    # ═══════════════════════════════════════════════════════════
+    def _stage_interview_questions(self, resume_text: str, jd_text: str, section_spans: Dict,
+                                   resume_skills: Dict, resume_experience: Dict) -> List:
         print("  8/11 Generating interview questions...")
-        interview_questions = self.question_generator.generate_questions(
+        return self.question_generator.generate_questions(
             resume_skills=resume_skills,
             experience_data=resume_experience,
             jd_text=jd_text,
             resume_text=resume_text,  # ← CRITICAL: Pass resume text for dynamic questions
+            section_spans=section_spans,
             top_n=10
         )
-        
-        # ═══════════════════════════════════════════════════════════
-        # KILLER FEATURE #2: KNOWLEDGE GRAPH
-        # ═══════════════════════════════════════════════════════════
+    
+    # ═══════════════════════════════════════════════════════════
+    # KILLER FEATURE #2: KNOWLEDGE GRAPH
+    # ═══════════════════════════════════════════════════════════
+    def _stage_knowledge_graph(self, skill_names: Dict) -> Dict:
         print("  9/11 Building knowledge graph...")
-        resume_skill_names = self._flatten_skill_names(resume_skills)
-        jd_skill_names = self._flatten_skill_names(jd_skills)
-        missing_skill_names = [s for s in jd_skill_names if s not in resume_skill_names]
+        resume_skill_names = skill_names['resume']
         
         # Readiness analysis
         readiness_analysis = []
-        for skill in missing_skill_names[:5]:
+        for skill in skill_names['missing'][:5]:
             readiness = self.knowledge_graph.calculate_readiness(
                 known_skills=resume_skill_names,
                 target_skill=skill
@@ -163,7 +500,7 @@ class CandidateIntelligencePipeline:
         
         # Learning paths
         learning_paths = []
-        for skill in missing_skill_names[:3]:
+        for skill in skill_names['missing'][:3]:
             path = self.knowledge_graph.find_learning_path(
                 current_skills=resume_skill_names,
                 target_skill=skill
@@ -174,13 +511,29 @@ class CandidateIntelligencePipeline:
                 'estimated_weeks': path.get('estimated_weeks', 4)
             })
         
-        # ═══════════════════════════════════════════════════════════
-        # KILLER FEATURE #3: SKILL DEPTH ANALYSIS
-        # ═══════════════════════════════════════════════════════════
+        return {
+            'readiness_analysis': readiness_analysis,
+            'learning_paths': learning_paths
+        }
+    
+    # ═══════════════════════════════════════════════════════════
+    # KILLER FEATURE #3: SKILL DEPTH ANALYSIS
+    # ═══════════════════════════════════════════════════════════
+    def _stage_depth_analysis(self, resume_text: str, section_spans: Dict, resume_skills: Dict,
+                              skill_tenure: Dict, stage_log: list) -> Dict:
         print("  10/11 Analyzing skill depth...")
-        depth_analyses = self.depth_analyzer.analyze_all_skills(
-            skills_dict=resume_skills,
-            full_text=resume_text
+        depth_analyses = self._run_stage(
+            'depth',
+            (resume_skills, skill_tenure, self._section_input(
+                resume_text, section_spans, self.depth_analyzer.EVIDENCE_SECTIONS
+            )),
+            lambda: self.depth_analyzer.analyze_all_skills(
+                skills_dict=resume_skills,
+                full_text=resume_text,
+                section_spans=section_spans,
+                skill_tenure=skill_tenure
+            ),
+            stage_log
         )
         
         top_skills_by_depth = self.depth_analyzer.get_top_skills_by_depth(
@@ -188,67 +541,312 @@ class CandidateIntelligencePipeline:
             top_n=5
         )
         
-        # ═══════════════════════════════════════════════════════════
-        # KILLER FEATURE #4: RETENTION PREDICTION (TRULY DYNAMIC)
-        # ═══════════════════════════════════════════════════════════
+        return {
+            'top_skills': top_skills_by_depth,
+            'all_skills': depth_analyses
+        }
+    
+    # ═══════════════════════════════════════════════════════════
+    # KILLER FEATURE #4: RETENTION PREDICTION (TRULY DYNAMIC)
+    # ═══════════════════════════════════════════════════════════
+    def _stage_retention_predictions(self, scores: Dict, resume_experience: Dict,
+                                     skill_names: Dict) -> List:
         print("  11/11 Predicting skill retention...")
         missing_skills_data = [
             {'skill': gap['skill'], 'learning_days': gap.get('learning_days', 60)}
-            for gap in skill_gaps[:5]
+            for gap in scores['skill_gaps'][:5]
         ]
         
         # ← CRITICAL: Create candidate profile for personalized predictions
         candidate_profile = {
             'total_years': resume_experience.get('total_years', 0),
             'seniority_level': resume_experience.get('seniority_level', 'entry'),
-            'number_of_skills': len(resume_skill_names)
+            'number_of_skills': len(skill_names['resume'])
         }
         
-        retention_predictions = self.retention_predictor.batch_predict_retention(
+        return self.retention_predictor.batch_predict_retention(
             missing_skills=missing_skills_data,
-            current_skills=resume_skill_names,
+            current_skills=skill_names['resume'],
             candidate_profile=candidate_profile,  # ← CRITICAL: Pass profile for personalization
             expected_practice='occasional'
         )
+    
+    def match_matrix(self, resume_paths: List[Union[str, Path, bytes]],
+                     jd_paths: List[Union[str, Path, bytes]],
+                     top_k: int = 5,
+                     resume_names: List[str] = None,
+                     jd_names: List[str] = None,
+                     semantic_backend: str = None) -> Dict:
+        """
+        Match N resumes against M job descriptions in one pass
         
-        # Compile complete report
-        report = {
-            'candidate_info': contact_info,
-            'overall_score': final_result['final_score'],
-            'recommendation': final_result['recommendation'],
-            'confidence': final_result['confidence'],
-            'skill_analysis': {
-                'total_skills_found': sum(len(skills) for skills in resume_skills.values()),
-                'match_percentage': skill_match['match_percentage'],
-                'matched_skills': skill_match['matched_skills'],
-                'missing_skills': skill_gaps,
-                'by_category': self.skill_extractor.get_skill_summary(resume_skills)
-            },
-            'experience_analysis': resume_experience,
-            'required_experience': jd_experience,
-            'semantic_similarity': similarity,
-            'component_scores': final_result['component_scores'],
-            'strengths': self.scoring_engine.generate_strengths(final_result['component_scores']),
-            'top_gaps': self.scoring_engine.generate_gaps(skill_gaps, top_n=5),
-            
-            # Advanced recommendations
-            'advanced_recommendations': advanced_recommendations,
+        Every document is parsed and preprocessed exactly once. Skill match,
+        semantic similarity, experience fit and education are then scored
+        for all N x M pairs with array operations instead of N x M runs
+        of analyze().
+        
+        Args:
+            resume_paths: Resume files (PDF or TXT) as paths or raw bytes
+            jd_paths: Job description files (PDF or TXT) as paths or raw bytes
+            top_k: Number of best matches to return per resume and per JD
+            resume_names: Display names for resumes (default: file names)
+            jd_names: Display names for JDs (default: file names)
+            semantic_backend: 'tfidf' or 'embedding', see analyze_text
             
-            # NEW: 4 KILLER FEATURES
-            'interview_questions': interview_questions,
-            'knowledge_graph': {
-                'readiness_analysis': readiness_analysis,
-                'learning_paths': learning_paths
-            },
-            'depth_analysis': {
-                'top_skills': top_skills_by_depth,
-                'all_skills': depth_analyses
+        Returns:
+            Score matrices plus top-k JDs per resume and top-k resumes per
+            JD; 'truncated_inputs' names documents cut to MAX_RESUME_CHARS /
+            MAX_JD_CHARS
+        """
+        print(f"🔄 Matching {len(resume_paths)} resumes x {len(jd_paths)} job descriptions...")
+        semantic_backend = self._check_semantic_backend(semantic_backend)
+        
+        resumes = [self._prepare_resume(*self._load_resume(path)) for path in resume_paths]
+        jds = [self._prepare_jd(self.pdf_parser.parse(path)) for path in jd_paths]
+        resume_names = resume_names or [
+            self._document_name(path) or f"resume_{i + 1}" for i, path in enumerate(resume_paths)
+        ]
+        jd_names = jd_names or [
+            self._document_name(path) or f"jd_{i + 1}" for i, path in enumerate(jd_paths)
+        ]
+        truncated_inputs = [
+            name for name, document in zip([*resume_names, *jd_names], [*resumes, *jds])
+            if document['truncated']
+        ]
+        
+        # Skill match: document x skill indicator matrices over one vocabulary
+        vocabulary = sorted(set().union(
+            *(resume['skill_names'] for resume in resumes),
+            *(jd['skill_names'] for jd in jds)
+        ))
+        skill_index = {skill: i for i, skill in enumerate(vocabulary)}
+        resume_matrix = self._skill_indicator_matrix(resumes, skill_index)
+        jd_matrix = self._skill_indicator_matrix(jds, skill_index)
+        
+        matched = resume_matrix @ jd_matrix.T
+        jd_totals = jd_matrix.sum(axis=1)
+        skill_match = np.divide(
+            matched * 100, jd_totals,
+            out=np.zeros(matched.shape), where=jd_totals > 0
+        )
+        
+        # Semantic similarity: one TF-IDF fit over the whole corpus
+        similarity = self.semantic_matchers[semantic_backend].calculate_similarity_matrix(
+            [resume['text'] for resume in resumes],
+            [jd['text'] for jd in jds]
+        )
+        
+        experience = self._score_experience_matrix(
+            candidate_years=np.array([r['experience']['total_years'] for r in resumes], dtype=float),
+            is_fresher_candidate=np.array([
+                r['experience'].get('is_fresher', False) or r['experience']['total_years'] < 0.5
+                for r in resumes
+            ]),
+            required_years=np.array([j['required_experience']['required_years'] for j in jds], dtype=float),
+            is_fresher_role=np.array([j['required_experience'].get('is_fresher_role', False) for j in jds])
+        )
+        
+        education = np.broadcast_to(
+            np.array([r['education_score'] for r in resumes], dtype=float)[:, None],
+            matched.shape
+        )
+        
+        # Every gap gets the same difficulty prediction, so learning
+        # potential only depends on whether any JD skill is missing
+        difficulty, _ = self._predict_gap_difficulty()
+        gap_potential = self._calculate_learning_potential([{'difficulty': difficulty}])
+        learning_potential = np.where(jd_totals - matched > 0, gap_potential, 100.0)
+        
+        component_matrices = {
+            'skill_match': skill_match,
+            'experience': experience,
+            'semantic_similarity': similarity,
+            'education': education,
+            'learning_potential': learning_potential
+        }
+        
+        scored = self.scoring_engine.score_batch({
+            key: matrix.ravel() for key, matrix in component_matrices.items()
+        })
+        final_scores = scored['final_score'].to_numpy().reshape(matched.shape)
+        recommendations = scored['recommendation'].to_numpy().reshape(matched.shape)
+        
+        if self.score_store is not None:
+            resume_hashes = [self.score_store.content_hash(r['text']) for r in resumes]
+            jd_hashes = [self.score_store.content_hash(j['text']) for j in jds]
+            self.score_store.save_many([
+                {
+                    'resume_hash': resume_hashes[i],
+                    'jd_hash': jd_hashes[j],
+                    'resume_name': resume_names[i],
+                    'jd_name': jd_names[j],
+                    'component_scores': {
+                        key: round(float(matrix[i, j]), 2)
+                        for key, matrix in component_matrices.items()
+                    },
+                    'features': {
+                        'total_years': resumes[i]['experience']['total_years'],
+                        'required_years': jds[j]['required_experience']['required_years']
+                    }
+                }
+                for i in range(len(resumes))
+                for j in range(len(jds))
+            ])
+        
+        top_jds = self._top_k_matches(final_scores, recommendations, resume_names, jd_names, top_k)
+        top_resumes = self._top_k_matches(final_scores.T, recommendations.T, jd_names, resume_names, top_k)
+        
+        print("✅ Matrix matching complete!\n")
+        result = {
+            'resumes': resume_names,
+            'job_descriptions': jd_names,
+            'score_matrix': final_scores.tolist(),
+            'component_matrices': {
+                key: np.round(matrix, 2).tolist()
+                for key, matrix in component_matrices.items()
             },
-            'retention_predictions': retention_predictions
+            'top_jds_per_resume': [
+                {'resume': name, 'matches': matches}
+                for name, matches in zip(resume_names, top_jds)
+            ],
+            'top_resumes_per_jd': [
+                {'job_description': name, 'matches': matches}
+                for name, matches in zip(jd_names, top_resumes)
+            ]
         }
+        if truncated_inputs:
+            result['truncated_inputs'] = truncated_inputs
+        return result
+    
+    def _document_name(self, source) -> str:
+        """File name for path inputs, None for in-memory documents"""
+        if isinstance(source, (str, Path)):
+            return Path(source).name
+        return None
+    
+    def _load_resume(self, source) -> tuple:
+        """
+        Parse a resume into (text, section_spans)
         
-        print("✅ Advanced analysis complete!\n")
-        return report
+        For PDFs, section spans come from layout (font size / bold headers)
+        when use_layout is on; otherwise they are None and get detected
+        from the text.
+        """
+        if hasattr(source, 'read'):
+            source = source.read()
+        
+        if self.use_layout and self.pdf_parser.is_pdf_source(source):
+            layout = self.pdf_parser.parse_layout(source)
+            spans = self.section_detector.detect_section_spans_from_layout(layout['lines'])
+            return layout['text'], spans
+        
+        return self.pdf_parser.parse(source), None
+    
+    def _prepare_resume(self, resume_text: str, section_spans: Dict[str, tuple] = None) -> Dict:
+        """Run the per-resume preprocessing shared by every JD"""
+        truncated = []
+        resume_text, section_spans = self._limit_input(
+            resume_text, MAX_RESUME_CHARS, 'resume', truncated, section_spans
+        )
+        if section_spans is None:
+            section_spans = self.section_detector.detect_section_spans(resume_text)
+        skills = self.skill_extractor.extract_skills(resume_text)
+        return {
+            'text': resume_text,
+            'skills': skills,
+            'skill_names': {name.lower() for name in self._flatten_skill_names(skills)},
+            'experience': self._analyze_experience(resume_text, section_spans),
+            'education_score': self._score_education(resume_text, section_spans),
+            'truncated': bool(truncated)
+        }
+    
+    def _prepare_jd(self, jd_text: str) -> Dict:
+        """Run the per-JD preprocessing shared by every resume"""
+        truncated = []
+        jd_text, _ = self._limit_input(jd_text, MAX_JD_CHARS, 'job_description', truncated)
+        skills = self.skill_extractor.extract_skills(jd_text)
+        return {
+            'text': jd_text,
+            'skills': skills,
+            'skill_names': {name.lower() for name in self._flatten_skill_names(skills)},
+            'required_experience': self._detect_required_experience(jd_text),
+            'truncated': bool(truncated)
+        }
+    
+    def _skill_indicator_matrix(self, documents: List[Dict], skill_index: Dict[str, int]) -> np.ndarray:
+        """Build a documents x skills 0/1 matrix"""
+        matrix = np.zeros((len(documents), len(skill_index)))
+        for row, document in enumerate(documents):
+            columns = [skill_index[name] for name in document['skill_names']]
+            matrix[row, columns] = 1
+        return matrix
+    
+    def _top_k_matches(self, scores: np.ndarray, recommendations: np.ndarray,
+                       row_names: List[str], column_names: List[str],
+                       top_k: int) -> List[List[Dict]]:
+        """Pick the top-k columns for every row of a score matrix"""
+        k = min(top_k, scores.shape[1])
+        order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        
+        results = []
+        for row in range(len(row_names)):
+            results.append([
+                {
+                    'name': column_names[column],
+                    'score': float(scores[row, column]),
+                    'recommendation': str(recommendations[row, column])
+                }
+                for column in order[row]
+            ])
+        return results
+    
+    def _limit_input(self, text: str, max_chars: int, name: str, truncated_inputs: list,
+                     section_spans: Dict[str, tuple] = None) -> tuple:
+        """
+        Enforce an input size limit
+        
+        Returns:
+            (text, section_spans) cut to max_chars, spans clipped to match
+            
+        Raises:
+            ValueError: text is too long and INPUT_LIMIT_POLICY is 'reject'
+        """
+        if len(text) <= max_chars:
+            return text, section_spans
+        
+        label = name.replace('_', ' ').capitalize()
+        if INPUT_LIMIT_POLICY == 'reject':
+            raise ValueError(f"{label} too long: {len(text)} characters (limit {max_chars})")
+        
+        print(f"     ⚠️ {label} truncated from {len(text)} to {max_chars} chars")
+        truncated_inputs.append(name)
+        if section_spans:
+            section_spans = {
+                section: (start, min(end, max_chars))
+                for section, (start, end) in section_spans.items()
+                if start < max_chars
+            }
+        return text[:max_chars], section_spans
+    
+    def _check_semantic_backend(self, semantic_backend: str = None) -> str:
+        """The requested semantic backend, or the default; ValueError if unknown"""
+        semantic_backend = semantic_backend or self.semantic_backend
+        if semantic_backend not in self.semantic_matchers:
+            raise ValueError(
+                f"Unknown semantic backend '{semantic_backend}', "
+                f"expected one of: {', '.join(self.semantic_matchers)}"
+            )
+        return semantic_backend
+    
+    def _run_stage(self, name: str, inputs: tuple, compute, stage_log: list):
+        """Run a stage, through the stage cache when one is set"""
+        if self.stage_cache is None:
+            return compute()
+        return self.stage_cache.get_or_compute(name, inputs, compute, stage_log)
+    
+    def _section_input(self, resume_text: str, section_spans: Dict, names: tuple) -> str:
+        """Text a section-scoped stage reads: its sections, else the whole resume"""
+        return SectionDetector.section_text(resume_text, section_spans, names) or resume_text
     
     def _flatten_skill_names(self, skills_dict: dict) -> list:
         """Flatten skills dictionary to list of names"""
@@ -258,10 +856,11 @@ class CandidateIntelligencePipeline:
                 names.append(skill_data['skill'])
         return names
     
-    def _analyze_experience(self, sections: Dict, full_text: str) -> Dict:
+    def _analyze_experience(self, full_text: str, section_spans: Dict) -> Dict:
         """Analyze experience section"""
-        if 'experience' in sections and sections['experience']:
-            return self.experience_analyzer.analyze_experience(sections['experience'])
+        start, end = section_spans.get('experience', (0, 0))
+        if end > start:
+            return self.experience_analyzer.analyze_experience(full_text, section_spans)
         
         print("     ⚠️ No experience section, analyzing full text...")
         result = self.experience_analyzer.analyze_experience(full_text)
@@ -295,10 +894,11 @@ class CandidateIntelligencePipeline:
         
         import re
         
+        # Numbers only start where a digit run starts (linear on long runs)
         year_patterns = [
-            r'(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)',
+            r'(?<!\d)(\d+)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)',
             r'(?:minimum|min|at least)\s+(\d+)\s*(?:years?|yrs?)',
-            r'(\d+)\s*[-–]\s*(\d+)\s*(?:years?|yrs?)'
+            r'(?<!\d)(\d+)\s*[-–]\s*(\d+)\s*(?:years?|yrs?)'
         ]
         
         required_years = 0
@@ -374,6 +974,38 @@ class CandidateIntelligencePipeline:
         print(f"        ✓ Experience score: {score}")
         return round(score, 2)
     
+    def _score_experience_matrix(self, candidate_years: np.ndarray,
+                                 is_fresher_candidate: np.ndarray,
+                                 required_years: np.ndarray,
+                                 is_fresher_role: np.ndarray) -> np.ndarray:
+        """Vectorised _score_experience_intelligent for N candidates x M roles"""
+        years = candidate_years[:, None]
+        fresher = is_fresher_candidate[:, None]
+        required = required_years[None, :]
+        fresher_role = is_fresher_role[None, :]
+        
+        excess = years - required
+        general = np.where(
+            required == 0,
+            np.minimum(years * 10, 80),
+            np.where(
+                years >= required,
+                np.select([excess <= 2, excess <= 5], [100.0, 95.0], 85.0),
+                np.maximum(30, 100 - (required - years) * 15)
+            )
+        )
+        
+        scores = np.select(
+            [
+                fresher_role & fresher,
+                fresher_role & ~fresher,
+                ~fresher_role & fresher & (required > 2)
+            ],
+            [100.0, np.maximum(70, 100 - years * 5), 20.0],
+            general
+        )
+        return np.round(scores, 2)
+    
     def _calculate_skill_match(self, resume_skills: Dict, jd_skills: Dict) -> Dict:
         """Calculate skill match percentage"""
         resume_skill_names = set()
@@ -416,17 +1048,7 @@ class CandidateIntelligencePipeline:
             for skill_data in category_skills:
                 skill_name = skill_data['skill']
                 if skill_name.lower() not in resume_skill_names:
-                    try:
-                        prediction = self.skill_gap_classifier.predict_difficulty(
-                            has_base=0,
-                            skill_similarity=0.5,
-                            domain_overlap=0.6
-                        )
-                        difficulty = prediction.get('difficulty', 'medium')
-                        learning_days = prediction.get('estimated_learning_days', 60)
-                    except:
-                        difficulty = 'medium'
-                        learning_days = 60
+                    difficulty, learning_days = self._predict_gap_difficulty()
                     
                     gaps.append({
                         'skill': skill_name,
@@ -437,12 +1059,35 @@ class CandidateIntelligencePipeline:
         
         return gaps
     
-    def _score_education(self, sections: Dict) -> float:
+    def _predict_gap_difficulty(self) -> tuple:
+        """
+        Predict (difficulty, learning_days) for a missing skill
+        
+        The classifier gets the same features for every gap, so the
+        forest is evaluated once per pipeline rather than once per gap.
+        """
+        if self._gap_difficulty is None:
+            try:
+                prediction = self.skill_gap_classifier.predict_difficulty(
+                    has_base=0,
+                    skill_similarity=0.5,
+                    domain_overlap=0.6
+                )
+                self._gap_difficulty = (
+                    prediction.get('difficulty', 'medium'),
+                    prediction.get('estimated_learning_days', 60)
+                )
+            except:
+                return 'medium', 60
+        return self._gap_difficulty
+    
+    def _score_education(self, resume_text: str, section_spans: Dict) -> float:
         """Score education relevance"""
-        if 'education' not in sections:
+        if 'education' not in section_spans:
             return 50.0
         
-        education_text = sections['education'].lower()
+        start, end = section_spans['education']
+        education_text = resume_text[start:end].lower()
         
         relevant_keywords = [
             'computer science', 'engineering', 'data science',
@@ -4,31 +4,82 @@ PDF Parser - Extracts text from PDF and text files
 
 import fitz  # PyMuPDF
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Callable, Dict, List, Union
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import PDF_MAX_PAGES, PDF_MAX_BYTES
+
+
+def _open_pdf(source: Union[Path, bytes]) -> fitz.Document:
+    """Open a PDF from a path or from in-memory bytes"""
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _page_text(doc: fitz.Document, page_count: int) -> str:
+    """Plain text of the first page_count pages"""
+    return "".join(doc[i].get_text() for i in range(page_count))
+
+
+def _layout_lines(doc: fitz.Document, page_count: int) -> List[Dict]:
+    """Text lines with font info for the first page_count pages, from PyMuPDF's dict output"""
+    lines = []
+    for page_number in range(page_count):
+        for block in doc[page_number].get_text("dict")["blocks"]:
+            # Image blocks carry no "lines"
+            for line in block.get("lines", []):
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                
+                lines.append({
+                    'text': "".join(span["text"] for span in line["spans"]).strip(),
+                    'page': page_number,
+                    'bbox': tuple(round(value, 1) for value in line["bbox"]),
+                    'font_size': round(max(span["size"] for span in spans), 1),
+                    'bold': all(
+                        span["flags"] & fitz.TEXT_FONT_BOLD or "bold" in span["font"].lower()
+                        for span in spans
+                    )
+                })
+    return lines
 
 
 class PDFParser:
     """Handles PDF and text file parsing"""
     
-    def __init__(self):
+    def __init__(self,
+                 max_pages: int = PDF_MAX_PAGES,
+                 max_bytes: int = PDF_MAX_BYTES):
         self.supported_pdf = ['.pdf']
         self.supported_text = ['.txt']
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
     
-    def parse(self, file_path: Union[str, Path]) -> str:
+    def parse(self, source: Union[str, Path, bytes, BinaryIO]) -> str:
         """
         Parse file and extract text
         
         Args:
-            file_path: Path to PDF or text file
-            
+            source: Path to PDF or text file, or the file's raw bytes /
+                a binary buffer (PDF is detected from its header)
+                
         Returns:
             Extracted text
         """
-        file_path = Path(file_path)
+        if isinstance(source, (bytes, bytearray, memoryview)) or hasattr(source, 'read'):
+            return self.parse_bytes(source)
+        
+        file_path = Path(source)
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
+        self._check_size(file_path.stat().st_size)
+        
         suffix = file_path.suffix.lower()
         
         if suffix in self.supported_pdf:
@@ -38,21 +89,97 @@ class PDFParser:
         else:
             raise ValueError(f"Unsupported file format: {suffix}")
     
-    def _parse_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF"""
-        try:
-            doc = fitz.open(file_path)
-            text = ""
+    def parse_bytes(self, data: Union[bytes, BinaryIO]) -> str:
+        """
+        Extract text from an in-memory PDF or UTF-8 text document
+        
+        Args:
+            data: Raw file bytes or a binary buffer
             
-            for page in doc:
-                text += page.get_text()
+        Returns:
+            Extracted text
+        """
+        if hasattr(data, 'read'):
+            # Read one byte past the limit so oversize buffers are detected
+            data = data.read(self.max_bytes + 1)
+        data = bytes(data)
+        
+        self._check_size(len(data))
+        
+        if self.is_pdf(data):
+            return self._parse_pdf(data)
+        
+        try:
+            return data.decode('utf-8').strip()
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Unsupported file format: not a PDF or UTF-8 text ({e})")
+    
+    @staticmethod
+    def is_pdf(data: bytes) -> bool:
+        """PDF files carry a %PDF marker within their first 1024 bytes"""
+        return b'%PDF-' in data[:1024]
+    
+    def is_pdf_source(self, source: Union[str, Path, bytes]) -> bool:
+        """True if a path has a .pdf suffix or bytes carry a PDF header"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return self.is_pdf(bytes(source))
+        if isinstance(source, (str, Path)):
+            return Path(source).suffix.lower() in self.supported_pdf
+        return False
+    
+    def parse_layout(self, source: Union[str, Path, bytes]) -> Dict:
+        """
+        Extract PDF text together with per-line layout information
+        
+        Args:
+            source: Path to a PDF file or PDF bytes
             
-            doc.close()
-            return text.strip()
+        Returns:
+            {
+                'text': str,
+                'lines': [{'text', 'page', 'bbox', 'font_size', 'bold'}, ...]
+            }
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = bytes(source)
+            self._check_size(len(source))
+        else:
+            source = Path(source)
+            if not source.exists():
+                raise FileNotFoundError(f"File not found: {source}")
+            self._check_size(source.stat().st_size)
+        
+        if not self.is_pdf_source(source):
+            raise ValueError("Layout extraction requires a PDF document")
+        
+        try:
+            lines = self._extract(_layout_lines, source)
+        except Exception as e:
+            raise Exception(f"Error parsing PDF: {str(e)}")
         
+        return {
+            'text': "\n".join(line['text'] for line in lines),
+            'lines': lines
+        }
+    
+    def _check_size(self, size: int):
+        if size > self.max_bytes:
+            raise ValueError(
+                f"File too large: {size} bytes (limit {self.max_bytes} bytes)"
+            )
+    
+    def _parse_pdf(self, source: Union[Path, bytes]) -> str:
+        """Extract text from a PDF file path or in-memory PDF bytes"""
+        try:
+            return self._extract(_page_text, source).strip()
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
+    def _extract(self, extract: Callable, source: Union[Path, bytes]):
+        """Open the document once and run extract(doc, page_count) on its first max_pages pages"""
+        with _open_pdf(source) as doc:
+            return extract(doc, min(doc.page_count, self.max_pages))
+    
     def _parse_text(self, file_path: Path) -> str:
         """Read text file"""
         try:
@@ -72,4 +199,4 @@ if __name__ == "__main__":
         print(f"✓ Parsed {len(text)} characters")
         print(f"Preview: {text[:150]}...")
     else:
-        print("⚠ Test file not found")
\ No newline at end of file
+        print("⚠ Test file not found")
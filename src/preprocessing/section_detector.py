@@ -3,7 +3,8 @@ Section Detector - Identifies sections in resume text (FIXED VERSION)
 """
 
 import re
-from typing import Dict
+import statistics
+from typing import Dict, List, Optional, Tuple
 import sys
 from pathlib import Path
 
@@ -12,6 +13,19 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.config import SECTION_PATTERNS
 
+# Contact patterns run on every resume as a core stage, so they must stay
+# linear in the input. A match may only start where a run of address
+# characters starts: otherwise every position inside a long run like
+# "a.a.a..." rescans the rest of it looking for an '@'.
+EMAIL_PATTERN = re.compile(
+    r'(?<![A-Za-z0-9._%+-])[._%+-]*\b'
+    r'([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b'
+)
+# Bounded repeats only: constant work per start position
+PHONE_PATTERN = re.compile(
+    r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}'
+)
+
 
 class SectionDetector:
     """Detects and extracts structured sections from resume text"""
@@ -51,6 +65,23 @@ class SectionDetector:
                 re.IGNORECASE
             )
         }
+        
+        # All headers in one alternation with a named group per section,
+        # anchored to line starts and followed by a colon or end of line
+        self.header_pattern = re.compile(
+            r"^[ \t]*(?:"
+            + "|".join(
+                f"(?P<{name}>{pattern.pattern})"
+                for name, pattern in self.section_patterns.items()
+            )
+            + r")[ \t]*(?::|\r?$)",
+            re.IGNORECASE | re.MULTILINE
+        )
+        
+        self.date_range_pattern = re.compile(
+            r'\b(20\d{2}|19\d{2})\s*[-–—]\s*(20\d{2}|19\d{2}|present|current)\b',
+            re.IGNORECASE
+        )
     
     def detect_sections(self, text: str) -> Dict[str, str]:
         """
@@ -62,65 +93,160 @@ class SectionDetector:
         Returns:
             Dictionary with section names as keys and content as values
         """
-        text = text.strip()
-        sections = {}
+        return self.sections_from_spans(text, self.detect_section_spans(text))
+    
+    def detect_section_spans(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Find section boundaries in a single pass of the combined header regex
         
-        # Find all section headers and their positions
-        section_positions = []
+        Headers must start a line and be followed by a colon or the end of
+        the line, so header words inside sentences are ignored.
         
-        for section_name, pattern in self.section_patterns.items():
-            matches = list(pattern.finditer(text))
-            for match in matches:
-                section_positions.append({
-                    'name': section_name,
-                    'start': match.start(),
-                    'header_end': match.end(),
-                    'header_text': match.group()
-                })
-        
-        # Sort by position
-        section_positions.sort(key=lambda x: x['start'])
-        
-        # DEBUG: Print found sections
-        print(f"  🔍 DEBUG: Found {len(section_positions)} section headers:")
-        for sec in section_positions:
-            print(f"     - {sec['name']}: '{sec['header_text']}' at position {sec['start']}")
-        
-        # Extract content for each section
-        for i, section in enumerate(section_positions):
-            start = section['header_end']
+        Args:
+            text: Full resume text
             
-            # End is the start of next section or end of text
-            end = section_positions[i + 1]['start'] if i + 1 < len(section_positions) else len(text)
+        Returns:
+            {section_name: (start, end)} offsets of each section's content
+            in text (header excluded, surrounding whitespace trimmed)
+        """
+        headers = [
+            (match.lastgroup, match.start(), match.end())
+            for match in self.header_pattern.finditer(text)
+        ]
+        print(f"  🔍 Found {len(headers)} section headers")
+        
+        return self._apply_fallbacks(self._spans_from_headers(text, headers), text)
+    
+    def detect_sections_from_layout(self, lines: List[Dict]) -> Dict[str, str]:
+        """
+        Detect sections from PDF layout lines
+        
+        Args:
+            lines: Layout lines from PDFParser.parse_layout()
+            
+        Returns:
+            Dictionary with section names as keys and content as values
+        """
+        text = "\n".join(line['text'] for line in lines)
+        return self.sections_from_spans(text, self.detect_section_spans_from_layout(lines))
+    
+    def detect_section_spans_from_layout(self, lines: List[Dict]) -> Dict[str, Tuple[int, int]]:
+        """
+        Find section boundaries in one pass over PDF layout lines
+        
+        A line is a header candidate only if it is short and visually
+        distinct from body text (larger font, bold or all caps).
+        
+        Args:
+            lines: Layout lines from PDFParser.parse_layout()
             
-            content = text[start:end].strip()
+        Returns:
+            {section_name: (start, end)} offsets into the layout text
+            (the line texts joined with newlines, as in parse_layout)
+        """
+        text = "\n".join(line['text'] for line in lines)
+        if not lines:
+            return self.detect_section_spans(text)
+        
+        body_size = statistics.median(line['font_size'] for line in lines)
+        
+        headers = []
+        offset = 0
+        for line in lines:
+            header = self._layout_header(line, body_size)
+            if header is not None:
+                headers.append((header, offset, offset + len(line['text'])))
+            offset += len(line['text']) + 1
+        
+        if not headers:
+            # No visual headers (e.g. uniform plain-text PDF): use text patterns
+            return self.detect_section_spans(text)
+        
+        return self._apply_fallbacks(self._spans_from_headers(text, headers), text)
+    
+    @staticmethod
+    def sections_from_spans(text: str, spans: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        """Materialise section strings from spans"""
+        return {name: text[start:end] for name, (start, end) in spans.items()}
+    
+    @staticmethod
+    def section_text(text: str, spans: Dict[str, Tuple[int, int]], names) -> str:
+        """
+        Text of the named sections only, in document order
+        
+        Args:
+            text: Text the spans refer to
+            spans: {section_name: (start, end)}
+            names: Section names to keep
             
-            # Store the first occurrence of each section type
-            if section['name'] not in sections:
-                sections[section['name']] = content
-                print(f"     ✓ Extracted {section['name']}: {len(content)} chars")
+        Returns:
+            The sections joined by blank lines ('' if none are present)
+        """
+        selected = sorted(spans[name] for name in names if name in spans)
+        return "\n\n".join(text[start:end] for start, end in selected)
+    
+    def _spans_from_headers(self, text: str, headers: List[Tuple[str, int, int]]) -> Dict[str, Tuple[int, int]]:
+        """
+        Turn (name, header_start, header_end) hits, in text order, into
+        content spans. Each section runs to the next header; the first
+        occurrence of each section type wins.
+        """
+        spans = {}
+        for i, (name, _, header_end) in enumerate(headers):
+            end = headers[i + 1][1] if i + 1 < len(headers) else len(text)
+            if name not in spans:
+                spans[name] = self._trim_span(text, header_end, end)
+        return spans
+    
+    @staticmethod
+    def _trim_span(text: str, start: int, end: int) -> Tuple[int, int]:
+        """Shrink a span to exclude leading/trailing whitespace"""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
+    
+    def _layout_header(self, line: Dict, body_size: float) -> Optional[str]:
+        """Return the section name if a layout line is a section header"""
+        label = line['text'].strip().rstrip(':').strip()
+        if not label or len(label) > 40 or len(label.split()) > 5:
+            return None
+        
+        is_distinct = (
+            line['font_size'] > body_size + 0.5
+            or line['bold']
+            or (label.isupper() and any(c.isalpha() for c in label))
+        )
+        if not is_distinct:
+            return None
         
+        for section_name, pattern in self.section_patterns.items():
+            if pattern.search(label):
+                return section_name
+        return None
+    
+    def _apply_fallbacks(self, spans: Dict[str, Tuple[int, int]], text: str) -> Dict[str, Tuple[int, int]]:
+        """Fill in experience from date ranges, or fall back to 'general'"""
         # FALLBACK: If no sections found, try to identify experience by keywords
-        if 'experience' not in sections and len(text) > 100:
-            print("  ⚠️  No 'experience' section found, trying fallback detection...")
+        if 'experience' not in spans and len(text) > 100:
             # Look for date patterns (likely experience section)
-            date_pattern = r'\b(20\d{2}|19\d{2})\s*[-–—]\s*(20\d{2}|19\d{2}|present|current)\b'
-            date_matches = list(re.finditer(date_pattern, text, re.IGNORECASE))
+            date_matches = list(self.date_range_pattern.finditer(text))
             
             if date_matches:
                 # Assume experience section starts before first date
                 exp_start = max(0, date_matches[0].start() - 200)
-                # And ends after last date or at 50% of text
+                # And ends after last date
                 exp_end = min(len(text), date_matches[-1].end() + 500)
-                sections['experience'] = text[exp_start:exp_end].strip()
-                print(f"     ✓ FALLBACK: Extracted experience by date pattern: {len(sections['experience'])} chars")
+                spans['experience'] = self._trim_span(text, exp_start, exp_end)
+                print(f"     ✓ FALLBACK: Extracted experience by date pattern")
         
         # If still no sections found, treat entire text as general content
-        if not sections:
-            sections['general'] = text
+        if not spans:
+            spans['general'] = self._trim_span(text, 0, len(text))
             print("  ⚠️  No sections detected, using entire text as 'general'")
         
-        return sections
+        return spans
     
     def extract_contact_info(self, text: str) -> Dict[str, str]:
         """
@@ -134,15 +260,13 @@ class SectionDetector:
         """
         contact_info = {}
         
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
+        # Email
+        email_match = EMAIL_PATTERN.search(text)
         if email_match:
-            contact_info['email'] = email_match.group()
+            contact_info['email'] = email_match.group(1)
         
-        # Phone pattern
-        phone_pattern = r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,5}[-\s\.]?[0-9]{1,5}'
-        phone_match = re.search(phone_pattern, text)
+        # Phone
+        phone_match = PHONE_PATTERN.search(text)
         if phone_match:
             contact_info['phone'] = phone_match.group()
         
@@ -0,0 +1,98 @@
+"""
+Shared Pipeline State - Build the pipeline once and share it with workers
+
+Worker processes used to construct their own CandidateIntelligencePipeline
+after importing numpy / scikit-learn / pandas / networkx, which costs
+~130 MB of private memory per worker. Models, taxonomy and graph are
+read-only after construction, so the parent builds and warms one pipeline
+and forks workers from it: the pages stay shared copy-on-write. gc.freeze()
+keeps the collector from touching (and so copying) the shared objects.
+"""
+
+from multiprocessing import get_context
+from pathlib import Path
+import contextlib
+import gc
+import io
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+_pipeline = None
+
+# Exercises every analysis stage once so lazily imported modules and
+# compiled regex caches exist before the fork
+_WARM_UP_RESUME = """John Doe
+john@example.com
+EXPERIENCE
+Data Scientist, Acme Corp (2019 - 2023)
+- Built machine learning models in Python with scikit-learn
+PROJECTS
+Churn prediction - Python, SQL, Docker
+EDUCATION
+B.Tech Computer Science
+SKILLS
+Python, SQL, Machine Learning
+"""
+_WARM_UP_JD = "Looking for a data scientist with 2+ years of Python, SQL and AWS experience."
+
+
+def preload_pipeline(**kwargs):
+    """
+    Build and warm the process-wide pipeline, then freeze the heap
+    
+    Call in the parent before forking workers; get_pipeline() in a forked
+    child then returns this instance without rebuilding anything.
+    """
+    global _pipeline
+    
+    from src.pipeline import CandidateIntelligencePipeline
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        _pipeline = CandidateIntelligencePipeline(**_with_score_store(kwargs))
+        # The warm-up pair is not a real candidate: keep it out of the store
+        score_store, _pipeline.score_store = _pipeline.score_store, None
+        _pipeline.analyze_text(_WARM_UP_RESUME, _WARM_UP_JD)
+        _pipeline.score_store = score_store
+    
+    # Move everything allocated so far out of the collector's reach
+    gc.collect()
+    gc.freeze()
+    return _pipeline
+
+
+def get_pipeline(**kwargs):
+    """The inherited pipeline in forked workers, otherwise a new one"""
+    global _pipeline
+    
+    if _pipeline is None:
+        from src.pipeline import CandidateIntelligencePipeline
+        _pipeline = CandidateIntelligencePipeline(**_with_score_store(kwargs))
+    return _pipeline
+
+
+def _with_score_store(kwargs: dict) -> dict:
+    """Pipeline kwargs, with the configured score store unless one was given"""
+    if 'score_store' not in kwargs:
+        from src.storage.score_store import open_score_store
+        kwargs = {**kwargs, 'score_store': open_score_store()}
+    return kwargs
+
+
+def worker_context(allow_fork: bool = True):
+    """
+    Multiprocessing context for pipeline workers
+    
+    fork shares the preloaded pipeline. Processes that run threads or own
+    sockets and signal handlers (e.g. the API server) should not fork, so
+    they get a forkserver that imports the pipeline modules once and forks
+    workers from there - libraries stay shared, only the small pipeline
+    object is built per worker.
+    """
+    if allow_fork and threading.active_count() == 1 and sys.platform.startswith('linux'):
+        return get_context('fork')
+    
+    context = get_context('forkserver')
+    context.set_forkserver_preload(['src.pipeline'])
+    return context
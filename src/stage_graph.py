@@ -0,0 +1,142 @@
+"""
+Stage Graph - Declared pipeline stages and a dependency-driven scheduler
+
+A stage names its inputs (seed values or other stages) and produces one
+output stored under its own name. StageGraph checks the declarations,
+orders the stages topologically and runs each stage as soon as its
+inputs exist: inline, or on a thread pool so independent stages overlap.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline step: run(*input values) -> output stored under name"""
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    # Optional stages may be skipped (time budget) or disabled; only
+    # optional stages may depend on them
+    optional: bool = False
+    # Report section filled with this stage's output, if any
+    report_key: Optional[str] = None
+
+
+class StageGraph:
+    """Validated DAG of stages"""
+    
+    def __init__(self, stages: Iterable[Stage], seeds: Iterable[str] = ()):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        self.seeds = set(seeds)
+        self.order = self._topological_order()
+    
+    def _topological_order(self) -> List[str]:
+        """Stage names in dependency order (declaration order among peers)"""
+        for stage in self.stages.values():
+            for name in stage.inputs:
+                if name not in self.stages and name not in self.seeds:
+                    raise ValueError(f"Stage '{stage.name}' needs unknown input '{name}'")
+                if name in self.stages and self.stages[name].optional and not stage.optional:
+                    raise ValueError(f"Required stage '{stage.name}' depends on optional stage '{name}'")
+        
+        # Repeatedly take the first declared stage whose inputs exist, so a
+        # valid declaration order is kept as is
+        order, done = [], set()
+        while len(order) < len(self.stages):
+            ready = next((
+                stage.name for stage in self.stages.values()
+                if stage.name not in done
+                and all(name in done or name in self.seeds for name in stage.inputs)
+            ), None)
+            if ready is None:
+                cycle = sorted(set(self.stages) - done)
+                raise ValueError(f"Stage graph has a cycle among: {', '.join(cycle)}")
+            order.append(ready)
+            done.add(ready)
+        return order
+    
+    def run(self, seed_values: Dict[str, Any],
+            max_workers: int = 0,
+            should_run: Callable[[Stage], bool] = None,
+            on_complete: Callable[[str, Any], None] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Execute the graph
+        
+        Args:
+            seed_values: Values of the seed inputs
+            max_workers: Threads for independent stages; 0 runs every
+                stage inline, in topological order
+            should_run: Asked before each optional stage starts; False
+                skips it and every stage depending on it
+            on_complete: Called as on_complete(name, output) in the
+                calling thread as each stage finishes
+                
+        Returns:
+            (values, skipped): seeds plus every stage output, and the
+            names of skipped stages
+        """
+        values = dict(seed_values)
+        skipped = []
+        
+        def start(stage: Stage) -> bool:
+            if any(name in skipped for name in stage.inputs) or (
+                stage.optional and should_run is not None and not should_run(stage)
+            ):
+                skipped.append(stage.name)
+                return False
+            return True
+        
+        def finish(name: str, output: Any):
+            values[name] = output
+            if on_complete is not None:
+                on_complete(name, output)
+        
+        if max_workers <= 0:
+            for name in self.order:
+                stage = self.stages[name]
+                if start(stage):
+                    finish(name, stage.run(*(values[key] for key in stage.inputs)))
+            return values, skipped
+        
+        waiting = {
+            name: {key for key in stage.inputs if key in self.stages}
+            for name, stage in self.stages.items()
+        }
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage') as pool:
+            running = {}
+            
+            while waiting or running:
+                # Start (or skip) every stage whose upstream stages are settled
+                settled = True
+                while settled:
+                    settled = False
+                    for name in [name for name in self.order if name in waiting and not waiting[name]]:
+                        del waiting[name]
+                        stage = self.stages[name]
+                        if start(stage):
+                            future = pool.submit(stage.run, *(values[key] for key in stage.inputs))
+                            running[future] = name
+                        else:
+                            for upstream in waiting.values():
+                                upstream.discard(name)
+                            settled = True
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finish(name, future.result())
+                    for upstream in waiting.values():
+                        upstream.discard(name)
+        
+        return values, skipped
@@ -0,0 +1,3 @@
+"""
+Local storage for analysis results and caches
+"""
@@ -0,0 +1,217 @@
+"""
+Embedding Store - Persistent float16 vectors keyed by content hash
+
+Vectors live in one memory-mapped float16 matrix (vectors.f16); row i
+belongs to the i-th 32-byte SHA-256 digest in index.sha256. Both files
+are append-only and a writer appends the rows before their digests, so
+a reader that sees a digest always finds its row: readers never lock.
+Writers serialise on a lock file.
+
+Compaction copies the live rows (one per digest, the newest
+max_entries) into a new generation directory and switches CURRENT to
+it atomically. Readers still mapping the previous generation keep
+working and move to the new one on their next lookup.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Tuple, Union
+import json
+import os
+import shutil
+import threading
+import sys
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers then only serialise within a process
+    fcntl = None
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import EMBEDDING_STORE_MAX_ENTRIES
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped float16 vector store"""
+    
+    CURRENT_FILE = 'CURRENT'
+    LOCK_FILE = 'LOCK'
+    VECTOR_FILE = 'vectors.f16'
+    INDEX_FILE = 'index.sha256'
+    DIGEST_SIZE = 32
+    # Compact once the files hold this many times max_entries rows
+    COMPACT_FACTOR = 1.5
+    
+    def __init__(self, path: Union[str, Path], max_entries: int = EMBEDDING_STORE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        
+        # This process's view of the files: rebuilt when CURRENT changes,
+        # extended as the index grows
+        self.dim = None
+        self._generation = None
+        self._current_id = None
+        self._rows = {}
+        self._index_bytes = 0
+        self._vectors = None
+        self._view_lock = threading.Lock()
+        self._write_mutex = threading.Lock()
+    
+    def __len__(self) -> int:
+        with self._view_lock:
+            self._refresh()
+            return len(self._rows)
+    
+    def get_many(self, keys: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stored vectors for hex SHA-256 keys
+        
+        Only the requested rows are read from the mapped file.
+        
+        Returns:
+            (vectors, found): float32 (len(keys), dim) matrix with zero
+            rows for unknown keys, and a bool mask of the keys found
+        """
+        with self._view_lock:
+            self._refresh()
+            rows = [self._rows.get(bytes.fromhex(key)) for key in keys]
+            found = np.array([row is not None for row in rows], dtype=bool)
+            if self.dim is None:
+                return np.zeros((len(keys), 0), dtype=np.float32), found
+            
+            vectors = np.zeros((len(keys), self.dim), dtype=np.float32)
+            if found.any():
+                vectors[found] = self._vectors[[row for row in rows if row is not None]]
+            return vectors, found
+    
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Append vectors for hex SHA-256 keys (keys already stored are skipped)"""
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if not len(keys):
+            return
+        
+        with self._write_lock(), self._view_lock:
+            self._refresh()
+            if self.dim is None:
+                self._write_generation(1, vectors.shape[1], b'', b'')
+                self._refresh()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Vectors have {vectors.shape[1]} dimensions, store has {self.dim}")
+            
+            new = {}
+            for key, vector in zip(keys, vectors):
+                digest = bytes.fromhex(key)
+                if digest not in self._rows and digest not in new:
+                    new[digest] = vector
+            if not new:
+                return
+            
+            generation = self._generation_dir(self._generation)
+            row_count = self._index_bytes // self.DIGEST_SIZE
+            with open(generation / self.VECTOR_FILE, 'r+b') as vector_file:
+                # Drop rows a crashed writer left without digests
+                vector_file.truncate(row_count * self.dim * 2)
+                vector_file.seek(0, os.SEEK_END)
+                vector_file.write(np.stack(list(new.values())).tobytes())
+            with open(generation / self.INDEX_FILE, 'ab') as index_file:
+                index_file.write(b''.join(new))
+            self._refresh()
+            
+            if self._index_bytes // self.DIGEST_SIZE > self.max_entries * self.COMPACT_FACTOR:
+                self._compact()
+    
+    def compact(self):
+        """Rewrite the store with one row per key, keeping the newest max_entries"""
+        with self._write_lock(), self._view_lock:
+            self._refresh()
+            if self.dim is not None:
+                self._compact()
+    
+    def _compact(self):
+        # Newest row per key, then the newest keys
+        keep = sorted(self._rows.items(), key=lambda item: item[1])[-self.max_entries:]
+        rows = [row for _, row in keep]
+        vectors = np.asarray(self._vectors[rows], dtype=np.float16).reshape(len(rows), self.dim)
+        
+        self._write_generation(
+            self._generation + 1, self.dim,
+            vectors.tobytes(), b''.join(digest for digest, _ in keep)
+        )
+        # The previous generation stays for readers still mapping it
+        for old in self.path.glob('gen-*'):
+            if int(old.name[4:]) < self._generation:
+                shutil.rmtree(old, ignore_errors=True)
+        self._refresh()
+    
+    def _generation_dir(self, generation: int) -> Path:
+        return self.path / f"gen-{generation}"
+    
+    def _write_generation(self, generation: int, dim: int, vector_bytes: bytes, index_bytes: bytes):
+        """Write a complete generation, then point CURRENT at it"""
+        directory = self._generation_dir(generation)
+        directory.mkdir(exist_ok=True)
+        for name, data in ((self.VECTOR_FILE, vector_bytes), (self.INDEX_FILE, index_bytes)):
+            with open(directory / name, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        
+        current = self.path / self.CURRENT_FILE
+        staging = current.with_suffix('.tmp')
+        staging.write_text(json.dumps({'generation': generation, 'dim': dim}))
+        os.replace(staging, current)
+    
+    def _refresh(self, retry: bool = True):
+        """Catch up with the files (caller holds _view_lock)"""
+        try:
+            stat = os.stat(self.path / self.CURRENT_FILE)
+        except FileNotFoundError:
+            return
+        
+        current_id = (stat.st_ino, stat.st_mtime_ns)
+        if current_id != self._current_id:
+            current = json.loads((self.path / self.CURRENT_FILE).read_text())
+            self._current_id = current_id
+            self._generation = current['generation']
+            self.dim = current['dim']
+            self._rows = {}
+            self._index_bytes = 0
+            self._vectors = None
+        
+        generation = self._generation_dir(self._generation)
+        try:
+            with open(generation / self.INDEX_FILE, 'rb') as index_file:
+                index_file.seek(self._index_bytes)
+                tail = index_file.read()
+        except FileNotFoundError:
+            # Compacted away since CURRENT was read: start over once
+            if not retry:
+                raise
+            self._current_id = None
+            return self._refresh(retry=False)
+        # Whole digests only: a writer may be mid-append
+        tail = tail[:len(tail) - len(tail) % self.DIGEST_SIZE]
+        if not tail and self._vectors is not None:
+            return
+        
+        row = self._index_bytes // self.DIGEST_SIZE
+        for offset in range(0, len(tail), self.DIGEST_SIZE):
+            self._rows[tail[offset:offset + self.DIGEST_SIZE]] = row
+            row += 1
+        self._index_bytes += len(tail)
+        
+        self._vectors = np.memmap(
+            generation / self.VECTOR_FILE, dtype=np.float16, mode='r', shape=(row, self.dim)
+        ) if row else np.zeros((0, self.dim), dtype=np.float16)
+    
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive across threads and (with fcntl) processes"""
+        with self._write_mutex, open(self.path / self.LOCK_FILE, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
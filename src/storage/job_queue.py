@@ -0,0 +1,320 @@
+"""
+Job Queue - Durable SQLite queue of batch analysis jobs
+
+A job is one job description plus many resume documents; each resume is
+a task that worker processes claim, analyse and complete. Claims are
+leases, so tasks of a crashed worker are picked up again once the lease
+expires. Failing tasks are retried with backoff and dead-lettered after
+max_attempts - including tasks whose worker keeps dying on them.
+"""
+
+from contextlib import closing
+import json
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import JOB_QUEUE_PATH, JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF
+
+TASK_STATES = ('queued', 'running', 'done', 'dead')
+
+
+class JobQueue:
+    """SQLite-backed job / task queue shared by the API and worker processes"""
+    
+    def __init__(self, db_path: Union[str, Path] = JOB_QUEUE_PATH,
+                 max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retry_backoff: float = JOB_RETRY_BACKOFF):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._create_tables()
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly where needed
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _create_tables(self):
+        with closing(self._connect()) as conn:
+            # WAL lets pollers read while a worker writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    jd_name TEXT,
+                    jd_document BLOB NOT NULL,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    filename TEXT,
+                    document BLOB,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease_until REAL,
+                    worker TEXT,
+                    error TEXT,
+                    result TEXT,
+                    finished_at TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_claim "
+                "ON tasks (status, available_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_job "
+                "ON tasks (job_id, status)"
+            )
+    
+    def submit(self, jd_document: bytes, documents: Iterable[Tuple[str, bytes]],
+               jd_name: Optional[str] = None) -> str:
+        """
+        Enqueue a job
+        
+        Args:
+            jd_document: Job description file bytes
+            documents: (filename, resume bytes) pairs - read in full before
+                the write transaction opens, so a slow upload or archive
+                never holds the database lock
+            jd_name: Display name for the job description
+            
+        Returns:
+            job_id
+        """
+        documents = list(documents)
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            # One transaction: workers never see a half-submitted job
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO jobs (job_id, jd_name, jd_document, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, jd_name, jd_document, datetime.now().isoformat(timespec='seconds'))
+            )
+            total = 0
+            for filename, document in documents:
+                conn.execute(
+                    "INSERT INTO tasks (job_id, filename, document) VALUES (?, ?, ?)",
+                    (job_id, filename, document)
+                )
+                total += 1
+            conn.execute("UPDATE jobs SET total = ? WHERE job_id = ?", (total, job_id))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return job_id
+    
+    def claim(self, worker: str, lease_seconds: float) -> Optional[Dict]:
+        """
+        Lease the next runnable task (queued, or running with an expired lease)
+        
+        A task whose lease expired after max_attempts claims (its worker
+        crashed or hung every time) is dead-lettered instead.
+        
+        Returns:
+            {'task_id', 'job_id', 'filename', 'document', 'attempts',
+             'jd_name', 'jd_document'} or None if nothing is runnable
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+                UPDATE tasks
+                SET status = 'dead', lease_until = NULL, finished_at = ?,
+                    error = 'Lease expired on every attempt (worker crashed or timed out)'
+                WHERE status = 'running' AND lease_until < ? AND attempts >= ?
+            """, (datetime.now().isoformat(timespec='seconds'), now, self.max_attempts))
+            row = conn.execute("""
+                SELECT task_id FROM tasks
+                WHERE (status = 'queued' AND available_at <= ?)
+                   OR (status = 'running' AND lease_until < ?)
+                ORDER BY task_id
+                LIMIT 1
+            """, (now, now)).fetchone()
+            
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            
+            conn.execute("""
+                UPDATE tasks
+                SET status = 'running', attempts = attempts + 1,
+                    lease_until = ?, worker = ?
+                WHERE task_id = ?
+            """, (now + lease_seconds, worker, row['task_id']))
+            task = conn.execute("""
+                SELECT t.task_id, t.job_id, t.filename, t.document, t.attempts,
+                       j.jd_name, j.jd_document
+                FROM tasks t JOIN jobs j ON j.job_id = t.job_id
+                WHERE t.task_id = ?
+            """, (row['task_id'],)).fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        
+        return dict(task)
+    
+    def complete(self, task_id: int, worker: str, result: Dict) -> bool:
+        """
+        Store a task's report and drop its document
+        
+        Only the worker holding the task's lease may complete it: once the
+        lease expired the task may have been re-claimed or dead-lettered.
+        
+        Returns:
+            False if the lease was lost (nothing is stored)
+        """
+        with closing(self._connect()) as conn:
+            updated = conn.execute("""
+                UPDATE tasks
+                SET status = 'done', result = ?, document = NULL, error = NULL,
+                    lease_until = NULL, finished_at = ?
+                WHERE task_id = ? AND worker = ? AND status = 'running'
+            """, (
+                json.dumps(result, default=str), datetime.now().isoformat(timespec='seconds'),
+                task_id, worker
+            )).rowcount
+        return updated == 1
+    
+    def fail(self, task_id: int, worker: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt: retry with linear backoff, or dead-letter
+        the task once it has used max_attempts
+        
+        Args:
+            retry: False for errors that would recur on every attempt
+                (oversized or unsupported input): dead-letter at once
+                
+        Returns:
+            The task's new status ('queued' or 'dead'), or 'lost' if the
+            worker no longer holds the task's lease (nothing is recorded)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts FROM tasks WHERE task_id = ? AND worker = ? AND status = 'running'",
+                (task_id, worker)
+            ).fetchone()
+            
+            if row is None:
+                status = 'lost'
+            elif not retry or row['attempts'] >= self.max_attempts:
+                status = 'dead'
+                conn.execute("""
+                    UPDATE tasks
+                    SET status = 'dead', error = ?, lease_until = NULL, finished_at = ?
+                    WHERE task_id = ?
+                """, (error, datetime.now().isoformat(timespec='seconds'), task_id))
+            else:
+                status = 'queued'
+                conn.execute("""
+                    UPDATE tasks
+                    SET status = 'queued', error = ?, lease_until = NULL, available_at = ?
+                    WHERE task_id = ?
+                """, (error, time.time() + self.retry_backoff * row['attempts'], task_id))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return status
+    
+    def progress(self, job_id: str) -> Optional[Dict]:
+        """
+        Task counts for a job
+        
+        Returns:
+            {'job_id', 'jd_name', 'status', 'total', 'queued', 'running',
+             'done', 'dead', 'created_at'} or None for unknown jobs
+        """
+        with closing(self._connect()) as conn:
+            job = conn.execute(
+                "SELECT job_id, jd_name, total, created_at FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status",
+                (job_id,)
+            ).fetchall())
+        
+        progress = dict(job)
+        progress.update({state: counts.get(state, 0) for state in TASK_STATES})
+        finished = progress['done'] + progress['dead']
+        progress['status'] = 'completed' if finished == progress['total'] else (
+            'running' if finished or progress['running'] else 'queued'
+        )
+        return progress
+    
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """
+        Finished tasks of a job (done and dead-lettered), in submission order
+        
+        Available while the job is still running (partial results).
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT task_id, filename, status, attempts, error, result
+                FROM tasks
+                WHERE job_id = ? AND status IN ('done', 'dead')
+                ORDER BY task_id
+                LIMIT ? OFFSET ?
+            """, (job_id, limit, offset)).fetchall()
+        
+        return [
+            {
+                'task_id': row['task_id'],
+                'filename': row['filename'],
+                'success': row['status'] == 'done',
+                'attempts': row['attempts'],
+                'error': row['error'] if row['status'] == 'dead' else None,
+                'report': json.loads(row['result']) if row['result'] else None
+            }
+            for row in rows
+        ]
+    
+    def dead_letters(self, job_id: Optional[str] = None) -> List[Dict]:
+        """Tasks that exhausted their retries, with the last error"""
+        query = "SELECT task_id, job_id, filename, attempts, error, finished_at FROM tasks WHERE status = 'dead'"
+        params = ()
+        if job_id:
+            query += " AND job_id = ?"
+            params = (job_id,)
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(query + " ORDER BY task_id", params)]
+    
+    def requeue_dead(self, job_id: Optional[str] = None) -> int:
+        """Give dead-lettered tasks a fresh set of attempts"""
+        query = ("UPDATE tasks SET status = 'queued', attempts = 0, available_at = 0, "
+                 "finished_at = NULL WHERE status = 'dead'")
+        params = ()
+        if job_id:
+            query += " AND job_id = ?"
+            params = (job_id,)
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).rowcount
@@ -0,0 +1,210 @@
+"""
+Component Score Store - Persists component scores per (resume, JD) pair
+so candidates can be re-ranked when SCORING_WEIGHTS or MATCH_THRESHOLDS
+change, without re-parsing or re-analysing any documents
+"""
+
+from contextlib import closing, contextmanager
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+import sys
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import SCORE_STORE_ENABLED, SCORE_STORE_PATH, SCORING_WEIGHTS
+from src.models.scoring_engine import ScoringEngine
+
+
+class ComponentScoreStore:
+    """SQLite-backed store of component scores keyed by content hashes"""
+    
+    def __init__(self, db_path: Union[str, Path] = SCORE_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.components = list(SCORING_WEIGHTS.keys())
+        self._create_table()
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Stable hash identifying a document by its content"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    @contextmanager
+    def _connect(self):
+        """Connection that is committed (or rolled back) and closed on exit"""
+        # API threads and batch / queue worker processes write concurrently
+        with closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+            yield conn
+    
+    def _create_table(self):
+        """
+        Create the scores table (one column per scoring component), adding
+        columns for components added to SCORING_WEIGHTS since it was created
+        """
+        component_columns = ", ".join(f"{name} REAL" for name in self.components)
+        with self._connect() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS component_scores (
+                    resume_hash TEXT NOT NULL,
+                    jd_hash TEXT NOT NULL,
+                    resume_name TEXT,
+                    jd_name TEXT,
+                    {component_columns},
+                    features TEXT,
+                    updated_at TEXT,
+                    PRIMARY KEY (resume_hash, jd_hash)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_component_scores_jd "
+                "ON component_scores (jd_hash)"
+            )
+            
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(component_scores)")}
+            for name in self.components:
+                if name not in existing:
+                    # Pairs stored earlier have no score for it (NULL)
+                    conn.execute(f"ALTER TABLE component_scores ADD COLUMN {name} REAL")
+                    print(f"⚠️ Score store: added column for new component '{name}'")
+    
+    def save(self, resume_hash: str, jd_hash: str, component_scores: Dict[str, float],
+             features: Optional[Dict] = None, resume_name: Optional[str] = None,
+             jd_name: Optional[str] = None):
+        """
+        Insert or replace the component scores for one (resume, JD) pair
+        
+        Args:
+            resume_hash: content_hash of the resume text
+            jd_hash: content_hash of the job description text
+            component_scores: {component: score (0-100)} for every scoring component
+            features: Intermediate features worth keeping (JSON-serialisable)
+            resume_name: Display name for the resume
+            jd_name: Display name for the job description
+        """
+        self.save_many([{
+            'resume_hash': resume_hash,
+            'jd_hash': jd_hash,
+            'resume_name': resume_name,
+            'jd_name': jd_name,
+            'component_scores': component_scores,
+            'features': features
+        }])
+    
+    def save_many(self, records: list):
+        """Insert or replace many pairs in one transaction (same fields as save)"""
+        columns = ['resume_hash', 'jd_hash', 'resume_name', 'jd_name',
+                   *self.components, 'features', 'updated_at']
+        placeholders = ", ".join("?" for _ in columns)
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        
+        rows = [
+            (
+                record['resume_hash'],
+                record['jd_hash'],
+                record.get('resume_name'),
+                record.get('jd_name'),
+                *(float(record['component_scores'][name]) for name in self.components),
+                json.dumps(record.get('features') or {}),
+                updated_at
+            )
+            for record in records
+        ]
+        
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO component_scores ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+    
+    def load(self, jd_hash: Optional[str] = None, include_features: bool = False) -> pd.DataFrame:
+        """
+        Load stored component scores
+        
+        Args:
+            jd_hash: Only load pairs for this job description (default: all)
+            include_features: Also load the JSON features column (parsed)
+            
+        Returns:
+            DataFrame with one row per (resume, JD) pair
+        """
+        columns = ['resume_hash', 'jd_hash', 'resume_name', 'jd_name', *self.components]
+        if include_features:
+            columns.append('features')
+        
+        query = f"SELECT {', '.join(columns)} FROM component_scores"
+        params = ()
+        if jd_hash:
+            query += " WHERE jd_hash = ?"
+            params = (jd_hash,)
+        
+        with self._connect() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        
+        if include_features:
+            df['features'] = df['features'].map(json.loads)
+        return df
+    
+    def rerank(self, jd_hash: Optional[str] = None,
+               scoring_engine: Optional[ScoringEngine] = None) -> pd.DataFrame:
+        """
+        Recompute final scores and recommendations from stored components
+        
+        Uses the current SCORING_WEIGHTS and MATCH_THRESHOLDS unless a
+        differently configured scoring engine is passed in.
+        
+        Returns:
+            Stored pairs with final_score, recommendation and confidence,
+            best first. Pairs stored before a current component existed
+            lack its score and are left out.
+        """
+        scoring_engine = scoring_engine or ScoringEngine()
+        df = self.load(jd_hash=jd_hash)
+        
+        incomplete = df[self.components].isna().any(axis=1)
+        if incomplete.any():
+            print(f"⚠️ Skipping {int(incomplete.sum())} pairs stored without every current "
+                  f"component; re-analyse them to rank them")
+            df = df[~incomplete].reset_index(drop=True)
+        
+        if df.empty:
+            return df.assign(final_score=[], recommendation=[], confidence=[])
+        
+        scored = df.join(scoring_engine.score_batch(df))
+        return scored.sort_values('final_score', ascending=False, ignore_index=True)
+
+
+def open_score_store(db_path: Union[str, Path] = SCORE_STORE_PATH,
+                     enabled: bool = SCORE_STORE_ENABLED) -> Optional[ComponentScoreStore]:
+    """The configured score store, or None when SCORE_STORE_ENABLED is off"""
+    return ComponentScoreStore(db_path) if enabled else None
+
+
+# Re-rank command: python -m src.storage.score_store [--jd HASH] [--top N] [--output FILE]
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Re-rank stored candidates with the current scoring config")
+    parser.add_argument('--db', default=str(SCORE_STORE_PATH), help="Path to the score store")
+    parser.add_argument('--jd', default=None, help="Only re-rank candidates for this JD hash")
+    parser.add_argument('--top', type=int, default=20, help="Number of rows to print")
+    parser.add_argument('--output', default=None, help="Write the full ranking to CSV")
+    args = parser.parse_args()
+    
+    store = ComponentScoreStore(args.db)
+    ranking = store.rerank(jd_hash=args.jd)
+    
+    print(f"✓ Re-ranked {len(ranking)} stored candidates")
+    if not ranking.empty:
+        print(ranking[['resume_name', 'jd_name', 'final_score', 'recommendation', 'confidence']]
+              .head(args.top).to_string(index=False))
+    
+    if args.output:
+        ranking.to_csv(args.output, index=False)
+        print(f"✓ Ranking written to {args.output}")
@@ -0,0 +1,83 @@
+"""
+Stage Cache - In-memory LRU of pipeline stage outputs
+
+Each stage is keyed by a hash of exactly the input it reads (a resume
+section, the JD, upstream stage outputs). When a revised resume is
+re-analysed, stages whose sections did not change are served from the
+cache and only the affected stages run again.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+import copy
+import hashlib
+import json
+import threading
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.config import STAGE_CACHE_SIZE
+
+
+class StageCache:
+    """Thread-safe LRU cache of stage results"""
+    
+    def __init__(self, max_entries: int = STAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def fingerprint(*inputs: Any) -> str:
+        """Stable hash of strings / JSON-serialisable stage inputs"""
+        digest = hashlib.sha256()
+        for value in inputs:
+            if not isinstance(value, str):
+                value = json.dumps(value, sort_keys=True, default=str)
+            digest.update(value.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def get_or_compute(self, stage: str, inputs: Tuple, compute: Callable[[], Any],
+                       log: Optional[List[Tuple[str, bool]]] = None) -> Any:
+        """
+        Return the cached result of stage for these inputs, computing it
+        on a miss
+        
+        Args:
+            stage: Stage name (part of the key)
+            inputs: Everything the stage reads
+            compute: Zero-argument function producing the result
+            log: Optional list receiving (stage, was_cached)
+            
+        Returns:
+            A copy of the result, so callers may mutate it freely
+        """
+        key = (stage, self.fingerprint(*inputs))
+        
+        with self._lock:
+            cached = key in self._entries
+            if cached:
+                self._entries.move_to_end(key)
+                result = self._entries[key]
+                self.hits += 1
+        
+        if not cached:
+            result = compute()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = result
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        
+        if log is not None:
+            log.append((stage, cached))
+        return copy.deepcopy(result)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
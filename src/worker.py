@@ -0,0 +1,225 @@
+"""
+Queue Worker - Processes queued batch jobs with CandidateIntelligencePipeline
+
+Run standalone next to the API (or let the API start them, see JOB_WORKERS):
+    python -m src.worker --workers 4
+"""
+
+from pathlib import Path
+from typing import Callable, List, Optional
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import (
+    JOB_QUEUE_PATH,
+    JOB_WORKERS,
+    JOB_LEASE_SECONDS,
+    JOB_POLL_INTERVAL,
+    JOB_DB_RETRIES,
+    JOB_DB_RETRY_BACKOFF,
+    JOB_SUPERVISE_INTERVAL
+)
+from src.shared_state import get_pipeline, preload_pipeline, worker_context
+
+
+# Errors that recur on every attempt (oversized, unreadable or unsupported
+# input): the task is dead-lettered at once instead of retried
+DETERMINISTIC_ERRORS = (ValueError,)
+
+
+def _with_retry(call: Callable, *args):
+    """
+    Run a queue call, retrying with exponential backoff while SQLite
+    reports the database locked or busy
+    """
+    delay = JOB_DB_RETRY_BACKOFF
+    for attempt in range(1, JOB_DB_RETRIES + 1):
+        try:
+            return call(*args)
+        except sqlite3.OperationalError as e:
+            if attempt == JOB_DB_RETRIES:
+                raise
+            print(f"⚠️ Job queue busy ({e}), retrying in {delay:.1f}s", file=sys.stderr)
+            time.sleep(delay)
+            delay *= 2
+
+
+def work(db_path: str = str(JOB_QUEUE_PATH),
+         lease_seconds: float = JOB_LEASE_SECONDS,
+         poll_interval: float = JOB_POLL_INTERVAL,
+         stop_event=None,
+         quiet: bool = True):
+    """
+    Claim and analyse tasks until stop_event is set (forever if None)
+    
+    Each task is attempted once per claim; exceptions are recorded on the
+    task so the queue can retry or dead-letter it. Queue calls that still
+    fail after their retries are logged and skipped: the task's lease
+    expires and another claim picks it up. A task whose lease expired
+    before it finished belongs to its next claim; this worker's outcome
+    is then dropped.
+    """
+    if quiet:
+        # The pipeline prints every stage; keep worker logs readable
+        sys.stdout = open(os.devnull, 'w')
+    
+    from src.storage.job_queue import JobQueue
+    
+    queue = JobQueue(db_path)
+    pipeline = get_pipeline()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    
+    # Parsed job descriptions, so each JD is parsed once per worker
+    jd_texts = {}
+    
+    while stop_event is None or not stop_event.is_set():
+        try:
+            task = _with_retry(queue.claim, worker_id, lease_seconds)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Could not claim a task: {e}", file=sys.stderr)
+            time.sleep(poll_interval)
+            continue
+        if task is None:
+            time.sleep(poll_interval)
+            continue
+        
+        try:
+            if task['job_id'] not in jd_texts:
+                jd_texts.clear()
+                jd_texts[task['job_id']] = pipeline.pdf_parser.parse(task['jd_document'])
+            
+            resume_text, section_spans = pipeline._load_resume(task['document'])
+            report = pipeline.analyze_text(
+                resume_text,
+                jd_texts[task['job_id']],
+                resume_name=Path(task['filename']).name if task['filename'] else None,
+                jd_name=task['jd_name'],
+                resume_section_spans=section_spans
+            )
+        except Exception as e:
+            try:
+                status = _with_retry(
+                    queue.fail, task['task_id'], worker_id, f"{type(e).__name__}: {e}",
+                    not isinstance(e, DETERMINISTIC_ERRORS)
+                )
+            except sqlite3.OperationalError as db_error:
+                status = f"not recorded ({db_error})"
+            print(f"⚠️ Task {task['task_id']} ({task['filename']}) failed "
+                  f"on attempt {task['attempts']}: {e} -> {status}", file=sys.stderr)
+            continue
+        
+        try:
+            if not _with_retry(queue.complete, task['task_id'], worker_id, report):
+                print(f"⚠️ Task {task['task_id']} ({task['filename']}) finished after its lease "
+                      f"expired; result dropped", file=sys.stderr)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Task {task['task_id']} result not saved: {e}", file=sys.stderr)
+
+
+def _start_worker(context, db_path: str, stop_event, name: str):
+    process = context.Process(
+        target=work,
+        kwargs={'db_path': db_path, 'stop_event': stop_event},
+        name=name,
+        daemon=True
+    )
+    process.start()
+    return process
+
+
+def start_workers(count: int = JOB_WORKERS,
+                  db_path: str = str(JOB_QUEUE_PATH),
+                  allow_fork: bool = True) -> tuple:
+    """
+    Start worker processes
+    
+    Args:
+        allow_fork: Fork from a preloaded pipeline in this process; pass
+            False from servers (workers then come from a forkserver)
+            
+    Returns:
+        (processes, stop_event) - set the event and join to stop them;
+        pass both to supervise_workers to replace workers that die
+    """
+    context = worker_context(allow_fork)
+    if context.get_start_method() == 'fork':
+        preload_pipeline()
+    stop_event = context.Event()
+    processes = [
+        _start_worker(context, db_path, stop_event, f"queue-worker-{i}")
+        for i in range(count)
+    ]
+    return processes, stop_event
+
+
+def supervise_workers(processes: List, stop_event,
+                      db_path: str = str(JOB_QUEUE_PATH),
+                      allow_fork: bool = True,
+                      interval: float = JOB_SUPERVISE_INTERVAL,
+                      context=None):
+    """
+    Restart dead workers in place until stop_event is set (blocks)
+    
+    Workers die on errors outside a task (e.g. a database that stays
+    locked) or when the OS kills them; without this the pool shrinks.
+    
+    Args:
+        context: Multiprocessing context the workers were started with
+            (default: worker_context(allow_fork), resolved now)
+    """
+    context = context or worker_context(allow_fork)
+    while not stop_event.wait(interval):
+        for i, process in enumerate(processes):
+            if not process.is_alive():
+                print(f"⚠️ {process.name} exited (code {process.exitcode}), restarting", file=sys.stderr)
+                processes[i] = _start_worker(context, db_path, stop_event, process.name)
+
+
+def supervise_in_background(processes: List, stop_event, db_path: str = str(JOB_QUEUE_PATH),
+                            allow_fork: bool = True) -> threading.Thread:
+    """Run supervise_workers in a daemon thread (for servers)"""
+    # Resolved before the thread exists: worker_context stops choosing fork
+    # once the process has threads, and restarted workers must use the
+    # same context as stop_event
+    context = worker_context(allow_fork)
+    thread = threading.Thread(
+        target=supervise_workers,
+        args=(processes, stop_event, db_path, allow_fork),
+        kwargs={'context': context},
+        name="queue-worker-supervisor",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def stop_workers(processes: List, stop_event, timeout: Optional[float] = None):
+    """Let workers finish their current task, then terminate stragglers"""
+    stop_event.set()
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Process queued batch analysis jobs")
+    parser.add_argument('--db', default=str(JOB_QUEUE_PATH), help="Path to the job queue")
+    parser.add_argument('--workers', type=int, default=max(JOB_WORKERS, 1), help="Worker processes")
+    args = parser.parse_args()
+    
+    processes, stop_event = start_workers(args.workers, args.db)
+    print(f"✓ {len(processes)} queue workers running on {args.db} (Ctrl-C to stop)")
+    try:
+        supervise_workers(processes, stop_event, args.db)
+    except KeyboardInterrupt:
+        print("Stopping workers after their current task...")
+        stop_workers(processes, stop_event, timeout=JOB_LEASE_SECONDS)
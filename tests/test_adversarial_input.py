@@ -0,0 +1,64 @@
+"""
+Regression tests: crafted inputs within the size limits must not make
+the core analysis stages super-linear
+"""
+
+from pathlib import Path
+import contextlib
+import io
+import sys
+import time
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import MAX_RESUME_CHARS
+from src.pipeline import CandidateIntelligencePipeline
+from src.preprocessing.section_detector import SectionDetector
+
+RAW_DIR = Path(__file__).parent.parent / "data" / "raw"
+
+# Each of these took seconds to minutes before the patterns were made linear
+ADVERSARIAL = {
+    'email_run': "a." * (MAX_RESUME_CHARS // 2),
+    'email_run_then_at': "a-" * (MAX_RESUME_CHARS // 2 - 1) + "@",
+    'email_domain_run': "@" + "a." * (MAX_RESUME_CHARS // 2 - 1),
+    'phone_like': "1-" * (MAX_RESUME_CHARS // 2),
+    'digit_run': "20" * (MAX_RESUME_CHARS // 2),
+    'blank_lines': "\n" * MAX_RESUME_CHARS,
+}
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return CandidateIntelligencePipeline()
+
+
+@pytest.mark.parametrize('name', ADVERSARIAL)
+def test_contact_patterns_are_linear(name):
+    started = time.perf_counter()
+    SectionDetector().extract_contact_info(ADVERSARIAL[name])
+    assert time.perf_counter() - started < 0.5
+
+
+@pytest.mark.parametrize('name', ADVERSARIAL)
+def test_analysis_of_adversarial_resume_is_fast(pipeline, name):
+    jd_text = (RAW_DIR / "sample_job_description.txt").read_text(encoding='utf-8')
+    
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = pipeline.analyze_text(ADVERSARIAL[name], jd_text)
+    
+    assert time.perf_counter() - started < 3
+    assert not report.get('partial')
+
+
+def test_contact_info_still_found():
+    contact = SectionDetector().extract_contact_info(
+        "Jane Doe\n-.jane.doe+cv@mail.example.co.uk | +1 (555) 123-4567\n"
+        "linkedin.com/in/janedoe"
+    )
+    assert contact['email'] == "jane.doe+cv@mail.example.co.uk"
+    assert contact['phone'] == "+1 (555) 123-4567"
+    assert contact['linkedin'] == "linkedin.com/in/janedoe"
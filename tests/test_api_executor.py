@@ -0,0 +1,76 @@
+"""
+Tests for the API's bounded pipeline executor (api/main.py)
+"""
+
+from pathlib import Path
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.main import PipelineExecutor
+
+
+def test_queued_time_does_not_count_towards_the_timeout():
+    executor = PipelineExecutor(max_workers=1, max_queue=1, timeout=0.5)
+    
+    async def main():
+        # The second run waits ~0.3s for the only worker, then runs 0.3s
+        return await asyncio.gather(
+            executor.run(time.sleep, 0.3),
+            executor.run(lambda: time.sleep(0.3) or "done")
+        )
+    
+    try:
+        assert asyncio.run(main()) == [None, "done"]
+    finally:
+        executor.shutdown()
+
+
+def test_timed_out_run_finishes_in_background():
+    executor = PipelineExecutor(max_workers=1, max_queue=0, timeout=0.1)
+    finished = threading.Event()
+    
+    def slow():
+        time.sleep(0.3)
+        finished.set()
+    
+    async def main():
+        with pytest.raises(HTTPException) as error:
+            await executor.run(slow)
+        assert error.value.status_code == 504
+        # Still running: its slot stays taken until it returns
+        assert executor.in_flight == 1 and executor.is_full()
+        await asyncio.sleep(0.4)
+        assert executor.in_flight == 0
+    
+    try:
+        asyncio.run(main())
+        assert finished.is_set()
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_request_drops_its_queued_run():
+    executor = PipelineExecutor(max_workers=1, max_queue=1, timeout=5)
+    ran = []
+    
+    async def main():
+        first = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+        queued = asyncio.ensure_future(executor.run(ran.append, 1))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await first
+        await asyncio.sleep(0.05)
+    
+    try:
+        asyncio.run(main())
+        assert ran == []
+        assert executor.in_flight == 0
+    finally:
+        executor.shutdown()
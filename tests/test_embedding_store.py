@@ -0,0 +1,153 @@
+"""
+Tests for the memory-mapped embedding store (src/storage/embedding_store.py)
+"""
+
+from pathlib import Path
+import builtins
+import hashlib
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.storage import embedding_store as embedding_store_module
+from src.storage.embedding_store import EmbeddingStore
+
+DIM = 4
+
+
+def make_keys(count, start=0):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(start, start + count)]
+
+
+def make_vectors(count, start=0):
+    # Small integers are exact in float16
+    return np.arange(start * DIM, (start + count) * DIM, dtype=np.float32).reshape(count, DIM)
+
+
+def test_instances_share_writes(tmp_path):
+    writer = EmbeddingStore(tmp_path)
+    reader = EmbeddingStore(tmp_path)
+    
+    vectors, found = reader.get_many(make_keys(1))
+    assert vectors.shape == (1, 0) and not found.any()
+    
+    writer.put_many(make_keys(3), make_vectors(3))
+    reader.put_many(make_keys(2, start=3), make_vectors(2, start=3))
+    
+    for store in (writer, reader):
+        vectors, found = store.get_many(make_keys(6))
+        assert found.tolist() == [True] * 5 + [False]
+        np.testing.assert_array_equal(vectors[:5], make_vectors(5))
+        np.testing.assert_array_equal(vectors[5], np.zeros(DIM))
+        assert len(store) == 5
+
+
+def test_stored_keys_are_skipped_and_dimensions_checked(tmp_path):
+    store = EmbeddingStore(tmp_path)
+    store.put_many(make_keys(2), make_vectors(2))
+    store.put_many(make_keys(2), make_vectors(2, start=10))
+    
+    vectors, _ = store.get_many(make_keys(2))
+    np.testing.assert_array_equal(vectors, make_vectors(2))
+    assert len(store) == 2
+    
+    with pytest.raises(ValueError):
+        store.put_many(make_keys(1, start=5), np.zeros((1, DIM + 1)))
+
+
+def crash_before_index(monkeypatch):
+    """Make writers die between appending rows and appending their digests"""
+    def crashing_open(file, mode='r', *args, **kwargs):
+        if Path(file).name == EmbeddingStore.INDEX_FILE and mode == 'ab':
+            raise OSError("writer crashed")
+        return builtins.open(file, mode, *args, **kwargs)
+    
+    monkeypatch.setattr(embedding_store_module, 'open', crashing_open, raising=False)
+
+
+def test_rows_are_written_before_digests(tmp_path, monkeypatch):
+    store = EmbeddingStore(tmp_path)
+    store.put_many(make_keys(2), make_vectors(2))
+    generation = tmp_path / "gen-1"
+    
+    crash_before_index(monkeypatch)
+    with pytest.raises(OSError):
+        store.put_many(make_keys(3, start=2), make_vectors(3, start=2))
+    
+    # The rows landed, their digests did not: readers ignore them
+    assert (generation / EmbeddingStore.VECTOR_FILE).stat().st_size == 5 * DIM * 2
+    assert (generation / EmbeddingStore.INDEX_FILE).stat().st_size == 2 * EmbeddingStore.DIGEST_SIZE
+    _, found = EmbeddingStore(tmp_path).get_many(make_keys(5))
+    assert found.tolist() == [True, True, False, False, False]
+
+
+def test_crashed_writer_rows_are_truncated(tmp_path, monkeypatch):
+    store = EmbeddingStore(tmp_path)
+    store.put_many(make_keys(2), make_vectors(2))
+    
+    with monkeypatch.context() as patch:
+        crash_before_index(patch)
+        with pytest.raises(OSError):
+            store.put_many(make_keys(3, start=2), make_vectors(3, start=2))
+    
+    # The next writer drops the orphaned rows before appending its own
+    EmbeddingStore(tmp_path).put_many(make_keys(1, start=10), make_vectors(1, start=10))
+    
+    generation = tmp_path / "gen-1"
+    assert (generation / EmbeddingStore.VECTOR_FILE).stat().st_size == 3 * DIM * 2
+    vectors, found = EmbeddingStore(tmp_path).get_many(make_keys(2) + make_keys(1, start=10))
+    assert found.all()
+    np.testing.assert_array_equal(vectors[:2], make_vectors(2))
+    np.testing.assert_array_equal(vectors[2], make_vectors(1, start=10)[0])
+
+
+def test_compaction_keeps_newest_entries(tmp_path):
+    store = EmbeddingStore(tmp_path, max_entries=4)
+    # 10 rows exceed max_entries * COMPACT_FACTOR: compacts on write
+    store.put_many(make_keys(10), make_vectors(10))
+    
+    assert len(store) == 4
+    assert (tmp_path / "gen-2").is_dir()
+    vectors, found = EmbeddingStore(tmp_path).get_many(make_keys(10))
+    assert found.tolist() == [False] * 6 + [True] * 4
+    np.testing.assert_array_equal(vectors[6:], make_vectors(4, start=6))
+
+
+def test_generation_switch_and_deletion(tmp_path):
+    store = EmbeddingStore(tmp_path, max_entries=4)
+    store.put_many(make_keys(4), make_vectors(4))
+    
+    store.compact()
+    # The previous generation stays for readers still mapping it
+    assert sorted(path.name for path in tmp_path.glob('gen-*')) == ['gen-1', 'gen-2']
+    
+    store.compact()
+    assert sorted(path.name for path in tmp_path.glob('gen-*')) == ['gen-2', 'gen-3']
+    
+    vectors, found = store.get_many(make_keys(4))
+    assert found.all()
+    np.testing.assert_array_equal(vectors, make_vectors(4))
+
+
+def test_reader_survives_compaction_of_its_generation(tmp_path):
+    writer = EmbeddingStore(tmp_path, max_entries=4)
+    writer.put_many(make_keys(4), make_vectors(4))
+    
+    reader = EmbeddingStore(tmp_path)
+    reader.get_many(make_keys(1))
+    held = reader._vectors
+    
+    # Two compactions delete the generation the reader has mapped
+    writer.compact()
+    writer.compact()
+    assert not (tmp_path / "gen-1").exists()
+    np.testing.assert_array_equal(np.asarray(held, dtype=np.float32), make_vectors(4))
+    
+    # The next lookup moves the reader to the current generation
+    vectors, found = reader.get_many(make_keys(5))
+    assert found.tolist() == [True] * 4 + [False]
+    np.testing.assert_array_equal(vectors[:4], make_vectors(4))
+    assert reader._generation == 3
@@ -0,0 +1,118 @@
+"""
+Tests for the experience timeline (src/feature_extraction/experience_analyzer.py)
+"""
+
+from datetime import datetime
+from pathlib import Path
+import re
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.feature_extraction.experience_analyzer import ExperienceAnalyzer
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return ExperienceAnalyzer()
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+@pytest.mark.parametrize('intervals, months', [
+    ([], 0),
+    ([(0, 12)], 12),
+    ([(0, 12), (6, 18)], 18),        # overlapping
+    ([(6, 18), (0, 12)], 18),        # order does not matter
+    ([(0, 24), (6, 12)], 24),        # contained
+    ([(0, 12), (12, 24)], 24),       # adjacent
+    ([(0, 12), (13, 24)], 23),       # one-month gap
+    ([(0, 6), (0, 6)], 6),           # duplicate
+])
+def test_merged_months(intervals, months):
+    assert ExperienceAnalyzer.merged_months(intervals) == months
+
+
+def test_end_month_is_exclusive(analyzer):
+    timeline = analyzer.extract_timeline(
+        "Engineer\nJan 2020 - Mar 2020\n"
+        "Analyst\n03/2018 to 11/2019\n"
+        "Intern\n2016 - 2016\n"
+        "Assistant\n2013 - 2015\n"
+    )
+    
+    assert [(role['start'], role['end'], role['months']) for role in timeline] == [
+        ('2020-01', '2020-03', 3),
+        ('2018-03', '2019-11', 21),
+        ('2016-01', '2016-12', 12),
+        ('2013-01', '2014-12', 24),
+    ]
+    role = timeline[0]
+    assert role['start_index'] == month_index(2020, 1)
+    assert role['end_index'] == month_index(2020, 3) + 1
+    assert role['months'] == role['end_index'] - role['start_index']
+    assert not role['is_current']
+
+
+def test_present_runs_through_current_month(analyzer):
+    now = datetime.now()
+    timeline = analyzer.extract_timeline("Lead\nJune 2021 – Present\n\nDeveloper\nMay 2019 - Dec 2099\n")
+    
+    current, future = timeline
+    assert current['is_current']
+    assert current['end'] == f"{now.year}-{now.month:02d}"
+    assert current['end_index'] == month_index(now.year, now.month) + 1
+    assert current['months'] == current['end_index'] - month_index(2021, 6)
+    # Future end dates are capped at the current month too
+    assert future['end_index'] == current['end_index']
+    assert not future['is_current']
+
+
+def test_overlapping_and_adjacent_roles_merge(analyzer):
+    timeline = analyzer.extract_timeline(
+        "Consultant\nJan 2018 - Dec 2019\n"
+        "Contractor\nJun 2019 - Jun 2020\n"     # overlaps the first by 7 months
+        "Engineer\nJul 2020 - Dec 2020\n"       # starts the month after
+    )
+    intervals = [(role['start_index'], role['end_index']) for role in timeline]
+    
+    assert sum(role['months'] for role in timeline) == 24 + 13 + 6
+    assert ExperienceAnalyzer.merged_months(intervals) == 36
+
+
+def test_blocks_split_roles_at_headers(analyzer):
+    text = "Engineer\nJan 2020 - Mar 2020\nBuilt APIs\nAnalyst\n2018 - 2019\nWrote reports\n"
+    first, second = analyzer.extract_timeline(text)
+    
+    assert text[slice(*first['block'])] == "Engineer\nJan 2020 - Mar 2020\nBuilt APIs\n"
+    assert text[slice(*second['block'])] == "Analyst\n2018 - 2019\nWrote reports\n"
+    assert first['line'] == "Jan 2020 - Mar 2020"
+
+
+def mentions_in(text, *skills):
+    return {
+        skill: [(match.start(), match.end()) for match in re.finditer(re.escape(skill), text)]
+        for skill in skills
+    }
+
+
+def test_skill_tenure_counts_overlapping_roles_once(analyzer):
+    text = (
+        "Summary: Python and SQL\n\n"
+        "Consultant\nJan 2018 - Dec 2019\nPython services, Python tooling\n"
+        "Contractor\nJun 2019 - Jun 2020\nPython and SQL reporting\n"
+        "Engineer\nJan 2022 - Dec 2022\nGo microservices\n"
+    )
+    timeline = analyzer.extract_timeline(text)
+    tenure = analyzer.skill_tenure(timeline, mentions_in(text, "Python", "SQL", "Go", "Rust"))
+    
+    # 24 + 13 months of roles overlapping by 7: 30 months, not 37
+    assert tenure['Python'] == 2.5
+    # The summary mention lies outside every dated role
+    assert tenure['SQL'] == round(13 / 12, 1)
+    assert tenure['Go'] == 1.0
+    assert 'Rust' not in tenure
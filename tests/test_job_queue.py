@@ -0,0 +1,66 @@
+"""
+Tests for the durable job queue (src/storage/job_queue.py)
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.storage.job_queue import JobQueue
+
+
+def test_expired_lease_is_dead_lettered_after_max_attempts(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", max_attempts=3)
+    job_id = queue.submit(b"jd", [("resume.txt", b"resume")], jd_name="jd.txt")
+    
+    # A negative lease expires at once, like a worker that died mid-task
+    for attempt in range(1, 4):
+        task = queue.claim("worker", lease_seconds=-1)
+        assert task is not None
+        assert task['attempts'] == attempt
+    
+    assert queue.claim("worker", lease_seconds=-1) is None
+    
+    dead = queue.dead_letters(job_id)
+    assert [task['attempts'] for task in dead] == [3]
+    assert "Lease expired" in dead[0]['error']
+    assert queue.progress(job_id)['status'] == 'completed'
+
+
+def test_unexpired_lease_is_not_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", max_attempts=3)
+    queue.submit(b"jd", [("resume.txt", b"resume")])
+    
+    assert queue.claim("worker", lease_seconds=60) is not None
+    assert queue.claim("worker", lease_seconds=60) is None
+
+
+def test_expired_lease_cannot_complete_or_fail(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", max_attempts=3)
+    job_id = queue.submit(b"jd", [("resume.txt", b"resume")])
+    
+    stale = queue.claim("worker-a", lease_seconds=-1)
+    fresh = queue.claim("worker-b", lease_seconds=60)
+    assert fresh['task_id'] == stale['task_id']
+    
+    assert queue.complete(stale['task_id'], "worker-a", {'score': 1}) is False
+    assert queue.fail(stale['task_id'], "worker-a", "late error") == 'lost'
+    assert queue.progress(job_id)['running'] == 1
+    
+    assert queue.complete(fresh['task_id'], "worker-b", {'score': 2}) is True
+    assert queue.results(job_id)[0]['report'] == {'score': 2}
+    # A finished task cannot be completed again
+    assert queue.complete(fresh['task_id'], "worker-b", {'score': 3}) is False
+
+
+def test_deterministic_failure_is_dead_lettered_at_once(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", max_attempts=3, retry_backoff=0)
+    job_id = queue.submit(b"jd", [("a.txt", b"a"), ("b.txt", b"b")])
+    
+    first = queue.claim("worker", lease_seconds=60)
+    assert queue.fail(first['task_id'], "worker", "ValueError: too large", retry=False) == 'dead'
+    second = queue.claim("worker", lease_seconds=60)
+    assert queue.fail(second['task_id'], "worker", "RuntimeError: flaky") == 'queued'
+    
+    assert [task['attempts'] for task in queue.dead_letters(job_id)] == [1]
@@ -0,0 +1,45 @@
+"""
+Tests for batched N x M matching (CandidateIntelligencePipeline.match_matrix)
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import pipeline as pipeline_module
+from src.config import MAX_JD_CHARS, MAX_RESUME_CHARS
+from src.pipeline import CandidateIntelligencePipeline
+
+RAW_DIR = Path(__file__).parent.parent / "data" / "raw"
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    return CandidateIntelligencePipeline()
+
+
+def test_oversized_inputs_are_truncated(pipeline):
+    resume = (RAW_DIR / "sample_resume.txt").read_bytes()
+    jd = (RAW_DIR / "sample_job_description.txt").read_bytes()
+    padding = b"\n" + b"filler " * (MAX_RESUME_CHARS // 7 + 1)
+    
+    prepared = pipeline._prepare_resume(resume.decode() + padding.decode())
+    assert len(prepared['text']) == MAX_RESUME_CHARS
+    assert len(pipeline._prepare_jd(jd.decode() + padding.decode())['text']) == MAX_JD_CHARS
+    
+    result = pipeline.match_matrix(
+        [resume, resume + padding], [jd],
+        resume_names=["short.txt", "long.txt"], jd_names=["jd.txt"]
+    )
+    assert result['truncated_inputs'] == ["long.txt"]
+
+
+def test_oversized_inputs_are_rejected(pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline_module, 'INPUT_LIMIT_POLICY', 'reject')
+    jd = (RAW_DIR / "sample_job_description.txt").read_bytes()
+    
+    with pytest.raises(ValueError, match="too long"):
+        pipeline.match_matrix([b"x" * (MAX_RESUME_CHARS + 1)], [jd])
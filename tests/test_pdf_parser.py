@@ -0,0 +1,49 @@
+"""
+Tests for PDF extraction (src/preprocessing/pdf_parser.py)
+"""
+
+from pathlib import Path
+import sys
+
+import fitz
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.preprocessing.pdf_parser import PDFParser
+
+
+def _pdf(pages: int = 3) -> bytes:
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), "EXPERIENCE", fontname="hebo", fontsize=14)
+        page.insert_text((72, 100), f"Python developer {number}")
+    return doc.tobytes()
+
+
+def test_text_and_layout_cover_the_same_pages():
+    parser = PDFParser()
+    data = _pdf()
+    
+    text = parser.parse(data)
+    layout = parser.parse_layout(data)
+    
+    assert [f"Python developer {n}" in text for n in range(3)] == [True] * 3
+    assert [line['page'] for line in layout['lines']] == [0, 0, 1, 1, 2, 2]
+    assert layout['lines'][0]['bold'] and not layout['lines'][1]['bold']
+    assert layout['text'].split("\n") == text.split("\n")
+
+
+def test_pages_beyond_max_pages_are_ignored():
+    parser = PDFParser(max_pages=2)
+    data = _pdf(pages=5)
+    
+    assert "Python developer 1" in parser.parse(data)
+    assert "Python developer 2" not in parser.parse(data)
+    assert {line['page'] for line in parser.parse_layout(data)['lines']} == {0, 1}
+
+
+def test_oversized_input_is_rejected():
+    with pytest.raises(ValueError, match="too large"):
+        PDFParser(max_bytes=100).parse(_pdf())
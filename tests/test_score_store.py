@@ -0,0 +1,79 @@
+"""
+Tests for the component score store (src/storage/score_store.py)
+"""
+
+from pathlib import Path
+import sqlite3
+import sys
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import SCORING_WEIGHTS
+from src.pipeline import CandidateIntelligencePipeline
+from src.storage import score_store as score_store_module
+from src.storage.score_store import ComponentScoreStore, open_score_store
+
+RAW_DIR = Path(__file__).parent.parent / "data" / "raw"
+
+
+def test_analysis_is_stored_and_reranked(tmp_path):
+    store = open_score_store(tmp_path / "scores.sqlite", enabled=True)
+    pipeline = CandidateIntelligencePipeline(score_store=store)
+    
+    resume_text = (RAW_DIR / "sample_resume.txt").read_text(encoding='utf-8')
+    jd_text = (RAW_DIR / "sample_job_description.txt").read_text(encoding='utf-8')
+    report = pipeline.analyze_text(resume_text, jd_text, resume_name="resume.txt", jd_name="jd.txt")
+    
+    ranking = store.rerank(jd_hash=ComponentScoreStore.content_hash(jd_text))
+    assert len(ranking) == 1
+    assert ranking.loc[0, 'resume_name'] == "resume.txt"
+    assert ranking.loc[0, 'resume_hash'] == ComponentScoreStore.content_hash(resume_text)
+    assert round(ranking.loc[0, 'final_score'], 2) == round(report['overall_score'], 2)
+    assert ranking.loc[0, 'recommendation'] == report['recommendation']
+
+
+def test_store_is_off_by_default(tmp_path):
+    assert open_score_store(tmp_path / "scores.sqlite") is None
+    assert not (tmp_path / "scores.sqlite").exists()
+
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    connections = []
+    connect = score_store_module.sqlite3.connect
+    
+    class TrackedConnection(sqlite3.Connection):
+        closed = False
+        
+        def close(self):
+            self.closed = True
+            super().close()
+    
+    def tracked_connect(*args, **kwargs):
+        connections.append(connect(*args, factory=TrackedConnection, **kwargs))
+        return connections[-1]
+    
+    monkeypatch.setattr(score_store_module.sqlite3, 'connect', tracked_connect)
+    store = ComponentScoreStore(tmp_path / "scores.sqlite")
+    store.save("r", "j", {name: 50 for name in SCORING_WEIGHTS})
+    store.load()
+    
+    assert len(connections) == 3
+    assert all(connection.closed for connection in connections)
+
+
+def test_new_component_is_migrated(tmp_path, monkeypatch):
+    db_path = tmp_path / "scores.sqlite"
+    ComponentScoreStore(db_path).save("old", "jd", {name: 50 for name in SCORING_WEIGHTS})
+    
+    weights = {**SCORING_WEIGHTS, 'culture_fit': 0.0}
+    monkeypatch.setattr(score_store_module, 'SCORING_WEIGHTS', weights)
+    store = ComponentScoreStore(db_path)
+    store.save("new", "jd", {name: 60 for name in weights})
+    
+    stored = store.load().set_index('resume_hash')
+    assert pd.isna(stored.loc["old", 'culture_fit'])
+    assert stored.loc["new", 'culture_fit'] == 60
+    # The old pair has no score for the new component, so it cannot be ranked
+    assert store.rerank()['resume_hash'].tolist() == ["new"]
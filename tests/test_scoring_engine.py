@@ -0,0 +1,91 @@
+"""
+Tests for batch scoring (src/models/scoring_engine.py)
+"""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.config import MATCH_THRESHOLDS, SCORING_WEIGHTS
+from src.models.scoring_engine import ScoringEngine
+
+KEYS = list(SCORING_WEIGHTS)
+
+# Components whose weighted sum is exactly 75, 60 and 45 on paper but
+# comes out just below in floating point (74.99999999999999, ...)
+ON_THRESHOLD = [
+    [70, 60, 100, 70, 100],
+    [60, 90, 30, 70, 10],
+    [0, 60, 100, 50, 100],
+]
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return ScoringEngine()
+
+
+def edge_rows():
+    """Component scores whose weighted sum is exactly each threshold, or 0.01 either side"""
+    rows = []
+    for threshold in sorted(MATCH_THRESHOLDS.values()):
+        for offset in (-0.01, 0, 0.01):
+            rows.append([threshold + offset] * len(KEYS))
+    return rows + ON_THRESHOLD + [[100] * len(KEYS), [0] * len(KEYS)]
+
+
+def test_batch_matches_single_scoring(engine):
+    rows = edge_rows()
+    rng = np.random.default_rng(0)
+    rows += rng.uniform(0, 100, size=(200, len(KEYS))).tolist()
+    
+    batch = engine.score_batch(pd.DataFrame(rows, columns=KEYS, index=[f"c{i}" for i in range(len(rows))]))
+    assert list(batch.index) == [f"c{i}" for i in range(len(rows))]
+    
+    for row, (_, scored) in zip(rows, batch.iterrows()):
+        single = engine.calculate_final_score(*row)
+        assert single['final_score'] == scored['final_score']
+        assert single['recommendation'] == scored['recommendation']
+        assert single['confidence'] == scored['confidence']
+
+
+@pytest.mark.parametrize('score, label', [
+    (MATCH_THRESHOLDS['weak_match'] - 0.01, 0),
+    (MATCH_THRESHOLDS['weak_match'], 1),
+    (MATCH_THRESHOLDS['potential_match'] - 0.01, 1),
+    (MATCH_THRESHOLDS['potential_match'], 2),
+    (MATCH_THRESHOLDS['strong_match'] - 0.01, 2),
+    (MATCH_THRESHOLDS['strong_match'], 3),
+])
+def test_thresholds_are_inclusive_lower_bounds(engine, score, label):
+    expected = ScoringEngine.RECOMMENDATION_LABELS[label]
+    assert engine.calculate_final_score(*[score] * len(KEYS))['recommendation'] == expected
+    assert engine._get_recommendation(score) == expected
+
+
+def test_sum_on_a_threshold_gets_its_band(engine):
+    scored = engine.score_batch(pd.DataFrame(ON_THRESHOLD, columns=KEYS))
+    
+    assert scored['final_score'].tolist() == [75.0, 60.0, 45.0]
+    assert scored['recommendation'].tolist() == ScoringEngine.RECOMMENDATION_LABELS[3:0:-1]
+    assert [
+        engine.calculate_final_score(*row)['recommendation'] for row in ON_THRESHOLD
+    ] == ScoringEngine.RECOMMENDATION_LABELS[3:0:-1]
+
+
+def test_confidence_labels(engine):
+    # Variance of the 0-1 scores: 0 (High), 0.072 (Medium), 0.2 (Low)
+    scored = engine.score_batch({
+        'skill_match': [50, 20, 0],
+        'experience': [50, 80, 100],
+        'semantic_similarity': [50, 20, 0],
+        'education': [50, 80, 100],
+        'learning_potential': [50, 50, 50],
+    })
+    assert scored['confidence'].tolist() == ["High", "Medium", "Low"]
+    assert engine.calculate_final_score(20, 80, 20, 80, 50)['confidence'] == "Medium"
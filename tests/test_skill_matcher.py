@@ -0,0 +1,39 @@
+"""
+Tests for token-aware skill matching (src/feature_extraction/skill_matcher.py)
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.feature_extraction.skill_matcher import SkillMatcher
+
+
+def test_js_suffix_matches_the_bare_skill():
+    matcher = SkillMatcher({'web': ['React', 'Node.js', 'JavaScript']}, rules={})
+    
+    assert matcher.find_all('Built UIs with React.js') == {'React': [(15, 23)]}
+    assert set(matcher.find_all('React.js on Node.js')) == {'React', 'Node.js'}
+    assert matcher.find_all('Config in React.json') == {}
+
+
+def test_implied_skills_need_their_context():
+    matcher = SkillMatcher(
+        {'data': ['Spark', 'Spark Streaming']},
+        rules={'Spark': {'context': ['hadoop']}}
+    )
+    
+    assert set(matcher.find_all('Ran Spark Streaming jobs')) == {'Spark Streaming'}
+    assert set(matcher.find_all('Ran Spark Streaming jobs on Hadoop')) == {'Spark Streaming', 'Spark'}
+
+
+def test_alias_needs_no_context():
+    matcher = SkillMatcher(
+        {'languages': ['Go', 'Python']},
+        rules={'Go': {'case_sensitive': True, 'aliases': ['Golang'], 'context': ['programming']}}
+    )
+    
+    assert matcher.find_all('Expert in Golang since 2015') == {'Go': [(10, 16)]}
+    assert matcher.find_all('Go to market strategy') == {}
+    assert 'Go' in matcher.find_all('Go programming since 2015')
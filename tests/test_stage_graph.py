@@ -0,0 +1,127 @@
+"""
+Tests for the stage scheduler (src/stage_graph.py)
+"""
+
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.stage_graph import Stage, StageGraph
+
+
+def make_graph(**overrides):
+    """text -> tokens -> (count, upper) -> summary, with optional extras"""
+    stages = [
+        Stage('tokens', str.split, ('text',)),
+        Stage('count', len, ('tokens',)),
+        Stage('upper', lambda tokens: [token.upper() for token in tokens], ('tokens',), optional=True),
+        Stage('shout', ' '.join, ('upper',), optional=True),
+        Stage('summary', lambda count, text: f"{count}:{text}", ('count', 'text')),
+    ]
+    stages = [overrides.get(stage.name, stage) for stage in stages]
+    return StageGraph(stages, seeds=['text'])
+
+
+def test_invalid_declarations_are_rejected():
+    with pytest.raises(ValueError, match="Duplicate stage"):
+        StageGraph([Stage('a', int), Stage('a', int)])
+    
+    with pytest.raises(ValueError, match="unknown input 'missing'"):
+        StageGraph([Stage('a', int, ('missing',))])
+    
+    with pytest.raises(ValueError, match="depends on optional stage"):
+        StageGraph([Stage('a', int, optional=True), Stage('b', int, ('a',))])
+    
+    with pytest.raises(ValueError, match="cycle among: b, c"):
+        StageGraph([
+            Stage('a', int, ('seed',)),
+            Stage('b', int, ('a', 'c')),
+            Stage('c', int, ('b',)),
+        ], seeds=['seed'])
+
+
+def test_topological_order_keeps_declaration_order():
+    assert make_graph().order == ['tokens', 'count', 'upper', 'shout', 'summary']
+    
+    # Declared before its input: moved after it, peers keep their order
+    graph = StageGraph([
+        Stage('b', int, ('a',)),
+        Stage('a', int, ('seed',)),
+        Stage('c', int, ('seed',)),
+    ], seeds=['seed'])
+    assert graph.order == ['a', 'b', 'c']
+
+
+def test_run_inline():
+    completed = []
+    values, skipped = make_graph().run(
+        {'text': "a b c"}, on_complete=lambda name, output: completed.append(name)
+    )
+    
+    assert values['shout'] == "A B C"
+    assert values['summary'] == "3:a b c"
+    assert skipped == []
+    assert completed == ['tokens', 'count', 'upper', 'shout', 'summary']
+
+
+@pytest.mark.parametrize('max_workers', [0, 2])
+def test_skipped_stage_skips_its_dependents(max_workers):
+    asked = []
+    
+    def should_run(stage):
+        asked.append(stage.name)
+        return stage.name != 'upper'
+    
+    values, skipped = make_graph().run({'text': "a b"}, max_workers=max_workers, should_run=should_run)
+    
+    # Only optional stages are asked; dependents of a skipped one are not
+    assert asked == ['upper']
+    assert skipped == ['upper', 'shout']
+    assert 'upper' not in values and 'shout' not in values
+    assert values['summary'] == "2:a b"
+
+
+def test_threaded_run_overlaps_independent_stages():
+    # Both branches must be running at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def count(tokens):
+        barrier.wait()
+        return len(tokens)
+    
+    def upper(tokens):
+        barrier.wait()
+        return [token.upper() for token in tokens]
+    
+    graph = make_graph(
+        count=Stage('count', count, ('tokens',)),
+        upper=Stage('upper', upper, ('tokens',), optional=True)
+    )
+    completed = []
+    
+    def on_complete(name, output):
+        completed.append((name, threading.current_thread() is threading.main_thread()))
+    
+    values, skipped = graph.run({'text': "a b c"}, max_workers=2, on_complete=on_complete)
+    inline_values, _ = make_graph().run({'text': "a b c"})
+    
+    assert values == inline_values
+    assert skipped == []
+    assert sorted(name for name, _ in completed) == sorted(graph.order)
+    assert all(in_main_thread for _, in_main_thread in completed)
+    assert [name for name, _ in completed].index('tokens') == 0
+    assert [name for name, _ in completed][-1] in ('shout', 'summary')
+
+
+def test_stage_error_propagates():
+    def fail(tokens):
+        raise RuntimeError("stage failed")
+    
+    graph = make_graph(count=Stage('count', fail, ('tokens',)))
+    for max_workers in (0, 2):
+        with pytest.raises(RuntimeError, match="stage failed"):
+            graph.run({'text': "a"}, max_workers=max_workers)
@@ -4,15 +4,23 @@ Professional version with clean presentation
 """
 
 import streamlit as st
+import pandas as pd
 import sys
 from pathlib import Path
+from collections import OrderedDict
+import copy
 import json
+import threading
+import time
 from datetime import datetime
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.config import UI_RESULT_CACHE_TTL, UI_RESULT_CACHE_SIZE, UI_COMPARE_MAX_RESUMES
 from src.pipeline import CandidateIntelligencePipeline
+from src.storage.score_store import open_score_store
+from src.storage.stage_cache import StageCache
 
 # Page config
 st.set_page_config(
@@ -242,19 +250,142 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Session State
-if 'pipeline' not in st.session_state:
-    st.session_state.pipeline = None
+# Session State (per browser session: only the report being viewed)
 if 'report' not in st.session_state:
     st.session_state.report = None
+if 'comparison' not in st.session_state:
+    st.session_state.comparison = None
 
 
-def initialize_pipeline():
-    """Initialize pipeline"""
-    if st.session_state.pipeline is None:
-        with st.spinner("🔄 Loading AI models..."):
-            st.session_state.pipeline = CandidateIntelligencePipeline()
-        st.success("✅ System Ready!")
+@st.cache_resource(show_spinner="🔄 Loading AI models...")
+def load_pipeline():
+    """One pipeline per server process, shared by every session"""
+    # Stage cache: re-analysing an edited resume reuses unchanged stages;
+    # the score store keeps component scores for re-ranking
+    return CandidateIntelligencePipeline(stage_cache=StageCache(), score_store=open_score_store())
+
+
+@st.cache_data(show_spinner=False, ttl=UI_RESULT_CACHE_TTL, max_entries=UI_RESULT_CACHE_SIZE)
+def parse_document(data: bytes) -> str:
+    """Text of an uploaded file, cached by content"""
+    return load_pipeline().pdf_parser.parse(data)
+
+
+class ReportCache:
+    """Thread-safe LRU of finished reports with a time-to-live"""
+    
+    def __init__(self, max_entries: int = UI_RESULT_CACHE_SIZE, ttl: float = UI_RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str):
+        """A copy of the cached report, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, report = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(report)
+    
+    def put(self, key: str, report: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(report))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@st.cache_resource
+def report_cache() -> ReportCache:
+    """Finished reports shared by every session"""
+    return ReportCache()
+
+
+def analyze_candidate(resume_text: str, jd_text: str, resume_name: str = None, jd_name: str = None,
+                      semantic_backend: str = None, on_stage=None) -> dict:
+    """
+    Analysis report, cached by content: identical (resume, JD) pairs from
+    any session are served without running the pipeline again
+    
+    on_stage receives partial reports while the pipeline runs; cache hits
+    return the full report directly. Not an st.cache_data function, so
+    on_stage may write to placeholders created by the caller.
+    """
+    pipeline = load_pipeline()
+    key = StageCache.fingerprint(
+        'report', resume_text, jd_text, resume_name, jd_name,
+        semantic_backend or pipeline.semantic_backend
+    )
+    report = report_cache().get(key)
+    if report is None:
+        report = pipeline.analyze_text(
+            resume_text,
+            jd_text,
+            resume_name=resume_name,
+            jd_name=jd_name,
+            on_stage=on_stage,
+            semantic_backend=semantic_backend
+        )
+        # Partial reports (time budget hit) are not kept: a retry may finish
+        if not report.get('partial'):
+            report_cache().put(key, report)
+    return report
+
+
+@st.cache_data(show_spinner=False, ttl=UI_RESULT_CACHE_TTL, max_entries=UI_RESULT_CACHE_SIZE)
+def rank_candidates(resumes: tuple, jd_document: bytes) -> tuple:
+    """
+    Leaderboard rows for (name, file bytes) resumes against one JD, and
+    the names of inputs truncated to the size limits
+    
+    Scored in one batched match_matrix pass (each document parsed once,
+    all pairs scored together) instead of one full analysis per resume.
+    """
+    names = [name for name, _ in resumes]
+    result = load_pipeline().match_matrix(
+        [data for _, data in resumes],
+        [jd_document],
+        top_k=1,
+        resume_names=names,
+        jd_names=['Job description']
+    )
+    
+    rows = []
+    for i, name in enumerate(names):
+        row = {'Candidate': name, 'Score': result['score_matrix'][i][0]}
+        for key, matrix in result['component_matrices'].items():
+            row[key.replace('_', ' ').title()] = matrix[i][0]
+        row['Recommendation'] = result['top_jds_per_resume'][i]['matches'][0]['recommendation']
+        rows.append(row)
+    
+    rows.sort(key=lambda row: row['Score'], reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row['Rank'] = rank
+    return rows, result.get('truncated_inputs', [])
+
+
+def render_stage(progress, live_results):
+    """on_stage callback: re-render the partial report after each stage"""
+    stages = load_pipeline().report_stages
+    completed = []
+    
+    def on_stage(stage, report):
+        # Concurrent stages may complete in any order: count, don't index
+        completed.append(stage)
+        done = len(completed)
+        progress.progress(done / len(stages), text=f"🔄 Analyzing candidate... {done}/{len(stages)}")
+        # Always pending: the complete report is rendered once more below
+        # the analysis (its download buttons must only exist once)
+        with live_results.container():
+            display_results(report, pending=True)
+    
+    return on_stage
 
 
 def format_full_report(report):
@@ -384,12 +515,32 @@ def format_full_report(report):
     return output
 
 
-def display_results(report):
-    """Display analysis results"""
+def show_unavailable(message, pending):
+    """Placeholder for a report section that is missing or still being computed"""
+    if pending:
+        st.info("⏳ Still analyzing - this section appears as soon as it is ready")
+    else:
+        st.info(message)
+
+
+def display_results(report, pending=False):
+    """
+    Display analysis results
+    
+    pending: report is partial (analysis still running) - sections not
+    computed yet show a placeholder
+    """
     
     score = report['overall_score']
     recommendation = report['recommendation']
     
+    if report.get('partial'):
+        skipped = ', '.join(stage.replace('_', ' ') for stage in report.get('skipped_stages', []))
+        st.warning(f"⏱️ Partial report: the analysis hit its time budget and skipped {skipped}")
+    if report.get('truncated_inputs'):
+        inputs = ' and '.join(name.replace('_', ' ') for name in report['truncated_inputs'])
+        st.warning(f"✂️ The {inputs} exceeded the size limit and was truncated before analysis")
+    
     # Color based on score
     if score >= 75:
         score_gradient = "linear-gradient(135deg, #22c55e 0%, #16a34a 100%)"
@@ -585,7 +736,7 @@ def display_results(report):
         st.markdown("## 💡 Personalized Recommendations")
         
         if 'advanced_recommendations' not in report:
-            st.info("Advanced recommendations will be available after pipeline enhancement")
+            show_unavailable("Advanced recommendations will be available after pipeline enhancement", pending)
         else:
             recs = report['advanced_recommendations']
             
@@ -612,7 +763,7 @@ def display_results(report):
         st.markdown("## 💬 Interview Questions")
         
         if 'interview_questions' not in report:
-            st.info("💡 Interview questions will be generated when using the enhanced pipeline")
+            show_unavailable("💡 Interview questions will be generated when using the enhanced pipeline", pending)
             st.markdown("""
             **This feature will auto-generate:**
             - Verification questions to check resume claims
@@ -656,7 +807,7 @@ def display_results(report):
         st.markdown("## 🕸️ Knowledge Graph & Learning Paths")
         
         if 'knowledge_graph' not in report:
-            st.info("💡 Knowledge graph analysis will be available when using the enhanced pipeline")
+            show_unavailable("💡 Knowledge graph analysis will be available when using the enhanced pipeline", pending)
             st.markdown("""
             **This feature will provide:**
             - Readiness scores for missing skills
@@ -714,7 +865,7 @@ def display_results(report):
         st.markdown("## 🔍 Skill Depth Analysis")
         
         if 'depth_analysis' not in report:
-            st.info("💡 Skill depth analysis will be available when using the enhanced pipeline")
+            show_unavailable("💡 Skill depth analysis will be available when using the enhanced pipeline", pending)
             st.markdown("""
             **This feature will analyze:**
             - Evidence strength (1-5 stars)
@@ -763,7 +914,7 @@ def display_results(report):
         st.markdown("## 🧠 Skill Retention Forecast")
         
         if 'retention_predictions' not in report:
-            st.info("💡 Retention predictions will be available when using the enhanced pipeline")
+            show_unavailable("💡 Retention predictions will be available when using the enhanced pipeline", pending)
             st.markdown("""
             **This feature will predict:**
             - Retention probability for each skill
@@ -812,6 +963,10 @@ def display_results(report):
     with tab9:
         st.markdown("## 📄 Complete Analysis Report")
         
+        if pending:
+            show_unavailable(None, pending)
+            return
+        
         # Format report as text
         formatted_report = format_full_report(report)
         
@@ -845,6 +1000,120 @@ def display_results(report):
             )
 
 
+def compare_candidates():
+    """Comparison mode: many resumes against one JD"""
+    
+    st.markdown('<h2 class="upload-heading">📤 Upload Candidates</h2>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2, gap="large")
+    
+    with col1:
+        resume_files = st.file_uploader(
+            f"Upload resumes (PDF or TXT, up to {UI_COMPARE_MAX_RESUMES})",
+            type=['pdf', 'txt'],
+            accept_multiple_files=True,
+            key="compare_resume_files"
+        )
+    
+    with col2:
+        jd_option = st.radio(
+            "Input method:",
+            ["Upload File", "Paste Text"],
+            key="compare_jd_method",
+            horizontal=True,
+            label_visibility="collapsed"
+        )
+        if jd_option == "Upload File":
+            jd_file = st.file_uploader(
+                "Upload job description file (PDF or TXT)",
+                type=['pdf', 'txt'],
+                key="compare_jd_file"
+            )
+            jd_document = jd_file.getvalue() if jd_file else None
+        else:
+            jd_text = st.text_area(
+                "Job Description Content",
+                height=220,
+                placeholder="Paste the complete job description here...",
+                key="compare_jd_text"
+            )
+            jd_document = jd_text.strip().encode('utf-8') if jd_text and jd_text.strip() else None
+    
+    st.markdown("---")
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        compare = st.button("🏁 COMPARE CANDIDATES", use_container_width=True)
+    
+    if compare:
+        if not resume_files or not jd_document:
+            st.error("⚠️ Please provide resumes and a Job Description")
+            return
+        if len(resume_files) > UI_COMPARE_MAX_RESUMES:
+            st.error(f"⚠️ Compare at most {UI_COMPARE_MAX_RESUMES} resumes at a time")
+            return
+        
+        try:
+            # Candidates are identified by file name; disambiguate repeats
+            names = []
+            for f in resume_files:
+                name, copy = f.name, 2
+                while name in names:
+                    name, copy = f"{f.name} ({copy})", copy + 1
+                names.append(name)
+            resumes = tuple((name, f.getvalue()) for name, f in zip(names, resume_files))
+            with st.spinner(f"🔄 Ranking {len(resumes)} candidates..."):
+                leaderboard, truncated_inputs = rank_candidates(resumes, jd_document)
+            # Drill-down reports are computed on demand from these
+            st.session_state.comparison = {
+                'leaderboard': leaderboard,
+                'truncated_inputs': truncated_inputs,
+                'jd_document': jd_document,
+                'resumes': dict(resumes),
+                'selected': None
+            }
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+            return
+    
+    comparison = st.session_state.comparison
+    if not comparison:
+        return
+    
+    st.markdown("## 🏆 Candidate Leaderboard")
+    st.caption("Click a column header to sort. Scores are computed across the uploaded set, "
+               "so they can differ slightly from a candidate's detailed report.")
+    if comparison['truncated_inputs']:
+        st.warning(f"✂️ Truncated to the size limit before scoring: "
+                   f"{', '.join(comparison['truncated_inputs'])}")
+    leaderboard = pd.DataFrame(comparison['leaderboard']).set_index('Rank')
+    st.dataframe(leaderboard, use_container_width=True)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.selectbox(
+            "Candidate",
+            leaderboard['Candidate'].tolist(),
+            key="compare_selected",
+            label_visibility="collapsed"
+        )
+    with col2:
+        if st.button("🔍 View Full Report", use_container_width=True):
+            comparison['selected'] = selected
+    
+    if comparison['selected']:
+        name = comparison['selected']
+        with st.spinner(f"🔄 Analyzing {name}..."):
+            report = analyze_candidate(
+                parse_document(comparison['resumes'][name]),
+                parse_document(comparison['jd_document']),
+                resume_name=name
+            )
+        st.markdown("---")
+        st.markdown(f"## 📋 {name}")
+        display_results(report)
+
+
 def main():
     """Main application"""
     
@@ -855,10 +1124,21 @@ def main():
         </div>
     """, unsafe_allow_html=True)
     
-    initialize_pipeline()
+    load_pipeline()
     
     st.markdown("---")
     
+    mode = st.radio(
+        "Mode:",
+        ["Single Candidate", "Compare Candidates"],
+        key="mode",
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    if mode == "Compare Candidates":
+        compare_candidates()
+        return
+    
     st.markdown('<h2 class="upload-heading">📤 Upload Documents</h2>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2, gap="large")
@@ -931,6 +1211,13 @@ def main():
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
+        semantic_backend = st.radio(
+            "Semantic matching:",
+            ["tfidf", "embedding"],
+            format_func={'tfidf': "TF-IDF keywords", 'embedding': "Section embeddings"}.get,
+            key="semantic_backend",
+            horizontal=True
+        )
         analyze = st.button("🚀 ANALYZE CANDIDATE", use_container_width=True)
     
     if analyze:
@@ -941,34 +1228,33 @@ def main():
             st.error("⚠️ Please provide both Resume and Job Description")
             return
         
-        import tempfile
-        temp_dir = Path(tempfile.gettempdir())
-        
         try:
+            # Uploaded files are parsed from memory, pasted text is used as-is
             if resume_file:
-                resume_path = temp_dir / f"resume_{resume_file.name}"
-                with open(resume_path, 'wb') as f:
-                    f.write(resume_file.getbuffer())
+                resume_text = parse_document(resume_file.getvalue())
             else:
-                resume_path = temp_dir / "resume.txt"
-                with open(resume_path, 'w', encoding='utf-8') as f:
-                    f.write(resume_text)
+                resume_text = resume_text.strip()
             
             if jd_file:
-                jd_path = temp_dir / f"jd_{jd_file.name}"
-                with open(jd_path, 'wb') as f:
-                    f.write(jd_file.getbuffer())
+                jd_text = parse_document(jd_file.getvalue())
             else:
-                jd_path = temp_dir / "jd.txt"
-                with open(jd_path, 'w', encoding='utf-8') as f:
-                    f.write(jd_text)
+                jd_text = jd_text.strip()
             
-            with st.spinner("🔄 Analyzing candidate... Please wait"):
-                report = st.session_state.pipeline.analyze(resume_path, jd_path)
-                st.session_state.report = report
-                
-                resume_path.unlink()
-                jd_path.unlink()
+            # Scores render as soon as they exist; feature tabs fill in as
+            # their stages complete
+            progress = st.progress(0.0, text="🔄 Analyzing candidate... Please wait")
+            live_results = st.empty()
+            report = analyze_candidate(
+                resume_text,
+                jd_text,
+                resume_name=resume_file.name if resume_file else None,
+                jd_name=jd_file.name if jd_file else None,
+                semantic_backend=semantic_backend,
+                on_stage=render_stage(progress, live_results)
+            )
+            progress.empty()
+            live_results.empty()
+            st.session_state.report = report
             
             st.success("✅ Analysis Complete!")
             st.balloons()